@@ -0,0 +1,57 @@
+"""Table change counters maintained by triggers.
+
+Revision ID: 20261018_0002
+Revises: 20240411_0001
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0002"
+down_revision = "20240411_0001"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("activities",)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "table_versions",
+        sa.Column("table_name", sa.String(length=63), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version)
+            VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)")
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table("table_versions")
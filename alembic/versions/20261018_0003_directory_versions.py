@@ -0,0 +1,36 @@
+"""Change counters for the remaining directory tables.
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0003"
+down_revision = "20261018_0002"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ("buildings", "organizations", "organization_phones", "organization_activities")
+
+
+def upgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)")
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version ON {table}")
+        op.execute(f"DELETE FROM table_versions WHERE table_name = '{table}'")
@@ -0,0 +1,38 @@
+"""Indexes for foreign-key lookups and the lat/lon window.
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0004"
+down_revision = "20261018_0003"
+branch_labels = None
+depends_on = None
+
+# activities.parent_id is already the leading column of uq_activities_parent_name,
+# so a separate index on it would only duplicate that one.
+INDEXES = (
+    ("ix_organizations_building_id", "organizations", ["building_id"]),
+    ("ix_organization_phones_organization_id", "organization_phones", ["organization_id"]),
+    ("ix_organization_activities_activity_id", "organization_activities", ["activity_id", "organization_id"]),
+    ("ix_buildings_latitude_longitude", "buildings", ["latitude", "longitude"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
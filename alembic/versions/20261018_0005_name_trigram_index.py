@@ -0,0 +1,41 @@
+"""Trigram index on organization names.
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0005"
+down_revision = "20261018_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serves both ILIKE '%...%' substring filters and the word_similarity operators.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_organizations_name_trgm",
+            "organizations",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_organizations_name_trgm",
+            table_name="organizations",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,56 @@
+"""Full-text search vector over organization name and description.
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # A stored generated column rewrites the table once; PostgreSQL keeps it in sync afterwards.
+    op.add_column(
+        "organizations",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_organizations_search_vector",
+            "organizations",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_organizations_search_vector",
+            table_name="organizations",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("organizations", "search_vector")
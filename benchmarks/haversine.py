@@ -0,0 +1,121 @@
+"""Пропускная способность фильтрации кандидатов по радиусу.
+
+Сравнивает скалярный `haversine_km` и векторный `within_radius_mask`, а также
+`OrganizationService.list_within_radius` целиком (со stub-репозиторием)::
+
+    python -m benchmarks.haversine --sizes 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from typing import Callable, NamedTuple
+
+from src.core import geo
+from src.services.organization import OrganizationService
+
+CENTER = (55.75222, 37.61556)
+RADIUS_KM = 10.0
+
+
+class _Point(NamedTuple):
+    id: uuid.UUID
+    latitude: float
+    longitude: float
+
+
+class _WindowRepository:
+    def __init__(self, candidates: list[_Point]):
+        self._candidates = candidates
+
+    def versions(self) -> tuple:
+        return ()
+
+    async def list_in_lat_lon_window(self, **_: float) -> list[_Point]:
+        return self._candidates
+
+
+def _candidates(count: int, seed: int = 42) -> list[_Point]:
+    rng = random.Random(seed)
+    return [
+        _Point(
+            uuid.uuid4(),
+            CENTER[0] + rng.uniform(-0.12, 0.12),
+            CENTER[1] + rng.uniform(-0.2, 0.2),
+        )
+        for _ in range(count)
+    ]
+
+
+def _best_of(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _scalar_kernel(latitudes: list[float], longitudes: list[float]) -> list[bool]:
+    return [geo.haversine_km(*CENTER, lat, lon) <= RADIUS_KM for lat, lon in zip(latitudes, longitudes)]
+
+
+def run(sizes: list[int], repeat: int) -> list[dict[str, float]]:
+    results = []
+    numpy_module = geo.np
+    loop = asyncio.new_event_loop()
+    for size in sizes:
+        candidates = _candidates(size)
+        latitudes = [point.latitude for point in candidates]
+        longitudes = [point.longitude for point in candidates]
+        service = OrganizationService(_WindowRepository(candidates))  # type: ignore[arg-type]
+
+        def service_call() -> None:
+            loop.run_until_complete(service.list_within_radius(CENTER[0], CENTER[1], RADIUS_KM))
+
+        scalar_kernel = _best_of(lambda: _scalar_kernel(latitudes, longitudes), repeat)
+        vector_kernel = _best_of(
+            lambda: geo.within_radius_mask(*CENTER, latitudes, longitudes, RADIUS_KM), repeat
+        )
+        vector_service = _best_of(service_call, repeat)
+        geo.np = None
+        try:
+            scalar_service = _best_of(service_call, repeat)
+        finally:
+            geo.np = numpy_module
+
+        results.append(
+            {
+                "candidates": size,
+                "scalar_kernel_per_s": size / scalar_kernel,
+                "vector_kernel_per_s": size / vector_kernel,
+                "scalar_service_per_s": size / scalar_service,
+                "vector_service_per_s": size / vector_service,
+            }
+        )
+    loop.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    header = f"{'candidates':>10} | {'scalar kernel/s':>16} | {'numpy kernel/s':>16} | {'scalar service/s':>16} | {'numpy service/s':>16}"
+    print(header)
+    print("-" * len(header))
+    for row in run(args.sizes, args.repeat):
+        print(
+            f"{row['candidates']:>10} | {row['scalar_kernel_per_s']:>16,.0f} | {row['vector_kernel_per_s']:>16,.0f}"
+            f" | {row['scalar_service_per_s']:>16,.0f} | {row['vector_service_per_s']:>16,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
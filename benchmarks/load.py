@@ -0,0 +1,301 @@
+"""Нагрузочный прогон приложения целиком, без сети: ASGI-клиент против `create_app()`.
+
+Нужна мигрированная БД Postgres (`APP_DATABASE__ASYNC_URL`): запросы используют pg_trgm,
+tsvector и COPY, поэтому встроенной замены нет. `--seed N` перед прогоном догружает
+N синтетических организаций через COPY; данные детерминированы `--random-seed`::
+
+    python -m benchmarks.load --seed 100000 --concurrency 32 --duration 30 --output load.json
+    python -m benchmarks.load --mix geo_search=5 organization_detail=1 --requests 2000
+
+В отчёте — пропускная способность, p50/p95/p99 латентности и число SQL-выражений на
+запрос, всего и по каждому сценарию. Ключи отсортированы, так что отчёты двух коммитов
+удобно сравнивать обычным diff.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+from sqlalchemy import select
+
+from src.config import settings
+from src.core.metrics import track_request_stats
+from src.core.startup import create_app
+from src.db.session import AsyncSessionFactory, engine
+from src.models import Activity, Building, Organization
+from src.services import directory_generator as directory_generator_service
+from src.services.directory_generator import DirectoryShape
+
+SAMPLE_SIZE = 1_000
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+
+
+@dataclass(frozen=True, slots=True)
+class Sample:
+    """Существующие в БД значения, из которых собираются URL запросов."""
+
+    organization_ids: list[uuid.UUID]
+    building_ids: list[uuid.UUID]
+    activity_ids: list[uuid.UUID]
+    coordinates: list[tuple[float, float]]
+    words: list[str]
+
+
+Scenario = Callable[[random.Random, Sample], str]
+
+SCENARIOS: dict[str, Scenario] = {
+    "geo_search": lambda rng, s: (
+        "/organizations/geo/search?latitude={}&longitude={}&radius_km=1".format(*rng.choice(s.coordinates))
+    ),
+    "geo_nearest": lambda rng, s: (
+        "/organizations/geo/nearest?latitude={}&longitude={}&limit=10".format(*rng.choice(s.coordinates))
+    ),
+    "list_by_name": lambda rng, s: f"/organizations/?name={rng.choice(s.words)}",
+    "text_search": lambda rng, s: f"/organizations/search?q={rng.choice(s.words)}",
+    "fuzzy_search": lambda rng, s: f"/organizations/search/fuzzy?q={rng.choice(s.words)[:-1]}",
+    "suggest": lambda rng, s: f"/organizations/suggest?prefix={rng.choice(s.words)[:3]}",
+    "organization_detail": lambda rng, s: f"/organizations/{rng.choice(s.organization_ids)}",
+    "activity_organizations": lambda rng, s: f"/activities/{rng.choice(s.activity_ids)}/organizations",
+    "activity_tree": lambda rng, s: "/activities/",
+    "building_organizations": lambda rng, s: f"/buildings/{rng.choice(s.building_ids)}/organizations",
+}
+
+DEFAULT_MIX = {
+    "geo_search": 4,
+    "geo_nearest": 2,
+    "list_by_name": 3,
+    "text_search": 2,
+    "fuzzy_search": 1,
+    "suggest": 3,
+    "organization_detail": 5,
+    "activity_organizations": 2,
+    "activity_tree": 1,
+    "building_organizations": 2,
+}
+
+
+@dataclass(slots=True)
+class Samples:
+    latencies: list[float] = field(default_factory=list)
+    statements: list[int] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        requests = len(latencies) + self.errors
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "throughput_rps": round(requests / seconds, 1) if seconds > 0 else 0.0,
+            "latency_ms": {name: round(percentile(latencies, q) * 1000, 2) for name, q in PERCENTILES},
+            "statements_per_request": round(sum(self.statements) / len(self.statements), 2) if self.statements else 0.0,
+        }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль по отсортированному списку методом ближайшего ранга."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(q * len(values)) - 1))]
+
+
+async def seed(organizations: int, random_seed: int) -> None:
+    """Догружает синтетический справочник из `organizations` организаций (см. `src.cli.generate_directory`)."""
+    shape = DirectoryShape(organizations=organizations, seed=random_seed)
+    async with AsyncSessionFactory() as session:
+        await directory_generator_service.load_directory(session, shape, settings.bulk_import_batch_size)
+        await session.commit()
+        await directory_generator_service.analyze_directory(session)
+        await session.commit()
+
+
+async def load_sample() -> Sample:
+    async with AsyncSessionFactory() as session:
+        organizations = (
+            await session.execute(
+                select(Organization.id, Organization.name).order_by(Organization.id).limit(SAMPLE_SIZE)
+            )
+        ).all()
+        buildings = (
+            await session.execute(
+                select(Building.id, Building.latitude, Building.longitude).order_by(Building.id).limit(SAMPLE_SIZE)
+            )
+        ).all()
+        activity_ids = list((await session.scalars(select(Activity.id).order_by(Activity.id))).all())
+    if not organizations or not activity_ids:
+        raise SystemExit("В БД нет организаций или видов деятельности: запустите с --seed N.")
+
+    words = sorted({word.strip("«»\"") for _, name in organizations for word in name.split() if len(word) > 3})
+    return Sample(
+        organization_ids=[row.id for row in organizations],
+        building_ids=[row.id for row in buildings],
+        activity_ids=activity_ids,
+        coordinates=[(row.latitude, row.longitude) for row in buildings],
+        words=words or [organizations[0].name],
+    )
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    sample: Sample,
+    mix: dict[str, int],
+    results: dict[str, Samples],
+    should_stop: Callable[[], bool],
+) -> None:
+    names, weights = list(mix), list(mix.values())
+    prefix = settings.api_prefix + settings.api_v1_prefix
+    while not should_stop():
+        name = rng.choices(names, weights)[0]
+        url = prefix + SCENARIOS[name](rng, sample)
+        # ASGI-транспорт вызывает приложение в этой же задаче, поэтому статистика SQL попадает сюда.
+        with track_request_stats() as stats:
+            started = time.perf_counter()
+            response = await client.get(url)
+            elapsed = time.perf_counter() - started
+        bucket = results[name]
+        if response.status_code >= 400:
+            bucket.errors += 1
+            continue
+        bucket.latencies.append(elapsed)
+        bucket.statements.append(stats.statements)
+
+
+async def _run_workers(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    sample: Sample,
+    mix: dict[str, int],
+    results: dict[str, Samples],
+    concurrency: int,
+    should_stop: Callable[[], bool],
+) -> None:
+    # У каждого воркера свой генератор: последовательность запросов не зависит от планировщика.
+    workers = [random.Random(rng.random()) for _ in range(concurrency)]
+    await asyncio.gather(*(_worker(client, worker, sample, mix, results, should_stop) for worker in workers))
+
+
+async def run(
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float | None,
+    requests: int | None,
+    warmup: float,
+    random_seed: int,
+) -> dict[str, Any]:
+    rng = random.Random(random_seed)
+    sample = await load_sample()
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    headers = {settings.api_key_header: settings.api_key}
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", headers=headers) as client:
+            warmup_until = time.perf_counter() + warmup
+
+            def warmed_up() -> bool:
+                return time.perf_counter() >= warmup_until
+
+            await _run_workers(client, rng, sample, mix, {name: Samples() for name in mix}, concurrency, warmed_up)
+
+            results = {name: Samples() for name in mix}
+            started = time.perf_counter()
+            issued = 0
+
+            def should_stop() -> bool:
+                nonlocal issued
+                if requests is not None:
+                    issued += 1
+                    return issued > requests
+                return time.perf_counter() - started >= (duration or 0)
+
+            await _run_workers(client, rng, sample, mix, results, concurrency, should_stop)
+            elapsed = time.perf_counter() - started
+
+    total = Samples()
+    for bucket in results.values():
+        total.latencies.extend(bucket.latencies)
+        total.statements.extend(bucket.statements)
+        total.errors += bucket.errors
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "concurrency": concurrency,
+            "seconds": round(elapsed, 2),
+            "mix": mix,
+            "random_seed": random_seed,
+        },
+        "total": total.summary(elapsed),
+        "scenarios": {name: bucket.summary(elapsed) for name, bucket in results.items()},
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(values: list[str] | None) -> dict[str, int]:
+    if not values:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Неизвестный сценарий {name!r}; доступны: {', '.join(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    try:
+        if args.seed:
+            await seed(args.seed, args.random_seed)
+        return await run(
+            mix=_parse_mix(args.mix),
+            concurrency=args.concurrency,
+            duration=args.duration,
+            requests=args.requests,
+            warmup=args.warmup,
+            random_seed=args.random_seed,
+        )
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="Догрузить N синтетических организаций.")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="Длительность замера в секундах.")
+    parser.add_argument("--requests", type=int, default=None, help="Число запросов вместо длительности.")
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--mix", nargs="+", metavar="NAME=WEIGHT", help="Сценарии и их веса.")
+    parser.add_argument("--output", type=Path, help="Куда записать JSON-отчёт (по умолчанию stdout).")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(main_async(args)), indent=2, sort_keys=True, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""CPU на запрос при отдаче списка OrganizationDetail.
+
+Сравнивает стандартный путь FastAPI (повторная валидация и сериализация через
+`response_model`), тот же путь с явным `JSONResponse` (dict + json.dumps — так
+FastAPI до версий с `dump_json` отдаёт любой ответ) и `json_response`, который
+сериализует готовые модели один раз::
+
+    python -m benchmarks.serialization --organizations 1000 --requests 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+
+from src.api.responses import json_response
+from src.mappers import map_organization_details
+from src.models import Activity, Building, Organization, OrganizationPhone
+from src.schemas import OrganizationDetail
+
+
+def _organizations(count: int) -> list[Organization]:
+    buildings = [
+        Building(id=uuid.uuid4(), address=f"Building {index}", latitude=55.7 + index / 1e4, longitude=37.6)
+        for index in range(max(count // 10, 1))
+    ]
+    activities = [Activity(id=uuid.uuid4(), name=f"Activity {index}", level=1, parent_id=None) for index in range(20)]
+    organizations = []
+    for index in range(count):
+        building = buildings[index % len(buildings)]
+        organization = Organization(
+            id=uuid.uuid4(),
+            name=f"Organization {index}",
+            description="Описание организации " * 4,
+            building_id=building.id,
+        )
+        organization.building = building
+        organization.phone_numbers = [
+            OrganizationPhone(id=uuid.uuid4(), phone_number=f"+7 (495) 000-{index % 100:02d}-{n:02d}") for n in range(2)
+        ]
+        organization.activities = [activities[(index + n) % len(activities)] for n in range(3)]
+        organizations.append(organization)
+    return organizations
+
+
+def build_app(details: list[OrganizationDetail]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=list[OrganizationDetail])
+    async def response_model() -> list[OrganizationDetail]:
+        return details
+
+    @app.get("/response-model-dict", response_model=list[OrganizationDetail], response_class=JSONResponse)
+    async def response_model_dict() -> list[OrganizationDetail]:
+        return details
+
+    @app.get("/json-response", response_model=list[OrganizationDetail])
+    async def fast() -> Response:
+        return json_response(details)
+
+    return app
+
+
+async def _measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    await client.get(path)
+    started = time.process_time()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return (time.process_time() - started) / requests
+
+
+async def run(organizations: int, requests: int) -> dict[str, float]:
+    details = map_organization_details(_organizations(organizations))
+    transport = httpx.ASGITransport(app=build_app(details))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        default_cpu = await _measure(client, "/response-model", requests)
+        dict_cpu = await _measure(client, "/response-model-dict", requests)
+        fast_cpu = await _measure(client, "/json-response", requests)
+    return {
+        "organizations": organizations,
+        "response_model_ms": default_cpu * 1000,
+        "response_model_dict_ms": dict_cpu * 1000,
+        "json_response_ms": fast_cpu * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--organizations", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.organizations, args.requests))
+    print(f"{result['organizations']} organizations, CPU ms per request:")
+    for name in ("response_model", "response_model_dict", "json_response"):
+        print(f"  {name:<20} {result[name + '_ms']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
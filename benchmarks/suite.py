@@ -0,0 +1,243 @@
+"""Набор микробенчмарков мапперов, сервисов и геоматематики с базовой линией.
+
+Каждый случай запускается на синтетических данных нескольких размеров; время — лучшее
+из `--repeat` замеров на один вызов. Результаты можно сохранить как базовую линию и
+сравнивать с ней последующие прогоны: при замедлении больше `--tolerance` команда
+завершается с кодом 1::
+
+    python -m benchmarks.suite --sizes 1000 100000 --save benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 1000 100000 --compare benchmarks/baseline.json
+    python -m benchmarks.suite --only activity --sizes 1000000
+
+Базовая линия имеет смысл только для той же машины и того же интерпретатора.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.haversine import CENTER, RADIUS_KM, _candidates, _scalar_kernel, _WindowRepository
+from benchmarks.serialization import _organizations
+from src.core import geo
+from src.mappers import map_activity_tree_list, map_organization_details
+from src.models import Activity
+from src.services.activity import ActivityService
+from src.services.activity_tree import ActivityTreeCache
+from src.services.organization import OrganizationService
+
+Setup = Callable[[int], Callable[[], object]]
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    name: str
+    setup: Setup
+
+
+CASES: list[Case] = []
+
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    """Регистрирует случай: `setup(size)` готовит данные и возвращает измеряемый вызов."""
+
+    def register(setup: Setup) -> Setup:
+        CASES.append(Case(name, setup))
+        return setup
+
+    return register
+
+
+def activity_tree(size: int, branching: int | None) -> list[Activity]:
+    """Дерево из `size` узлов с заполненными `children`; корни — первый уровень.
+
+    `branching=None` — широкое дерево в три уровня, как в справочнике; иначе у каждого
+    узла по `branching` детей, и глубина растёт логарифмически.
+    """
+    if branching is None:
+        branching = max(round(size ** (1 / 3)), 2)
+        roots = branching
+    else:
+        roots = 1
+
+    activities: list[Activity] = []
+    level_nodes: list[Activity] = []
+    for index in range(min(roots, size)):
+        root = Activity(id=uuid.uuid4(), name=f"Activity {index}", level=1, parent_id=None)
+        root.children = []
+        level_nodes.append(root)
+    activities.extend(level_nodes)
+
+    while len(activities) < size:
+        next_level: list[Activity] = []
+        for parent in level_nodes:
+            for _ in range(branching):
+                if len(activities) + len(next_level) >= size:
+                    break
+                child = Activity(
+                    id=uuid.uuid4(),
+                    name=f"Activity {len(activities) + len(next_level)}",
+                    level=parent.level + 1,
+                    parent_id=parent.id,
+                )
+                child.children = []
+                parent.children.append(child)
+                next_level.append(child)
+        activities.extend(next_level)
+        level_nodes = next_level
+    return activities
+
+
+class _ActivityRepository:
+    def __init__(self, activities: list[Activity]):
+        self._activities = activities
+
+    async def list_all(self) -> list[Activity]:
+        return self._activities
+
+
+class _VersionRepository:
+    async def get_version(self, table_name: str) -> int:
+        return 1
+
+
+@case("mappers.organization_details")
+def _organization_details(size: int) -> Callable[[], object]:
+    organizations = _organizations(size)
+    return lambda: map_organization_details(organizations)
+
+
+def _activity_tree_list(branching: int | None) -> Setup:
+    def setup(size: int) -> Callable[[], object]:
+        roots = [activity for activity in activity_tree(size, branching) if activity.parent_id is None]
+        return lambda: map_activity_tree_list(roots)
+
+    return setup
+
+
+case("mappers.activity_tree_list.wide")(_activity_tree_list(None))
+case("mappers.activity_tree_list.deep")(_activity_tree_list(2))
+
+
+@case("geo.haversine_scalar")
+def _haversine_scalar(size: int) -> Callable[[], object]:
+    candidates = _candidates(size)
+    latitudes = [point.latitude for point in candidates]
+    longitudes = [point.longitude for point in candidates]
+    return lambda: _scalar_kernel(latitudes, longitudes)
+
+
+@case("geo.within_radius_mask")
+def _within_radius_mask(size: int) -> Callable[[], object]:
+    candidates = _candidates(size)
+    latitudes = [point.latitude for point in candidates]
+    longitudes = [point.longitude for point in candidates]
+    return lambda: geo.within_radius_mask(*CENTER, latitudes, longitudes, RADIUS_KM)
+
+
+@case("services.list_within_radius")
+def _list_within_radius(size: int) -> Callable[[], object]:
+    service = OrganizationService(_WindowRepository(_candidates(size)))  # type: ignore[arg-type]
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(service.list_within_radius(CENTER[0], CENTER[1], RADIUS_KM))
+
+
+def _collect_descendant_ids(branching: int | None) -> Setup:
+    def setup(size: int) -> Callable[[], object]:
+        activities = activity_tree(size, branching)
+        service = ActivityService(
+            _ActivityRepository(activities),  # type: ignore[arg-type]
+            _VersionRepository(),  # type: ignore[arg-type]
+            ActivityTreeCache(refresh_interval=float("inf")),
+        )
+        loop = asyncio.new_event_loop()
+        root_id = activities[0].id
+        # Снимок дерева строится при первом вызове; измеряется ответ из кэша.
+        loop.run_until_complete(service.collect_descendant_ids(root_id))
+        return lambda: loop.run_until_complete(service.collect_descendant_ids(root_id))
+
+    return setup
+
+
+case("services.collect_descendant_ids.wide")(_collect_descendant_ids(None))
+case("services.collect_descendant_ids.deep")(_collect_descendant_ids(2))
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Лучшее время одного вызова; число вызовов в замере подбирается, как в `timeit`."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(sizes: list[int], repeat: int, patterns: list[str] | None = None) -> dict[str, float]:
+    results: dict[str, float] = {}
+    for benchmark in CASES:
+        if patterns and not any(fnmatch.fnmatch(benchmark.name, f"*{pattern}*") for pattern in patterns):
+            continue
+        for size in sizes:
+            key = f"{benchmark.name}[{size}]"
+            results[key] = measure(benchmark.setup(size), repeat)
+            print(f"{key:<50} {results[key] * 1000:12.3f} ms", flush=True)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Печатает отношение к базовой линии; возвращает случаи, замедлившиеся больше допуска."""
+    regressions = []
+    print(f"\n{'case':<50} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, seconds in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"{key:<50} {'—':>12} {seconds * 1000:12.3f} {'new':>7}")
+            continue
+        ratio = seconds / previous
+        marker = ""
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+            marker = "  REGRESSION"
+        print(f"{key:<50} {previous * 1000:12.3f} {seconds * 1000:12.3f} {ratio:7.2f}{marker}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", metavar="PATTERN", help="Запускать только случаи с этой подстрокой.")
+    parser.add_argument("--save", type=Path, help="Сохранить результаты как базовую линию.")
+    parser.add_argument("--compare", type=Path, help="Сравнить с сохранённой базовой линией.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Допустимое замедление (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.only)
+
+    if args.save:
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "results": results,
+        }
+        args.save.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"\nБазовая линия сохранена в {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nЗамедление больше {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 from fastapi import APIRouter
 
-from src.api.routers import activities, buildings, organizations
+from src.api.routers import activities, buildings, imports, internal, organizations
 
 main_router = APIRouter()
 
 main_router.include_router(buildings.router)
 main_router.include_router(activities.router)
 main_router.include_router(organizations.router)
+main_router.include_router(imports.router)
+main_router.include_router(internal.router)
 
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Awaitable, Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import get_read_session
+from src.services import table_version as table_version_service
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Слабое сравнение из RFC 9110 для If-None-Match: W/-префикс не учитывается."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+def check_not_modified(request: Request, etag: str) -> None:
+    """Прерывает обработку ответом 304, если у клиента уже актуальная версия ресурса."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def table_etag(*tables: str) -> Callable[..., Awaitable[str]]:
+    """Зависимость: ETag из URL и счётчиков изменений `tables`; на совпадение отвечает 304 до запросов к данным."""
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_read_session),
+    ) -> str:
+        versions = await table_version_service.get_versions(session, tables)
+        etag = make_etag(request.url.path, request.url.query, *(f"{table}:{versions[table]}" for table in tables))
+        check_not_modified(request, etag)
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import (
+    RequestStats,
+    http_request_db_seconds,
+    http_request_db_statements,
+    http_request_duration_seconds,
+    http_requests_total,
+    registry,
+    track_request_stats,
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    """Шаблон пути маршрута (`/api/v1/organizations/{organization_id}`), а не сам путь — чтобы не плодить серии."""
+    # Во вложенных роутерах FastAPI полный путь с префиксами лежит в контексте маршрута.
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: латентность, статусы и SQL-нагрузка по маршрутам.
+
+    С `server_timing=True` добавляет заголовок Server-Timing с временем в БД и в приложении.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_request_stats() as stats:
+            await self._observe(scope, receive, send, stats)
+
+    async def _observe(self, scope: Scope, receive: Receive, send: Send, stats: RequestStats) -> None:
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", _server_timing(stats, started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            labels = (scope["method"], route_template(scope))
+            http_requests_total.inc((*labels, str(status_code)))
+            http_request_duration_seconds.observe(elapsed, labels)
+            http_request_db_statements.observe(stats.statements, labels)
+            http_request_db_seconds.observe(stats.db_seconds, labels)
+
+
+def _server_timing(stats: RequestStats, started: float) -> str:
+    total_ms = (time.perf_counter() - started) * 1000
+    db_ms = stats.db_seconds * 1000
+    return f'db;dur={db_ms:.2f};desc="{stats.statements} sql", app;dur={max(total_ms - db_ms, 0.0):.2f}'
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Response, status
+
+from src.config import settings
+from src.repositories.pagination import Page
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    values = [str(value) if isinstance(value, UUID) else value for value in key]
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[Any], Any]]) -> tuple[Any, ...]:
+    """Разбирает непрозрачный курсор и приводит значения ключа к `types`; ошибки — 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor shape mismatch")
+        return tuple(type_(value) for type_, value in zip(types, values))
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор.") from exc
+
+
+@dataclass(frozen=True, slots=True)
+class PageParams:
+    cursor: str | None
+    limit: int
+
+    def after(self, *types: Callable[[Any], Any]) -> tuple[Any, ...] | None:
+        """Ключ keyset, после которого начинается страница; `types` — типы колонок сортировки."""
+        if self.cursor is None:
+            return None
+        return decode_cursor(self.cursor, types)
+
+
+def page_params(
+    cursor: str | None = Query(
+        default=None,
+        description=f"Курсор следующей страницы из заголовка {NEXT_CURSOR_HEADER}.",
+    ),
+    limit: int = Query(
+        default=settings.page_size_default,
+        ge=1,
+        le=settings.page_size_max,
+        description="Размер страницы.",
+    ),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def set_next_cursor(response: Response, page: Page[Any]) -> None:
+    if page.next_key is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_key)
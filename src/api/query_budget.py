@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.api.metrics import route_template
+from src.core.metrics import track_request_stats
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_BUDGET_ATTRIBUTE = "__query_budget__"
+_report_sinks: list[list[QueryReport]] = []
+
+
+def query_budget(statements: int) -> Callable[[F], F]:
+    """Объявляет, сколько SQL-выражений эндпоинт может выполнить за запрос.
+
+    Ставится под декоратором маршрута: `@router.get(...)` получает уже помеченную функцию.
+    """
+
+    def decorator(endpoint: F) -> F:
+        setattr(endpoint, _BUDGET_ATTRIBUTE, statements)
+        return endpoint
+
+    return decorator
+
+
+def endpoint_budget(scope: Scope) -> int | None:
+    return getattr(getattr(scope.get("route"), "endpoint", None), _BUDGET_ATTRIBUTE, None)
+
+
+@dataclass(frozen=True, slots=True)
+class QueryReport:
+    method: str
+    route: str
+    statements: int
+    lazy_loads: int
+    budget: int | None
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.statements > self.budget
+
+    @property
+    def exceeded(self) -> bool:
+        return self.over_budget or self.lazy_loads > 0
+
+
+@contextmanager
+def capture_query_reports() -> Iterator[list[QueryReport]]:
+    """Собирает отчёты по всем запросам, прошедшим через QueryBudgetMiddleware внутри блока."""
+    reports: list[QueryReport] = []
+    _report_sinks.append(reports)
+    try:
+        yield reports
+    finally:
+        _report_sinks.remove(reports)
+
+
+class QueryBudgetMiddleware:
+    """Для разработки: предупреждает, если запрос превысил бюджет эндпоинта или лениво грузил связи."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_request_stats() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                report = QueryReport(
+                    method=scope["method"],
+                    route=route_template(scope),
+                    statements=stats.statements,
+                    lazy_loads=stats.lazy_loads,
+                    budget=endpoint_budget(scope),
+                )
+                for reports in _report_sinks:
+                    reports.append(report)
+                if report.exceeded:
+                    logger.warning(
+                        "%s %s: %d SQL-выражений при бюджете %s, ленивых загрузок: %d",
+                        report.method,
+                        report.route,
+                        report.statements,
+                        report.budget,
+                        report.lazy_loads,
+                    )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def dump_json(payload: BaseModel | Sequence[BaseModel]) -> bytes:
+    if isinstance(payload, BaseModel):
+        return payload.__pydantic_serializer__.to_json(payload)
+    if not payload:
+        return b"[]"
+    return _list_adapter(type(payload[0])).dump_json(list(payload))
+
+
+def json_response(
+    payload: BaseModel | Sequence[BaseModel],
+    *,
+    headers: Mapping[str, str] | None = None,
+    status_code: int = 200,
+) -> Response:
+    """Сериализует уже провалидированные мапперами модели один раз, в обход повторной проверки `response_model`.
+
+    `response_model` в декораторе остаётся ради схемы OpenAPI. Заголовки, выставленные зависимостями
+    на подставленный `Response`, FastAPI к готовому ответу не добавляет — их нужно передать в `headers`.
+    """
+    return Response(
+        content=dump_json(payload),
+        status_code=status_code,
+        media_type="application/json",
+        headers=dict(headers) if headers else None,
+    )
@@ -1,3 +1,3 @@
-from src.api.routers import activities, buildings, organizations
+from src.api.routers import activities, buildings, imports, internal, organizations
 
-__all__ = ["activities", "buildings", "organizations"]
+__all__ = ["activities", "buildings", "imports", "internal", "organizations"]
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.conditional import check_not_modified, make_etag
 from src.api.dependencies import verify_api_key
-from src.db.session import get_session
-from src.mappers import map_activity_tree, map_activity_tree_list, map_organization_details
+from src.api.pagination import PageParams, page_params, set_next_cursor
+from src.api.query_budget import query_budget
+from src.api.responses import json_response
+from src.db.session import get_read_session
+from src.mappers import map_organization_documents
 from src.schemas import ActivityTree, OrganizationDetail
 from src.services import activity as activity_service
 from src.services import organization as organization_service
@@ -18,32 +22,50 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)],
 )
 @router.get("/", response_model=list[ActivityTree])
+@query_budget(2)
 async def tree(
-    session: AsyncSession = Depends(get_session),
-) -> list[ActivityTree]:
-    activities = await activity_service.fetch_activity_tree(session)
-    return map_activity_tree_list(activities)
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    snapshot = await activity_service.get_tree_snapshot(session)
+    etag = make_etag(request.url.path, "activities", snapshot.version)
+    check_not_modified(request, etag)
+    return Response(content=snapshot.tree_json, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/{activity_id}", response_model=ActivityTree)
+@query_budget(2)
 async def branch(
     activity_id: UUID,
-    session: AsyncSession = Depends(get_session),
-) -> ActivityTree:
-    activity = await activity_service.get_activity(session, activity_id)
-    if activity is None:
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    snapshot = await activity_service.get_tree_snapshot(session)
+    payload = snapshot.branch_json.get(activity_id)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Деятельность не найдена.")
-    return map_activity_tree(activity)
+    etag = make_etag(request.url.path, "activities", snapshot.version)
+    check_not_modified(request, etag)
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/{activity_id}/organizations", response_model=list[OrganizationDetail])
+@query_budget(3)
 async def organizations_for_activity(
     activity_id: UUID,
-    session: AsyncSession = Depends(get_session),
-) -> list[OrganizationDetail]:
+    response: Response,
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     activity_ids = await activity_service.collect_descendant_ids(session, activity_id)
     if not activity_ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Деятельность не найдена.")
 
-    organizations = await organization_service.list_by_activity_ids(session, activity_ids)
-    return map_organization_details(organizations)
+    organizations = await organization_service.list_by_activity_ids(
+        session,
+        activity_ids,
+        after=page.after(str, UUID),
+        limit=page.limit,
+    )
+    set_next_cursor(response, organizations)
+    return json_response(map_organization_documents(organizations.items), headers=response.headers)
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.conditional import table_etag
 from src.api.dependencies import verify_api_key
-from src.db.session import get_session
-from src.mappers import map_buildings, map_organization_details
+from src.api.pagination import PageParams, page_params, set_next_cursor
+from src.api.query_budget import query_budget
+from src.api.responses import json_response
+from src.db.session import get_read_session
+from src.mappers import map_buildings, map_organization_documents
 from src.schemas import BuildingRead, OrganizationDetail
 from src.services import building as building_service
 from src.services import organization as organization_service
@@ -19,22 +23,35 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=list[BuildingRead])
+@router.get("/", response_model=list[BuildingRead], dependencies=[Depends(table_etag("buildings"))])
+@query_budget(2)
 async def list_buildings(
-    session: AsyncSession = Depends(get_session),
-) -> list[BuildingRead]:
-    buildings = await building_service.list_buildings(session)
-    return map_buildings(buildings)
+    response: Response,
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    buildings = await building_service.list_buildings(session, after=page.after(str, UUID), limit=page.limit)
+    set_next_cursor(response, buildings)
+    return json_response(map_buildings(buildings.items), headers=response.headers)
 
 
 @router.get("/{building_id}/organizations", response_model=list[OrganizationDetail])
+@query_budget(3)
 async def organizations_by_building(
     building_id: UUID,
-    session: AsyncSession = Depends(get_session),
-) -> list[OrganizationDetail]:
+    response: Response,
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
     building = await building_service.get_building(session, building_id)
     if building is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Здание не найдено.")
 
-    organizations = await organization_service.list_by_building(session, building_id)
-    return map_organization_details(organizations)
+    organizations = await organization_service.list_by_building(
+        session,
+        building_id,
+        after=page.after(str, UUID),
+        limit=page.limit,
+    )
+    set_next_cursor(response, organizations)
+    return json_response(map_organization_documents(organizations.items), headers=response.headers)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dependencies import verify_api_key
+from src.db.session import get_session
+from src.mappers import map_import_report
+from src.schemas import ImportReportRead
+from src.services import bulk_import as bulk_import_service
+from src.services.bulk_import import BulkImportError, ImportEntity, ImportFormat
+
+router = APIRouter(
+    prefix="/imports",
+    tags=["Imports"],
+    dependencies=[Depends(verify_api_key)],
+)
+
+
+@router.post(
+    "/{entity}",
+    response_model=ImportReportRead,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_entity(
+    entity: ImportEntity,
+    request: Request,
+    fmt: ImportFormat | None = Query(
+        default=None,
+        alias="format",
+        description="Формат тела; по умолчанию определяется по Content-Type (text/csv или NDJSON).",
+    ),
+    session: AsyncSession = Depends(get_session),
+) -> ImportReportRead:
+    if fmt is None:
+        content_type = request.headers.get("content-type", "")
+        fmt = ImportFormat.CSV if content_type.startswith("text/csv") else ImportFormat.NDJSON
+
+    lines = bulk_import_service.iter_lines(request.stream())
+    try:
+        report = await bulk_import_service.import_lines(session, entity, lines, fmt)
+    except (BulkImportError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Данные нарушают ограничения целостности.",
+        ) from exc
+    return map_import_report(report)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from src.api.dependencies import verify_api_key
+from src.api.query_budget import query_budget
+from src.db.pool import pool_status
+from src.db.session import engine
+from src.schemas import PoolStatusRead
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    dependencies=[Depends(verify_api_key)],
+)
+
+
+@router.get("/pool", response_model=PoolStatusRead)
+@query_budget(0)
+async def pool() -> PoolStatusRead:
+    """Состояние пула соединений этого воркера."""
+    return PoolStatusRead(**pool_status(engine.pool))
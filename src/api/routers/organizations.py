@@ -1,52 +1,148 @@
 from __future__ import annotations
 
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.conditional import table_etag
 from src.api.dependencies import verify_api_key
-from src.db.session import get_session
-from src.mappers import map_organization_detail, map_organization_details
-from src.schemas import OrganizationDetail
+from src.api.pagination import PageParams, page_params, set_next_cursor
+from src.api.query_budget import query_budget
+from src.api.responses import json_response
+from src.config import settings
+from src.db.session import get_read_session, read_session
+from src.mappers import (
+    map_organization_batch,
+    map_organization_details,
+    map_organization_document,
+    map_organization_documents,
+    map_organization_matches,
+    map_organization_suggestions,
+    map_organizations_nearby,
+)
+from src.models import Organization
+from src.repositories import BoundingBox, GeoRadius, OrganizationFilter
+from src.schemas import (
+    OrganizationBatchRead,
+    OrganizationBatchRequest,
+    OrganizationDetail,
+    OrganizationMatch,
+    OrganizationNearby,
+    OrganizationSuggestion,
+)
 from src.services import activity as activity_service
 from src.services import organization as organization_service
+from src.services import suggest as suggest_service
 
 router = APIRouter(
     prefix="/organizations",
     tags=["Organizations"],
     dependencies=[Depends(verify_api_key)],
 )
+
+# Таблицы, из которых собирается OrganizationDetail: изменение любой из них меняет ETag.
+DETAIL_TABLES = ("organizations", "organization_phones", "organization_activities", "buildings", "activities")
+
+
 @router.get("/", response_model=list[OrganizationDetail])
+@query_budget(3)
 async def list_organizations(
+    response: Response,
     name: str | None = Query(default=None, min_length=1, description="Часть названия."),
     activity_id: UUID | None = Query(default=None, description="ID вида деятельности (с потомками)."),
-    session: AsyncSession = Depends(get_session),
-) -> list[OrganizationDetail]:
-    organizations: list = []
-
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    criteria = OrganizationFilter(name=name)
     if activity_id:
         activity_ids = await activity_service.collect_descendant_ids(session, activity_id)
         if not activity_ids:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Деятельность не найдена.")
-        organizations = await organization_service.list_by_activity_ids(session, activity_ids)
+        criteria = criteria.with_activities(activity_ids)
 
-    if name:
-        name_matches = await organization_service.search_by_name(session, name)
-        if not organizations:
-            organizations = name_matches
-        else:
-            present_ids = {org.id for org in organizations}
-            organizations = [org for org in name_matches if org.id in present_ids]
+    organizations = await organization_service.search(
+        session,
+        criteria,
+        after=page.after(str, UUID),
+        limit=page.limit,
+    )
+    set_next_cursor(response, organizations)
+    return json_response(map_organization_documents(organizations.items), headers=response.headers)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Все организации, по одному объекту `OrganizationDetail` в строке.",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+async def export() -> StreamingResponse:
+    return StreamingResponse(_export_ndjson(settings.export_chunk_size), media_type="application/x-ndjson")
+
+
+async def _export_ndjson(chunk_size: int) -> AsyncIterator[bytes]:
+    # Сессия живёт столько же, сколько поток ответа, а не как зависимость запроса.
+    async with read_session() as session:
+        async for chunk in organization_service.stream_all(session, chunk_size):
+            yield _ndjson_chunk(chunk)
+
+
+def _ndjson_chunk(organizations: Iterable[Organization]) -> bytes:
+    return b"".join(detail.model_dump_json().encode() + b"\n" for detail in map_organization_details(organizations))
+
+
+@router.get("/suggest", response_model=list[OrganizationSuggestion])
+@query_budget(2)
+async def suggest(
+    prefix: str = Query(min_length=1, max_length=255, description="Начало названия или слова в нём."),
+    limit: int = Query(default=10, ge=1, le=50, description="Сколько подсказок вернуть."),
+) -> Response:
+    # Отвечает из индекса в памяти: сессия БД на запрос не открывается.
+    rows = await suggest_service.suggest(prefix, limit)
+    return json_response(map_organization_suggestions(rows))
+
+
+@router.get("/search", response_model=list[OrganizationDetail])
+@query_budget(1)
+async def search_text(
+    response: Response,
+    q: str = Query(min_length=1, max_length=255, description="Поисковый запрос по названию и описанию."),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    organizations = await organization_service.search_text(
+        session,
+        q,
+        after=page.after(float, UUID),
+        limit=page.limit,
+    )
+    set_next_cursor(response, organizations)
+    return json_response(map_organization_documents(organizations.items), headers=response.headers)
 
-    if not organizations and name is None and activity_id is None:
-        organizations = await organization_service.list_all(session)
 
-    return map_organization_details(organizations)
+@router.get("/search/fuzzy", response_model=list[OrganizationMatch])
+@query_budget(2)
+async def search_fuzzy(
+    q: str = Query(min_length=1, max_length=255, description="Название или его часть, допускаются опечатки."),
+    limit: int = Query(default=10, ge=1, le=50, description="Сколько совпадений вернуть."),
+    threshold: float | None = Query(default=None, ge=0, le=1, description="Минимальное сходство (0–1)."),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    rows = await organization_service.search_fuzzy(session, q, limit=limit, threshold=threshold)
+    return json_response(map_organization_matches(rows))
 
 
 @router.get("/geo/search", response_model=list[OrganizationDetail])
+@query_budget(2)
 async def search_by_geo(
+    response: Response,
     latitude: float | None = Query(default=None, description="Широта центра радиуса."),
     longitude: float | None = Query(default=None, description="Долгота центра радиуса."),
     radius_km: float | None = Query(default=None, gt=0, description="Радиус (км)."),
@@ -54,62 +150,80 @@ async def search_by_geo(
     max_latitude: float | None = Query(default=None, description="Максимальная широта."),
     min_longitude: float | None = Query(default=None, description="Минимальная долгота."),
     max_longitude: float | None = Query(default=None, description="Максимальная долгота."),
-    session: AsyncSession = Depends(get_session),
-) -> list[OrganizationDetail]:
-    use_radius = latitude is not None and longitude is not None and radius_km is not None
-    use_bbox = all(
-        value is not None
-        for value in (min_latitude, max_latitude, min_longitude, max_longitude)
-    )
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    radius = None
+    if latitude is not None and longitude is not None and radius_km is not None:
+        radius = GeoRadius(latitude=latitude, longitude=longitude, radius_km=radius_km)
+
+    bbox = None
+    corners = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if all(value is not None for value in corners):
+        bbox = BoundingBox(
+            min_latitude=min_latitude,  # type: ignore[arg-type]
+            max_latitude=max_latitude,  # type: ignore[arg-type]
+            min_longitude=min_longitude,  # type: ignore[arg-type]
+            max_longitude=max_longitude,  # type: ignore[arg-type]
+        )
 
-    if not use_radius and not use_bbox:
+    if radius is None and bbox is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Нужно указать параметры радиуса или прямоугольника.",
         )
 
-    radius_results = None
-    if use_radius:
-        radius_results = await organization_service.list_within_radius(
-            session=session,
-            latitude=latitude,  # type: ignore[arg-type]
-            longitude=longitude,  # type: ignore[arg-type]
-            radius_km=radius_km,  # type: ignore[arg-type]
-        )
-
-    bbox_results = None
-    if use_bbox:
-        bbox_results = await organization_service.list_in_bbox(
-            session=session,
-            min_latitude=min_latitude,  # type: ignore[arg-type]
-            max_latitude=max_latitude,  # type: ignore[arg-type]
-            min_longitude=min_longitude,  # type: ignore[arg-type]
-            max_longitude=max_longitude,  # type: ignore[arg-type]
-        )
+    organizations = await organization_service.search(
+        session,
+        OrganizationFilter(bbox=bbox, radius=radius),
+        after=page.after(str, UUID),
+        limit=page.limit,
+    )
+    set_next_cursor(response, organizations)
+    return json_response(map_organization_documents(organizations.items), headers=response.headers)
+
+
+@router.get("/geo/nearest", response_model=list[OrganizationNearby])
+@query_budget(3)
+async def nearest(
+    latitude: float = Query(description="Широта точки."),
+    longitude: float = Query(description="Долгота точки."),
+    limit: int = Query(default=10, ge=1, le=100, description="Сколько ближайших организаций вернуть."),
+    max_radius_km: float | None = Query(default=None, gt=0, description="Максимальное расстояние (км)."),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    rows = await organization_service.list_nearest(
+        session=session,
+        latitude=latitude,
+        longitude=longitude,
+        limit=limit,
+        max_radius_km=max_radius_km,
+    )
+    return json_response(map_organizations_nearby(rows))
 
-    if use_radius and use_bbox:
-        assert radius_results is not None and bbox_results is not None
-        bbox_ids = {org.id for org in bbox_results}
-        results = [org for org in radius_results if org.id in bbox_ids]
-    elif use_radius:
-        assert radius_results is not None
-        results = radius_results
-    elif use_bbox:
-        assert bbox_results is not None
-        results = bbox_results
-    else:
-        results = await organization_service.list_all(session)
 
-    unique = {org.id: org for org in results}
-    return map_organization_details(unique.values())
+@router.post("/batch", response_model=OrganizationBatchRead)
+@query_budget(1)
+async def retrieve_batch(
+    payload: OrganizationBatchRequest,
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    batch = await organization_service.get_details(session, payload.ids)
+    return json_response(map_organization_batch(batch))
 
 
-@router.get("/{organization_id}", response_model=OrganizationDetail)
+@router.get(
+    "/{organization_id}",
+    response_model=OrganizationDetail,
+    dependencies=[Depends(table_etag(*DETAIL_TABLES))],
+)
+@query_budget(2)
 async def retrieve(
     organization_id: UUID,
-    session: AsyncSession = Depends(get_session),
-) -> OrganizationDetail:
-    organization = await organization_service.get_by_id(session, organization_id)
-    if organization is None:
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    document = await organization_service.get_detail(session, organization_id)
+    if document is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Организация не найдена.")
-    return map_organization_detail(organization)
+    return json_response(map_organization_document(document), headers=response.headers)
@@ -0,0 +1,66 @@
+"""Массовая загрузка справочника из NDJSON или CSV через COPY.
+
+    python -m src.cli.bulk_import buildings buildings.csv
+    python -m src.cli.bulk_import organizations organizations.ndjson
+    cat phones.csv | python -m src.cli.bulk_import organization_phones - --format csv
+
+Сущности стоит загружать в порядке зависимостей: buildings, organizations,
+organization_phones, organization_activities.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+
+from src.db.session import AsyncSessionFactory, engine
+from src.services import bulk_import as bulk_import_service
+from src.services.bulk_import import ImportEntity, ImportFormat, ImportReport
+
+READ_CHUNK_SIZE = 1 << 20
+
+
+async def _read_chunks(stream: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(stream.read, READ_CHUNK_SIZE):
+        yield chunk
+
+
+def _detect_format(path: str) -> ImportFormat:
+    return ImportFormat.CSV if path.lower().endswith(".csv") else ImportFormat.NDJSON
+
+
+async def run(entity: ImportEntity, path: str, fmt: ImportFormat | None) -> ImportReport:
+    fmt = fmt or _detect_format(path)
+    stream = sys.stdin.buffer if path == "-" else Path(path).open("rb")
+    try:
+        async with AsyncSessionFactory() as session:
+            lines = bulk_import_service.iter_lines(_read_chunks(stream))
+            report = await bulk_import_service.import_lines(session, entity, lines, fmt)
+            await session.commit()
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        await engine.dispose()
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("entity", choices=[entity.value for entity in ImportEntity])
+    parser.add_argument("path", help="Файл с данными или '-' для stdin.")
+    parser.add_argument("--format", dest="fmt", choices=[fmt.value for fmt in ImportFormat], default=None)
+    args = parser.parse_args(argv)
+
+    fmt = ImportFormat(args.fmt) if args.fmt else None
+    report = asyncio.run(run(ImportEntity(args.entity), args.path, fmt))
+    print(
+        f"{report.entity}: {report.rows} rows read, {report.upserted} upserted "
+        f"in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Синтетический справочник для нагрузочных и масштабных проверок.
+
+Организации распределены по зданиям вокруг центров крупных городов (чем больше город,
+тем шире облако), дерево видов деятельности — `--activity-width` детей на узел на
+`--activity-depth` уровней. Одинаковые параметры и `--seed` дают одинаковые данные;
+строки загружаются через COPY тем же путём, что и массовый импорт::
+
+    python -m src.cli.generate_directory --organizations 1000000
+    python -m src.cli.generate_directory --organizations 50000 --activity-width 12 --phones 0-2 --truncate
+
+Повторный запуск с теми же параметрами ничего не дублирует (upsert по id). Данные с другим
+`--seed` конфликтуют по уникальным названиям — загружайте их с `--truncate`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from sqlalchemy.exc import IntegrityError
+
+from src.config import settings
+from src.db.session import AsyncSessionFactory, engine
+from src.services import directory_generator as directory_generator_service
+from src.services.directory_generator import DirectoryShape, GenerationReport
+
+
+def _fan_out(value: str) -> tuple[int, int]:
+    low, _, high = value.partition("-")
+    try:
+        return int(low), int(high or low)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Ожидается число или диапазон вида 1-3, получено {value!r}") from exc
+
+
+async def run(shape: DirectoryShape, batch_size: int, truncate: bool) -> GenerationReport:
+    try:
+        async with AsyncSessionFactory() as session:
+            report = await directory_generator_service.load_directory(session, shape, batch_size, truncate=truncate)
+            await session.commit()
+            await directory_generator_service.analyze_directory(session)
+            await session.commit()
+    finally:
+        await engine.dispose()
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--organizations", type=int, required=True)
+    parser.add_argument("--organizations-per-building", type=float, default=8.0)
+    parser.add_argument("--activity-width", type=int, default=8, help="Детей у каждого вида деятельности.")
+    parser.add_argument("--activity-depth", type=int, default=3, help="Уровней в дереве (1–3).")
+    parser.add_argument("--phones", type=_fan_out, default=(1, 3), help="Телефонов на организацию, например 1-3.")
+    parser.add_argument("--activities", type=_fan_out, default=(1, 3), help="Видов деятельности на организацию.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=settings.bulk_import_batch_size)
+    parser.add_argument("--truncate", action="store_true", help="Предварительно очистить справочник.")
+    args = parser.parse_args(argv)
+
+    try:
+        shape = DirectoryShape(
+            organizations=args.organizations,
+            organizations_per_building=args.organizations_per_building,
+            activity_width=args.activity_width,
+            activity_depth=args.activity_depth,
+            phones=args.phones,
+            activities=args.activities,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    try:
+        report = asyncio.run(run(shape, args.batch_size, args.truncate))
+    except IntegrityError:
+        parser.exit(1, "Данные конфликтуют с уже загруженными; запустите с --truncate.\n")
+
+    for table, rows in report.rows.items():
+        print(f"{table}: {rows:,} rows")
+    print(f"{sum(report.rows.values()):,} rows in {report.seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,25 @@ class DatabaseSettings(BaseModel):
     async_url: str = "postgresql+asyncpg://postgres:postgres@db:5432/org_directory"
     sync_url: str = "postgresql+psycopg://postgres:postgres@db:5432/org_directory"
 
+    # Реплика для GET-запросов; при её недоступности чтение идёт в основную БД.
+    replica_url: str | None = None
+    replica_retry_seconds: float = 30.0
+
+    # Пул соединений на один процесс (воркер).
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+
+    # Кэш подготовленных выражений asyncpg на соединение; 0 — выключен.
+    statement_cache_size: int = 100
+    statement_timeout_ms: int | None = None
+
+    # Совместимость с PgBouncer в режиме transaction pooling: без кэша prepared statements
+    # и без параметров сессии в стартовом пакете.
+    pgbouncer: bool = False
+
 
 class Settings(BaseSettings):
     """Конфигурация приложения."""
@@ -21,10 +40,40 @@ class Settings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()
     log_sql: bool = False
 
+    page_size_default: int = 50
+    page_size_max: int = 500
+    export_chunk_size: int = 1000
+    batch_lookup_max_ids: int = 500
+    bulk_import_batch_size: int = 5000
+    fuzzy_search_threshold: float = 0.3
+    # До этого радиуса геопоиск берёт кандидатов окном по индексу (одним запросом на всплеск одинаковых
+    # запросов карты) и проверяет расстояние в Python; на больших радиусах фильтр целиком остаётся в SQL.
+    geo_post_filter_max_radius_km: float = 5.0
+    suggest_refresh_seconds: float = 10.0
+
+    activity_tree_cache: bool = True
+    activity_tree_refresh_seconds: float = 5.0
+
+    # Кэш чтений репозиториев в памяти воркера; сбрасывается после записей этого же воркера.
+    repository_cache: bool = True
+    repository_cache_ttl_seconds: float = 30.0
+    repository_cache_max_entries: int = 10_000
+    # Одинаковые одновременные чтения внутри воркера обслуживаются одним запросом к БД.
+    coalesce_reads: bool = True
+
+    # Метрики в формате Prometheus; Server-Timing показывает время в БД прямо в ответе.
+    metrics_enabled: bool = True
+    metrics_path: str = "/metrics"
+    server_timing: bool = False
+
+    # Для разработки: предупреждения о превышении бюджета SQL-запросов эндпоинта и ленивых загрузках.
+    query_budget_warnings: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         env_prefix="APP_",
+        env_nested_delimiter="__",
         arbitrary_types_allowed=True,
     )
 
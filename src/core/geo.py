@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy входит в зависимости, но поиск работает и без неё
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+
+# На малых выборках накладные расходы на создание массивов дороже скалярного цикла.
+VECTORIZE_MIN_CANDIDATES = 32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1_rad, lon1_rad, lat2_rad, lon2_rad = map(math.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    c = 2 * math.asin(math.sqrt(a))
+    return EARTH_RADIUS_KM * c
+
+
+def window_deltas(latitude: float, radius_km: float) -> tuple[float, float]:
+    """Полуширина окна широт/долгот, гарантированно покрывающего круг радиуса `radius_km`."""
+    lat_delta = radius_km / 111.0
+    lon_delta = radius_km / (111.0 * max(math.cos(math.radians(latitude)), 0.00001))
+    return lat_delta, lon_delta
+
+
+def within_radius_mask(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    radius_km: float,
+) -> list[bool]:
+    """Для каждой точки — попадает ли она в радиус от центра (один векторный проход, если доступен numpy)."""
+    if np is None or len(latitudes) < VECTORIZE_MIN_CANDIDATES:
+        return [
+            haversine_km(latitude, longitude, lat, lon) <= radius_km
+            for lat, lon in zip(latitudes, longitudes)
+        ]
+    return _within_radius_mask_numpy(latitude, longitude, latitudes, longitudes, radius_km).tolist()
+
+
+def _within_radius_mask_numpy(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    radius_km: float,
+):
+    half_angle = radius_km / (2 * EARTH_RADIUS_KM)
+    if half_angle >= math.pi / 2:
+        return np.ones(len(latitudes), dtype=bool)
+
+    lat_rad = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon_rad = np.radians(np.asarray(longitudes, dtype=np.float64))
+    center_lat = math.radians(latitude)
+    center_lon = math.radians(longitude)
+
+    a = np.sin((lat_rad - center_lat) / 2) ** 2 + math.cos(center_lat) * np.cos(lat_rad) * np.sin(
+        (lon_rad - center_lon) / 2
+    ) ** 2
+    # 2R·asin(√a) <= r  ⇔  a <= sin²(r / 2R): сравниваем без asin и sqrt.
+    return a <= math.sin(half_angle) ** 2
@@ -0,0 +1,202 @@
+"""Минимальный реестр метрик в текстовом формате Prometheus.
+
+Все счётчики обновляются из event loop, поэтому обходятся без блокировок; запись —
+это поиск по словарю и сложение, без аллокаций на горячем пути после первой серии.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+LabelValues = tuple[str, ...]
+M = TypeVar("M", bound="Metric")
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self.samples()
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Для каждой серии: счётчики по корзинам (последняя — +Inf), сумма, количество.
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+        counts, totals = series
+        counts[bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._series.get(labels)
+        return int(series[1][1]) if series else 0
+
+    def samples(self) -> Iterator[str]:
+        bucket_names = (*self.labelnames, "le")
+        for labels, (counts, (total, count)) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                label_text = _format_labels(bucket_names, (*labels, _format_value(bound)))
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {_format_value(count)}"
+
+
+class CallbackMetric(Metric):
+    """Значения снимаются в момент выгрузки метрик, а не обновляются на горячем пути."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[LabelValues, float]]],
+        type_name: str = "gauge",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+        self.type_name = type_name
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self._collect():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """SQL-нагрузка одного HTTP-запроса; заполняется событиями движка."""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    lazy_loads: int = 0
+
+
+current_request_stats: ContextVar[RequestStats | None] = ContextVar("current_request_stats", default=None)
+
+
+@contextmanager
+def track_request_stats() -> Iterator[RequestStats]:
+    """Статистика текущего запроса; вложенные middleware получают один и тот же объект."""
+    stats = current_request_stats.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_request_stats.reset(token)
+
+
+registry = Registry()
+
+http_requests_total = registry.register(
+    Counter("http_requests_total", "HTTP-запросы по маршруту и статусу.", ("method", "route", "status"))
+)
+http_request_duration_seconds = registry.register(
+    Histogram("http_request_duration_seconds", "Время обработки HTTP-запроса.", ("method", "route"))
+)
+http_request_db_statements = registry.register(
+    Histogram(
+        "http_request_db_statements",
+        "Число SQL-выражений на HTTP-запрос.",
+        ("method", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+http_request_db_seconds = registry.register(
+    Histogram("http_request_db_seconds", "Время в SQL за HTTP-запрос.", ("method", "route"))
+)
+db_statements_total = registry.register(
+    Counter("db_statements_total", "Выполненные SQL-выражения.", ("engine",))
+)
+db_statement_seconds_total = registry.register(
+    Counter("db_statement_seconds_total", "Суммарное время выполнения SQL.", ("engine",))
+)
@@ -4,14 +4,18 @@ from fastapi import FastAPI
 from sqlalchemy import text
 
 from src.api import main_router
+from src.api.metrics import MetricsMiddleware, metrics_endpoint
+from src.api.query_budget import QueryBudgetMiddleware
 from src.config import settings
 from src.db.session import AsyncSessionFactory
+from src.services import suggest as suggest_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with AsyncSessionFactory() as session:
         await session.execute(text("SELECT 1"))
+    await suggest_service.warm_up()
     yield
 
 
@@ -21,4 +25,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
     app.include_router(main_router, prefix=settings.api_prefix + settings.api_v1_prefix)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+        app.add_route(settings.metrics_path, metrics_endpoint, include_in_schema=False)
+    if settings.query_budget_warnings:
+        app.add_middleware(QueryBudgetMiddleware)
     return app
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.core.metrics import (
+    CallbackMetric,
+    LabelValues,
+    current_request_stats,
+    db_statement_seconds_total,
+    db_statements_total,
+    registry,
+)
+from src.db.pool import pool_status
+
+_engines: dict[str, AsyncEngine] = {}
+
+# Поля pool_status, которые выгружаются как `db_pool_<имя>`: (имя, поле, тип, описание).
+POOL_METRICS = (
+    ("size", "size", "gauge", "Размер пула."),
+    ("checked_out", "checked_out", "gauge", "Соединения, выданные из пула."),
+    ("checked_in", "checked_in", "gauge", "Свободные соединения в пуле."),
+    ("overflow", "overflow", "gauge", "Соединения сверх pool_size."),
+    ("checkouts_total", "checkouts", "counter", "Выдачи соединений из пула."),
+    ("timeouts_total", "timeouts", "counter", "Таймауты ожидания соединения."),
+    ("wait_seconds_total", "wait_seconds_total", "counter", "Суммарное ожидание выдачи соединения."),
+    ("wait_seconds_max", "wait_seconds_max", "gauge", "Максимальное ожидание выдачи соединения."),
+)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Считает SQL-выражения и их время по движку и в статистику текущего HTTP-запроса."""
+    labels: LabelValues = (name,)
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _started(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finished(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_statements_total.inc(labels)
+        db_statement_seconds_total.inc(labels, elapsed)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(context: Any) -> None:
+        # after_cursor_execute при ошибке не вызывается — снимаем отметку времени, чтобы стек не рос.
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    _engines[name] = engine
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _count_lazy_load(orm_execute_state: ORMExecuteState) -> None:
+    # Ленивая загрузка связи — почти всегда пропущенный selectinload/joinedload, то есть N+1.
+    # Для не-SELECT (DDL, массовые операции) `lazy_loaded_from` недоступен и бросает исключение.
+    if orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.lazy_loads += 1
+
+
+def _pool_values(field: str) -> Iterator[tuple[LabelValues, float]]:
+    for name, engine in _engines.items():
+        value = pool_status(engine.pool).get(field)
+        if value is not None:
+            yield (name,), float(value)
+
+
+for _name, _field, _type, _documentation in POOL_METRICS:
+    registry.register(
+        CallbackMetric(
+            f"db_pool_{_name}",
+            _documentation,
+            ("engine",),
+            lambda field=_field: _pool_values(field),
+            type_name=_type,
+        )
+    )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection
+
+
+@dataclass(slots=True)
+class CheckoutStats:
+    """Накопленные с запуска процесса счётчики выдачи соединений из пула."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Очередь соединений, которая меряет время ожидания выдачи и считает таймауты."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.checkout_stats.timeouts += 1
+            raise
+        self.checkout_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Текущее состояние пула: размер, занятые и свободные соединения, переполнение, ожидание."""
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    stats = getattr(pool, "checkout_stats", None)
+    if isinstance(stats, CheckoutStats):
+        status.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_seconds_total=stats.wait_seconds_total,
+            wait_seconds_max=stats.wait_seconds_max,
+        )
+    return status
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# Ошибки, при которых реплика считается недоступной: нет соединения, отказ сервера, исчерпан пул.
+REPLICA_ERRORS = (OSError, TimeoutError, exc.DBAPIError, exc.TimeoutError)
+
+
+class ReadSessionRouter:
+    """Выдаёт сессии для чтения: с реплики, если она задана и отвечает, иначе с основной БД.
+
+    После отказа реплика не опрашивается `retry_after` секунд, чтобы запросы не ждали таймаут соединения.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession] | None = None,
+        retry_after: float = 30.0,
+    ):
+        self._primary = primary
+        self._replica = replica
+        self._retry_after = retry_after
+        self._replica_down_until = float("-inf")
+
+    @property
+    def replica_available(self) -> bool:
+        return self._replica is not None and time.monotonic() >= self._replica_down_until
+
+    async def open(self) -> AsyncSession:
+        if self._replica is not None and self.replica_available:
+            session = self._replica()
+            try:
+                # Соединение берётся сразу: ошибка сейчас ещё позволяет уйти на основную БД.
+                await session.connection()
+                return session
+            except REPLICA_ERRORS:
+                await session.close()
+                self._replica_down_until = time.monotonic() + self._retry_after
+        return self._primary()
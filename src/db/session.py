@@ -1,21 +1,91 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+from uuid import uuid4
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from src.config import settings
+from src.config.settings import DatabaseSettings
+from src.db.instrumentation import instrument_engine
+from src.db.pool import InstrumentedQueuePool
+from src.db.replica import ReadSessionRouter
 
-engine: AsyncEngine = create_async_engine(
-    settings.database.async_url,
-    echo=settings.log_sql,
-    future=True,
-)
+
+def _unique_statement_name() -> str:
+    # PgBouncer может отдать соединение другому клиенту: имена prepared statements не должны пересекаться.
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(database: DatabaseSettings) -> dict[str, Any]:
+    """Параметры пула и драйвера asyncpg для `create_async_engine`."""
+    connect_args: dict[str, Any] = {}
+    if database.pgbouncer:
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=_unique_statement_name,
+        )
+    else:
+        connect_args.update(
+            statement_cache_size=database.statement_cache_size,
+            prepared_statement_cache_size=database.statement_cache_size,
+        )
+        if database.statement_timeout_ms is not None:
+            connect_args["server_settings"] = {"statement_timeout": str(database.statement_timeout_ms)}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": database.pool_size,
+        "max_overflow": database.max_overflow,
+        "pool_timeout": database.pool_timeout,
+        "pool_recycle": database.pool_recycle,
+        "pool_pre_ping": database.pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def create_engine(database: DatabaseSettings, url: str | None = None, **kwargs: Any) -> AsyncEngine:
+    async_engine = create_async_engine(url or database.async_url, **engine_options(database), **kwargs)
+    if database.pgbouncer and database.statement_timeout_ms is not None:
+        # PgBouncer не пропускает server_settings из стартового пакета — таймаут ставится на каждую транзакцию.
+        timeout_sql = f"SET LOCAL statement_timeout = {int(database.statement_timeout_ms)}"
+
+        @event.listens_for(async_engine.sync_engine, "begin")
+        def _set_statement_timeout(connection: Any) -> None:
+            connection.exec_driver_sql(timeout_sql)
+
+    return async_engine
+
+
+engine: AsyncEngine = create_engine(settings.database, echo=settings.log_sql)
+instrument_engine(engine, "primary")
 
 AsyncSessionFactory = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
 )
 
+replica_engine: AsyncEngine | None = (
+    create_engine(settings.database, url=settings.database.replica_url, echo=settings.log_sql)
+    if settings.database.replica_url
+    else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine, "replica")
+
+
+def _read_only_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Транзакции открываются как READ ONLY; флаг снимается, когда соединение возвращается в пул.
+    return async_sessionmaker(bind=bind.execution_options(postgresql_readonly=True), expire_on_commit=False)
+
+
+read_router = ReadSessionRouter(
+    primary=_read_only_factory(engine),
+    replica=_read_only_factory(replica_engine) if replica_engine is not None else None,
+    retry_after=settings.database.replica_retry_seconds,
+)
+
 
 @asynccontextmanager
 async def lifespan_session() -> AsyncGenerator[AsyncSession, None]:
@@ -24,6 +94,20 @@ async def lifespan_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@asynccontextmanager
+async def read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Сессия только для чтения: реплика, если доступна; транзакция не фиксируется, а откатывается при закрытии."""
+    session = await read_router.open()
+    async with session:
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Зависимость FastAPI для эндпоинтов, которые только читают данные."""
+    async with read_session() as session:
+        yield session
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Зависимость FastAPI для выдачи сессии."""
     async with AsyncSessionFactory() as session:
@@ -1,13 +1,33 @@
-from src.mappers.activity import map_activity_tree, map_activity_tree_list
+from src.mappers.activity import map_activity_branches, map_activity_tree, map_activity_tree_list
 from src.mappers.building import map_building, map_buildings
-from src.mappers.organization import map_organization_detail, map_organization_details
+from src.mappers.imports import map_import_report
+from src.mappers.organization import (
+    map_organization_batch,
+    map_organization_detail,
+    map_organization_details,
+    map_organization_document,
+    map_organization_documents,
+    map_organization_matches,
+    map_organization_nearby,
+    map_organization_suggestions,
+    map_organizations_nearby,
+)
 
 __all__ = [
+    "map_activity_branches",
     "map_activity_tree",
     "map_activity_tree_list",
     "map_building",
     "map_buildings",
+    "map_import_report",
+    "map_organization_batch",
     "map_organization_detail",
     "map_organization_details",
+    "map_organization_document",
+    "map_organization_documents",
+    "map_organization_matches",
+    "map_organization_nearby",
+    "map_organization_suggestions",
+    "map_organizations_nearby",
 ]
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import Iterable
+from uuid import UUID
 
 from src.models import Activity
 from src.schemas import ActivityTree
@@ -20,3 +22,26 @@ def map_activity_tree(activity: Activity) -> ActivityTree:
 def map_activity_tree_list(activities: Iterable[Activity]) -> list[ActivityTree]:
     return [map_activity_tree(activity) for activity in sorted(activities, key=lambda item: item.name)]
 
+
+def map_activity_branches(activities: Iterable[Activity]) -> dict[UUID, ActivityTree]:
+    """Строит поддерево для каждого узла по плоскому списку, не обращаясь к `Activity.children`."""
+    children: defaultdict[UUID | None, list[Activity]] = defaultdict(list)
+    for activity in sorted(activities, key=lambda item: item.name):
+        children[activity.parent_id].append(activity)
+
+    branches: dict[UUID, ActivityTree] = {}
+
+    def build(activity: Activity) -> ActivityTree:
+        branch = ActivityTree(
+            id=activity.id,
+            name=activity.name,
+            level=activity.level,
+            parent_id=activity.parent_id,
+            children=[build(child) for child in children.get(activity.id, [])],
+        )
+        branches[activity.id] = branch
+        return branch
+
+    for root in children.get(None, []):
+        build(root)
+    return branches
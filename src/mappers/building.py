@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
 from src.models import Building
 from src.schemas import BuildingRead
 
+if TYPE_CHECKING:
+    from src.repositories.building import BuildingRow
 
-def map_building(building: Building) -> BuildingRead:
+
+def map_building(building: Building | BuildingRow) -> BuildingRead:
     return BuildingRead(
         id=building.id,
         address=building.address,
@@ -15,6 +18,6 @@ def map_building(building: Building) -> BuildingRead:
     )
 
 
-def map_buildings(buildings: Iterable[Building]) -> list[BuildingRead]:
+def map_buildings(buildings: Iterable[Building | BuildingRow]) -> list[BuildingRead]:
     return [map_building(building) for building in buildings]
 
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.schemas import ImportReportRead
+
+if TYPE_CHECKING:
+    from src.services.bulk_import import ImportReport
+
+
+def map_import_report(report: ImportReport) -> ImportReportRead:
+    return ImportReportRead(
+        entity=report.entity,
+        rows=report.rows,
+        upserted=report.upserted,
+        seconds=report.seconds,
+        rows_per_second=report.rows_per_second,
+    )
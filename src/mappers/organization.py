@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+from uuid import UUID
 
 from src.mappers.building import map_building
 from src.models import Activity, Organization, OrganizationPhone
-from src.schemas import ActivityRead, OrganizationDetail, OrganizationPhoneRead
+from src.schemas import (
+    ActivityRead,
+    OrganizationBatchRead,
+    OrganizationDetail,
+    OrganizationMatch,
+    OrganizationNearby,
+    OrganizationPhoneRead,
+    OrganizationSuggestion,
+)
+
+if TYPE_CHECKING:
+    from src.services.organization import OrganizationBatch
 
 
 def _map_activity(activity: Activity) -> ActivityRead:
@@ -42,3 +54,32 @@ def map_organization_detail(organization: Organization) -> OrganizationDetail:
 def map_organization_details(organizations: Iterable[Organization]) -> list[OrganizationDetail]:
     return [map_organization_detail(org) for org in organizations]
 
+
+def map_organization_document(document: Mapping[str, Any]) -> OrganizationDetail:
+    """Документ из `OrganizationRepository._detail_stmt` уже отсортирован в БД — только валидация."""
+    return OrganizationDetail.model_validate(document)
+
+
+def map_organization_documents(documents: Iterable[Mapping[str, Any]]) -> list[OrganizationDetail]:
+    return [map_organization_document(document) for document in documents]
+
+
+def map_organization_batch(batch: OrganizationBatch) -> OrganizationBatchRead:
+    return OrganizationBatchRead(items=map_organization_documents(batch.items), missing=batch.missing)
+
+
+def map_organization_matches(rows: Iterable[tuple[Mapping[str, Any], float]]) -> list[OrganizationMatch]:
+    return [OrganizationMatch.model_validate({**document, "similarity": similarity}) for document, similarity in rows]
+
+
+def map_organization_nearby(organization: Organization, distance_km: float) -> OrganizationNearby:
+    detail = map_organization_detail(organization)
+    return OrganizationNearby(**dict(detail), distance_km=distance_km)
+
+
+def map_organizations_nearby(rows: Iterable[tuple[Organization, float]]) -> list[OrganizationNearby]:
+    return [map_organization_nearby(org, distance_km) for org, distance_km in rows]
+
+
+def map_organization_suggestions(rows: Iterable[tuple[UUID, str]]) -> list[OrganizationSuggestion]:
+    return [OrganizationSuggestion(id=organization_id, name=name) for organization_id, name in rows]
@@ -1,12 +1,13 @@
 from src.models.activity import Activity
 from src.models.building import Building
 from src.models.organization import Organization, OrganizationPhone, organization_activities
+from src.models.table_version import TableVersion
 
 __all__ = [
     "Activity",
     "Building",
     "Organization",
     "OrganizationPhone",
+    "TableVersion",
     "organization_activities",
 ]
-
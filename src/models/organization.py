@@ -3,8 +3,8 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, ForeignKey, String, Table
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Computed, ForeignKey, Index, String, Table
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.base import Base
@@ -29,14 +29,28 @@ organization_activities = Table(
         ForeignKey("activities.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    Index("ix_organization_activities_activity_id", "activity_id", "organization_id"),
 )
 
+# Конфигурация словаря полнотекстового поиска; должна совпадать с выражением колонки search_vector.
+SEARCH_CONFIG = "russian"
+
 
 class Organization(Base):
     """Организация каталога."""
 
     __tablename__ = "organizations"
 
+    __table_args__ = (
+        Index(
+            "ix_organizations_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index("ix_organizations_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
@@ -48,6 +62,18 @@ class Organization(Base):
         UUID(as_uuid=True),
         ForeignKey("buildings.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
+    )
+    # Название весит больше описания; колонку заполняет сама БД, ORM её не загружает.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=False,
+        deferred=True,
     )
 
     building: Mapped["Building"] = relationship(back_populates="organizations")
@@ -76,6 +102,7 @@ class OrganizationPhone(Base):
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     organization: Mapped[Organization] = relationship(back_populates="phone_numbers")
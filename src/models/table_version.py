@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.base import Base
+
+
+class TableVersion(Base):
+    """Счётчик изменений таблицы, увеличивается триггером на каждую изменяющую команду."""
+
+    __tablename__ = "table_versions"
+
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
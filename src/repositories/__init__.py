@@ -1,10 +1,19 @@
 from src.repositories.activity import ActivityRepository
 from src.repositories.building import BuildingRepository
+from src.repositories.cache import CacheBackend, MemoryCacheBackend, RepositoryCache
+from src.repositories.filters import BoundingBox, GeoRadius, OrganizationFilter
 from src.repositories.organization import OrganizationRepository
+from src.repositories.table_version import TableVersionRepository
 
 __all__ = [
     "ActivityRepository",
+    "BoundingBox",
     "BuildingRepository",
+    "CacheBackend",
+    "GeoRadius",
+    "MemoryCacheBackend",
+    "OrganizationFilter",
     "OrganizationRepository",
+    "RepositoryCache",
+    "TableVersionRepository",
 ]
-
@@ -4,9 +4,10 @@ from uuid import UUID
 
 from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from src.models import Activity
+from src.repositories.table_version import TableVersionRepository, TableVersions
 
 
 class ActivityRepository:
@@ -15,16 +16,41 @@ class ActivityRepository:
     def __init__(self, session: AsyncSession):
         self._session = session
 
+    def versions(self) -> TableVersions:
+        """Счётчики таблиц, уже прочитанные в транзакции запроса, — для ключа склейки чтений."""
+        return TableVersionRepository(self._session).known_versions()
+
     def _tree_stmt(self) -> Select[tuple[Activity]]:
         return select(Activity).options(selectinload(Activity.children))
 
+    def _descendants_stmt(self, activity_id: UUID) -> Select[tuple[UUID]]:
+        subtree = (
+            select(Activity.id)
+            .where(Activity.id == activity_id)
+            .cte("activity_subtree", recursive=True)
+        )
+        child = aliased(Activity, name="child")
+        subtree = subtree.union(
+            select(child.id).where(child.parent_id == subtree.c.id)
+        )
+        return select(subtree.c.id)
+
     async def get_with_children(self, activity_id: UUID) -> Activity | None:
         result = await self._session.execute(self._tree_stmt().where(Activity.id == activity_id))
         return result.scalar_one_or_none()
 
+    async def list_all(self) -> list[Activity]:
+        """Плоский список всех активностей без загрузки отношений."""
+        result = await self._session.execute(select(Activity))
+        return list(result.scalars().all())
+
+    async def list_descendant_ids(self, activity_id: UUID) -> list[UUID]:
+        """ID активности и всех её потомков любой глубины одним рекурсивным запросом."""
+        result = await self._session.execute(self._descendants_stmt(activity_id))
+        return list(result.scalars().all())
+
     async def list_roots(self) -> list[Activity]:
         result = await self._session.execute(
             self._tree_stmt().where(Activity.parent_id.is_(None))
         )
         return list(result.scalars().all())
-
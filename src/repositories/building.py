@@ -2,22 +2,61 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import Building
+from src.repositories.cache import RepositoryCache, cached, entity_tag
+from src.repositories.pagination import Page, build_page, keyset
+from src.repositories.table_version import TableVersionRepository, TableVersions
+
+# Здание строкой, а не ORM-объектом: её можно кэшировать и отдавать другим запросам и сессиям.
+BuildingRow = Row[tuple[UUID, str, float, float]]
+
+_COLUMNS = (Building.id, Building.address, Building.latitude, Building.longitude)
 
 
 class BuildingRepository:
     """Доступ к зданиям и адресам."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: RepositoryCache | None = None):
         self._session = session
-
-    async def list_all(self) -> list[Building]:
-        result = await self._session.execute(select(Building))
-        return list(result.scalars().all())
-
-    async def get(self, building_id: UUID) -> Building | None:
-        return await self._session.get(Building, building_id)
-
+        self._cache = cache
+
+    def versions(self) -> TableVersions:
+        """Счётчики таблиц, уже прочитанные в транзакции запроса, — для ключа склейки чтений."""
+        return TableVersionRepository(self._session).known_versions()
+
+    async def list_all(
+        self,
+        after: tuple[str, UUID] | None = None,
+        limit: int | None = None,
+    ) -> Page[BuildingRow]:
+        return await cached(
+            self._cache,
+            self._session,
+            "buildings.list",
+            (after, limit),
+            ("buildings",),
+            lambda: self._load_page(after, limit),
+        )
+
+    async def _load_page(self, after: tuple[str, UUID] | None, limit: int | None) -> Page[BuildingRow]:
+        stmt = keyset(select(*_COLUMNS), (Building.address, Building.id), after, limit)
+        result = await self._session.execute(stmt)
+        return build_page(result.all(), limit, lambda building: (building.address, building.id))
+
+    async def get(self, building_id: UUID) -> BuildingRow | None:
+        return await cached(
+            self._cache,
+            self._session,
+            "buildings.get",
+            (building_id,),
+            ("buildings",),
+            lambda: self._load(building_id),
+            entities=(entity_tag("buildings", building_id),),
+        )
+
+    async def _load(self, building_id: UUID) -> BuildingRow | None:
+        result = await self._session.execute(select(*_COLUMNS).where(Building.id == building_id))
+        return result.one_or_none()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from asyncpg import exceptions as asyncpg_exceptions
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.cache import mark_stale, table_tag
+
+
+@dataclass(frozen=True, slots=True)
+class BulkTable:
+    """Таблица, доступная для массовой загрузки: колонки и ключ для upsert."""
+
+    name: str
+    columns: tuple[str, ...]
+    conflict: tuple[str, ...]
+
+    @property
+    def staging(self) -> str:
+        return f"staging_{self.name}"
+
+    @property
+    def update_columns(self) -> tuple[str, ...]:
+        return tuple(column for column in self.columns if column not in self.conflict)
+
+
+BULK_TABLES: dict[str, BulkTable] = {
+    table.name: table
+    for table in (
+        BulkTable("activities", ("id", "name", "level", "parent_id"), ("id",)),
+        BulkTable("buildings", ("id", "address", "latitude", "longitude"), ("id",)),
+        BulkTable("organizations", ("id", "name", "description", "building_id"), ("id",)),
+        BulkTable("organization_phones", ("id", "phone_number", "organization_id"), ("id",)),
+        BulkTable("organization_activities", ("organization_id", "activity_id"), ("organization_id", "activity_id")),
+    )
+}
+
+
+class BulkRepository:
+    """Массовая загрузка: COPY во временную таблицу и один set-based upsert в целевую."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def create_staging(self, table: BulkTable) -> None:
+        # Только загружаемые колонки: вычисляемые (search_vector) и их NOT NULL в staging не нужны.
+        columns = ", ".join(table.columns)
+        await self._session.execute(
+            text(
+                f"CREATE TEMP TABLE {table.staging} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table.name} WITH NO DATA"
+            )
+        )
+
+    async def copy_rows(self, table: BulkTable, rows: Sequence[tuple[Any, ...]]) -> None:
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver = raw_connection.driver_connection
+        if not hasattr(driver, "copy_records_to_table"):
+            raise RuntimeError("Массовая загрузка требует драйвер asyncpg.")
+        # COPY идёт мимо SQLAlchemy, поэтому ошибки драйвера приводим к тем же исключениям,
+        # что и обычные запросы: иначе переполненное поле превращается в 500.
+        statement = f"COPY {table.staging}"
+        try:
+            await driver.copy_records_to_table(table.staging, records=rows, columns=table.columns)
+        except asyncpg_exceptions.IntegrityConstraintViolationError as exc:
+            raise IntegrityError(statement, None, exc) from exc
+        except asyncpg_exceptions.DataError as exc:
+            raise DataError(statement, None, exc) from exc
+
+    async def merge(self, table: BulkTable) -> int:
+        """Переносит строки из staging в целевую таблицу; при дублях ключа побеждает последняя строка."""
+        columns = ", ".join(table.columns)
+        conflict = ", ".join(table.conflict)
+        if table.update_columns:
+            action = "DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in table.update_columns)
+        else:
+            action = "DO NOTHING"
+
+        result = await self._session.execute(
+            text(
+                f"INSERT INTO {table.name} ({columns}) "
+                f"SELECT DISTINCT ON ({conflict}) {columns} FROM {table.staging} "
+                f"ORDER BY {conflict}, ctid DESC "
+                f"ON CONFLICT ({conflict}) {action}"
+            )
+        )
+        await self._session.execute(text(f"DROP TABLE {table.staging}"))
+        mark_stale(self._session, table_tag(table.name))
+        return result.rowcount
+
+    async def truncate(self, tables: Sequence[BulkTable]) -> None:
+        await self._session.execute(text(f"TRUNCATE {', '.join(table.name for table in tables)}"))
+        mark_stale(self._session, *(table_tag(table.name) for table in tables))
+
+    async def analyze(self, tables: Sequence[BulkTable]) -> None:
+        for table in tables:
+            await self._session.execute(text(f"ANALYZE {table.name}"))
@@ -0,0 +1,237 @@
+"""Кэш чтений репозиториев с инвалидацией по тегам.
+
+Значение хранится под ключом «пространство имён + параметры запроса + счётчики изменений
+таблиц» (`table_versions`, те же, что в ETag). Изменение таблицы из любого воркера, CLI или
+миграции меняет счётчик, и следующий запрос просто не находит старый ключ.
+
+Кроме того, значения помечаются тегами таблиц (`table:organizations`) и отдельных сущностей
+(`organizations:<id>`): после commit в этом воркере значения с изменёнными тегами удаляются
+сразу, не дожидаясь вытеснения. ORM-изменения помечаются автоматически, массовые операции
+на сыром SQL вызывают `mark_stale`.
+
+Кэшируются только значения без привязки к сессии: документы, строки и кортежи, но не ORM-объекты.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Iterator, Protocol, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, UOWTransaction
+
+from src.config import settings
+from src.core.metrics import CallbackMetric, Counter, LabelValues, registry
+from src.repositories.table_version import TableVersionRepository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_STALE_TAGS = "repository_cache_stale_tags"
+
+
+def table_tag(table: str) -> str:
+    return f"table:{table}"
+
+
+def entity_tag(table: str, entity_id: Hashable) -> str:
+    return f"{table}:{entity_id}"
+
+
+class CacheBackend(Protocol):
+    """Хранилище кэша. Для общего хранилища (Redis и т.п.) значения нужно сериализовать."""
+
+    async def get(self, key: str) -> tuple[bool, Any]: ...
+
+    async def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None: ...
+
+    async def invalidate(self, tags: Iterable[str]) -> int: ...
+
+    async def clear(self) -> None: ...
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    expires_at: float
+    tags: frozenset[str]
+
+
+class MemoryCacheBackend:
+    """LRU в памяти процесса с TTL на запись и индексом «тег → ключи»."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at <= time.monotonic():
+            self._discard(key)
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry.value
+
+    async def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        self._discard(key)
+        entry = _Entry(value, time.monotonic() + ttl, frozenset(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            self._discard(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        keys = set().union(*(self._keys_by_tag.get(tag, ()) for tag in tags))
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+cache_requests_total = registry.register(
+    Counter("repository_cache_requests_total", "Обращения к кэшу репозиториев.", ("namespace", "result"))
+)
+cache_invalidations_total = registry.register(
+    Counter("repository_cache_invalidated_total", "Значения, сброшенные инвалидацией по тегам.")
+)
+
+
+class RepositoryCache:
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._pending: set[asyncio.Task[int]] = set()
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        params: tuple[Any, ...],
+        tags: Iterable[str],
+        load: Callable[[], Awaitable[T]],
+    ) -> T:
+        key = f"{namespace}:{params!r}"
+        found, value = await self.backend.get(key)
+        if found:
+            cache_requests_total.inc((namespace, "hit"))
+            return value
+        cache_requests_total.inc((namespace, "miss"))
+        value = await load()
+        await self.backend.set(key, value, self.ttl, tags)
+        return value
+
+    async def invalidate(self, *tags: str) -> int:
+        removed = await self.backend.invalidate(tags)
+        cache_invalidations_total.inc(amount=removed)
+        return removed
+
+    def invalidate_soon(self, tags: Iterable[str]) -> None:
+        """Инвалидация из синхронного кода (событий сессии): задача в текущем event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("Нет event loop: кэш репозиториев не сброшен для %s", sorted(tags))
+            return
+        task = loop.create_task(self.invalidate(*tags))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def drain(self) -> None:
+        """Дожидается отложенных инвалидаций."""
+        if self._pending:
+            await asyncio.gather(*self._pending)
+
+
+async def cached(
+    cache: RepositoryCache | None,
+    session: AsyncSession,
+    namespace: str,
+    params: tuple[Any, ...],
+    tables: Iterable[str],
+    load: Callable[[], Awaitable[T]],
+    entities: Iterable[str] = (),
+) -> T:
+    """Чтение через кэш, если он подключён к репозиторию; иначе — прямо из БД.
+
+    `tables` — таблицы, из которых собрано значение: их счётчики входят в ключ, а теги — в инвалидацию.
+    """
+    if cache is None:
+        return await load()
+    tables = tuple(tables)
+    versions = await TableVersionRepository(session).get_versions(tables)
+    tags = (*entities, *(table_tag(table) for table in tables))
+    return await cache.get_or_load(namespace, (*params, *versions.items()), tags, load)
+
+
+def mark_stale(session: AsyncSession | Session, *tags: str) -> None:
+    """Запоминает теги изменённых данных; кэш сбрасывается после commit этой сессии."""
+    sync_session = session.sync_session if isinstance(session, AsyncSession) else session
+    sync_session.info.setdefault(_STALE_TAGS, set()).update(tags)
+
+
+def _instance_tags(instance: Any) -> Iterator[str]:
+    mapper = inspect(instance).mapper
+    table = mapper.local_table.name
+    yield table_tag(table)
+    identity = mapper.primary_key_from_instance(instance)
+    yield entity_tag(table, identity[0] if len(identity) == 1 else tuple(identity))
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context: UOWTransaction) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if changed:
+        mark_stale(session, *(tag for instance in changed for tag in _instance_tags(instance)))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tags = session.info.pop(_STALE_TAGS, None)
+    if tags:
+        repository_cache.invalidate_soon(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session: Session) -> None:
+    session.info.pop(_STALE_TAGS, None)
+
+
+repository_cache = RepositoryCache(
+    MemoryCacheBackend(max_entries=settings.repository_cache_max_entries),
+    ttl=settings.repository_cache_ttl_seconds,
+)
+
+
+def _cache_size() -> Iterator[tuple[LabelValues, float]]:
+    backend = repository_cache.backend
+    if isinstance(backend, MemoryCacheBackend):
+        yield (), float(len(backend))
+
+
+registry.register(CallbackMetric("repository_cache_entries", "Значения в кэше репозиториев.", (), _cache_size))
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Iterable
+from uuid import UUID
+
+
+@dataclass(frozen=True, slots=True)
+class BoundingBox:
+    min_latitude: float
+    max_latitude: float
+    min_longitude: float
+    max_longitude: float
+
+
+@dataclass(frozen=True, slots=True)
+class GeoRadius:
+    latitude: float
+    longitude: float
+    radius_km: float
+
+
+@dataclass(frozen=True, slots=True)
+class OrganizationFilter:
+    """Условия поиска организаций; заданные поля объединяются через AND в одном SQL-запросе.
+
+    `activity_ids` — уже раскрытое поддерево видов деятельности, `organization_ids` — уже
+    отобранные организации (например, по радиусу): `None` означает «без фильтра», пустое
+    множество — «ничего не подходит».
+    """
+
+    name: str | None = None
+    activity_ids: frozenset[UUID] | None = None
+    organization_ids: frozenset[UUID] | None = None
+    building_id: UUID | None = None
+    bbox: BoundingBox | None = None
+    radius: GeoRadius | None = None
+
+    def narrow(self, **changes: Any) -> OrganizationFilter:
+        """Копия фильтра с дополнительными условиями."""
+        return replace(self, **changes)
+
+    def with_activities(self, activity_ids: Iterable[UUID]) -> OrganizationFilter:
+        return self.narrow(activity_ids=frozenset(activity_ids))
+
+    def with_organizations(self, organization_ids: Iterable[UUID]) -> OrganizationFilter:
+        return self.narrow(organization_ids=frozenset(organization_ids))
+
+    @property
+    def matches_nothing(self) -> bool:
+        """Результат заведомо пуст, запрос в БД не нужен."""
+        if self.activity_ids is not None and not self.activity_ids:
+            return True
+        if self.organization_ids is not None and not self.organization_ids:
+            return True
+        if self.radius is not None and self.radius.radius_km <= 0:
+            return True
+        bbox = self.bbox
+        return bbox is not None and (
+            bbox.min_latitude > bbox.max_latitude or bbox.min_longitude > bbox.max_longitude
+        )
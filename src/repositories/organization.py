@@ -1,20 +1,130 @@
 from __future__ import annotations
 
-from typing import Iterable
+import math
+from typing import Any, AsyncIterator, Collection
 from uuid import UUID
 
-from sqlalchemy import Select, and_, select
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Row,
+    ScalarSelect,
+    Select,
+    and_,
+    any_,
+    bindparam,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSON, aggregate_order_by
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
-from src.models import Activity, Building, Organization
+from src.core.geo import EARTH_RADIUS_KM, window_deltas
+from src.models import Activity, Building, Organization, OrganizationPhone, organization_activities
+from src.models.organization import SEARCH_CONFIG
+from src.repositories.cache import RepositoryCache, cached, entity_tag
+from src.repositories.filters import OrganizationFilter
+from src.repositories.pagination import Page, build_page, keyset
+from src.repositories.table_version import TableVersionRepository, TableVersions
+
+# Готовый к валидации в OrganizationDetail документ, собранный целиком в БД.
+OrganizationDocument = dict[str, Any]
+
+# Организация в окне карты: id и координаты здания, без документа и ORM-объекта.
+OrganizationPoint = Row[tuple[UUID, float, float]]
+
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+# Таблицы, из которых собирается документ организации: запись в любую сбрасывает закэшированные документы.
+_DOCUMENT_TABLES = ("organizations", "organization_phones", "organization_activities", "buildings", "activities")
+
+
+def _distance_km(latitude: float, longitude: float) -> ColumnElement[float]:
+    """Haversine-расстояние от точки до здания организации, вычисляемое в БД."""
+    center_lat = math.radians(latitude)
+    lat_rad = func.radians(Building.latitude, type_=Float)
+    half_dlat = (lat_rad - center_lat) * 0.5
+    half_dlon = (func.radians(Building.longitude, type_=Float) - math.radians(longitude)) * 0.5
+    a = func.power(func.sin(half_dlat, type_=Float), 2, type_=Float) + math.cos(center_lat) * func.cos(
+        lat_rad, type_=Float
+    ) * func.power(func.sin(half_dlon, type_=Float), 2, type_=Float)
+    return (2 * EARTH_RADIUS_KM) * func.asin(func.least(1.0, func.sqrt(a, type_=Float), type_=Float), type_=Float)
+
+
+def _in_window(latitude: float, longitude: float, lat_delta: float, lon_delta: float) -> ColumnElement[bool]:
+    """Прямоугольное окно вокруг точки: отбор по индексу (latitude, longitude) зданий."""
+    return and_(
+        Building.latitude.between(latitude - lat_delta, latitude + lat_delta),
+        Building.longitude.between(longitude - lon_delta, longitude + lon_delta),
+    )
+
+
+def _phones_json() -> ScalarSelect[Any]:
+    # COLLATE "C" даёт порядок по кодовым точкам — тот же, что sorted() в маппере.
+    phone = func.json_build_object("id", OrganizationPhone.id, "phone_number", OrganizationPhone.phone_number)
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(phone, OrganizationPhone.phone_number.collate("C"), OrganizationPhone.id)
+                ),
+                _EMPTY_JSON_ARRAY,
+            )
+        )
+        .where(OrganizationPhone.organization_id == Organization.id)
+        .correlate(Organization)
+        .scalar_subquery()
+    )
+
+
+def _activities_json() -> ScalarSelect[Any]:
+    activity = func.json_build_object(
+        "id", Activity.id, "name", Activity.name, "level", Activity.level, "parent_id", Activity.parent_id
+    )
+    return (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(activity, Activity.name.collate("C"), Activity.id)),
+                _EMPTY_JSON_ARRAY,
+            )
+        )
+        .select_from(organization_activities.join(Activity, Activity.id == organization_activities.c.activity_id))
+        .where(organization_activities.c.organization_id == Organization.id)
+        .correlate(Organization)
+        .scalar_subquery()
+    )
+
+
+def _document_json() -> ColumnElement[OrganizationDocument]:
+    """Форма OrganizationDetail одним JSON-объектом: здание inline, телефоны и виды деятельности агрегатами."""
+    building = func.json_build_object(
+        "id", Building.id, "address", Building.address, "latitude", Building.latitude, "longitude", Building.longitude
+    )
+    return func.json_build_object(
+        "id", Organization.id,
+        "name", Organization.name,
+        "description", Organization.description,
+        "building_id", Organization.building_id,
+        "building", building,
+        "phone_numbers", _phones_json(),
+        "activities", _activities_json(),
+        type_=JSON,
+    )
 
 
 class OrganizationRepository:
     """Работа с организациями и связанными сущностями."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: RepositoryCache | None = None):
         self._session = session
+        self._cache = cache
+
+    def versions(self) -> TableVersions:
+        """Счётчики таблиц, уже прочитанные в транзакции запроса, — для ключа склейки чтений."""
+        return TableVersionRepository(self._session).known_versions()
 
     def _base_stmt(self) -> Select[tuple[Organization]]:
         return (
@@ -26,61 +136,195 @@ class OrganizationRepository:
             )
         )
 
-    async def get_by_id(self, organization_id: UUID) -> Organization | None:
-        result = await self._session.execute(
-            self._base_stmt().where(Organization.id == organization_id)
+    def _detail_stmt(self) -> Select[tuple[str, UUID, OrganizationDocument]]:
+        """Один запрос вместо select + двух selectinload; объекты ORM и identity map не создаются."""
+        return select(
+            Organization.name,
+            Organization.id,
+            _document_json().label("document"),
+        ).join(Building, Building.id == Organization.building_id)
+
+    async def get_detail(self, organization_id: UUID) -> OrganizationDocument | None:
+        return await cached(
+            self._cache,
+            self._session,
+            "organizations.detail",
+            (organization_id,),
+            _DOCUMENT_TABLES,
+            lambda: self._load_detail(organization_id),
+            entities=(entity_tag("organizations", organization_id),),
         )
-        return result.scalar_one_or_none()
 
-    async def list_all(self) -> list[Organization]:
-        result = await self._session.execute(self._base_stmt())
-        return list(result.scalars().all())
+    async def _load_detail(self, organization_id: UUID) -> OrganizationDocument | None:
+        result = await self._session.execute(
+            self._detail_stmt().where(Organization.id == organization_id)
+        )
+        row = result.one_or_none()
+        return row.document if row is not None else None
 
-    async def list_by_building(self, building_id: UUID) -> list[Organization]:
+    async def get_details(self, organization_ids: Collection[UUID]) -> dict[UUID, OrganizationDocument]:
+        """Документы по набору id одним запросом; ненайденных id в словаре нет."""
+        if not organization_ids:
+            return {}
         result = await self._session.execute(
-            self._base_stmt().where(Organization.building_id == building_id)
+            self._detail_stmt().where(Organization.id.in_(organization_ids))
         )
-        return list(result.scalars().all())
+        return {row.id: row.document for row in result}
 
-    async def list_by_activity_ids(self, activity_ids: Iterable[UUID]) -> list[Organization]:
-        ids = list(activity_ids)
-        if not ids:
-            return []
+    async def _fetch_page(
+        self,
+        stmt: Select[Any],
+        after: tuple[Any, ...] | None,
+        limit: int | None,
+        order: tuple[ColumnElement[Any], ...] = (Organization.name, Organization.id),
+    ) -> Page[OrganizationDocument]:
+        stmt = keyset(stmt, order, after, limit)
+        result = await self._session.execute(stmt)
+        names = [column.key for column in order]
+        page = build_page(result.all(), limit, lambda row: tuple(getattr(row, name) for name in names))
+        return Page(items=[row.document for row in page.items], next_key=page.next_key)
 
-        stmt = (
-            self._base_stmt()
-            .join(Organization.activities)
-            .where(Activity.id.in_(ids))
-            .distinct()
+    def _search_stmt(self, criteria: OrganizationFilter) -> Select[tuple[str, UUID, OrganizationDocument]]:
+        """Компилирует фильтр в один запрос: все условия в WHERE, документы строятся только для прошедших строк."""
+        stmt = self._detail_stmt()
+        if criteria.name is not None:
+            stmt = stmt.where(Organization.name.ilike(f"%{criteria.name.strip()}%"))
+        if criteria.building_id is not None:
+            stmt = stmt.where(Organization.building_id == criteria.building_id)
+        if criteria.activity_ids is not None:
+            linked = select(organization_activities.c.organization_id).where(
+                organization_activities.c.activity_id.in_(criteria.activity_ids)
+            )
+            stmt = stmt.where(Organization.id.in_(linked))
+        if criteria.organization_ids is not None:
+            # Один параметр-массив вместо тысяч bind-параметров IN (...).
+            ids = bindparam("organization_ids", list(criteria.organization_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+            stmt = stmt.where(Organization.id == any_(ids))
+        if criteria.bbox is not None:
+            bbox = criteria.bbox
+            stmt = stmt.where(
+                Building.latitude.between(bbox.min_latitude, bbox.max_latitude),
+                Building.longitude.between(bbox.min_longitude, bbox.max_longitude),
+            )
+        if criteria.radius is not None:
+            circle = criteria.radius
+            lat_delta, lon_delta = window_deltas(circle.latitude, circle.radius_km)
+            # Прямоугольное окно отсекает кандидатов по индексу, точная дистанция — уже по ним.
+            stmt = stmt.where(
+                _in_window(circle.latitude, circle.longitude, lat_delta, lon_delta),
+                _distance_km(circle.latitude, circle.longitude) <= circle.radius_km,
+            )
+        return stmt
+
+    async def search(
+        self,
+        criteria: OrganizationFilter,
+        after: tuple[str, UUID] | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        if criteria.matches_nothing:
+            return Page(items=[])
+        return await self._fetch_page(self._search_stmt(criteria), after, limit)
+
+    async def list_all(
+        self,
+        after: tuple[str, UUID] | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        return await self.search(OrganizationFilter(), after, limit)
+
+    async def list_by_building(
+        self,
+        building_id: UUID,
+        after: tuple[str, UUID] | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        return await cached(
+            self._cache,
+            self._session,
+            "organizations.by_building",
+            (building_id, after, limit),
+            _DOCUMENT_TABLES,
+            lambda: self.search(OrganizationFilter(building_id=building_id), after, limit),
+            entities=(entity_tag("buildings", building_id),),
         )
-        result = await self._session.execute(stmt)
-        return list(result.scalars().all())
 
-    async def search_by_name_pattern(self, pattern: str) -> list[Organization]:
-        result = await self._session.execute(
-            self._base_stmt().where(Organization.name.ilike(pattern))
+    async def list_names(self) -> list[tuple[UUID, str]]:
+        """Пары (id, название) всех организаций — без связей и без ORM-объектов."""
+        result = await self._session.execute(select(Organization.id, Organization.name))
+        return [(organization_id, name) for organization_id, name in result.tuples()]
+
+    def _fuzzy_stmt(self, query: str, limit: int) -> Select[tuple[str, UUID, OrganizationDocument, float]]:
+        similarity = func.word_similarity(query, Organization.name, type_=Float).label("similarity")
+        return (
+            self._detail_stmt()
+            .add_columns(similarity)
+            # `name %> query` отбирает кандидатов по GIN-индексу с порогом pg_trgm.word_similarity_threshold.
+            .where(Organization.name.op("%>")(query))
+            .order_by(similarity.desc(), Organization.name, Organization.id)
+            .limit(limit)
         )
-        return list(result.scalars().all())
 
-    async def list_in_bbox(
+    async def search_fuzzy(
         self,
-        min_latitude: float,
-        max_latitude: float,
-        min_longitude: float,
-        max_longitude: float,
-    ) -> list[Organization]:
+        query: str,
+        threshold: float,
+        limit: int,
+    ) -> list[tuple[OrganizationDocument, float]]:
+        """Нечёткий поиск по названию: не более `limit` совпадений по убыванию сходства слов."""
+        # Порог действует только до конца текущей транзакции.
+        await self._session.execute(
+            select(func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True))
+        )
+        result = await self._session.execute(self._fuzzy_stmt(query, limit))
+        return [(row.document, row.similarity) for row in result]
+
+    def _text_search_stmt(self, query: str) -> tuple[Select[Any], ColumnElement[float]]:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        # Keyset умеет только возрастающий порядок, поэтому «rank DESC» — это «-rank ASC».
+        sort_rank = (-func.ts_rank_cd(Organization.search_vector, tsquery, type_=Float)).label("sort_rank")
         stmt = (
+            self._detail_stmt()
+            .add_columns(sort_rank)
+            .where(Organization.search_vector.bool_op("@@")(tsquery))
+        )
+        return stmt, sort_rank
+
+    async def search_text(
+        self,
+        query: str,
+        after: tuple[float, UUID] | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        """Полнотекстовый поиск по названию и описанию, от более релевантных к менее."""
+        stmt, sort_rank = self._text_search_stmt(query)
+        return await self._fetch_page(stmt, after, limit, order=(sort_rank, Organization.id))
+
+    def _stream_stmt(self, chunk_size: int) -> Select[tuple[Organization]]:
+        return (
             self._base_stmt()
-            .join(Organization.building)
-            .where(
-                and_(
-                    Building.latitude.between(min_latitude, max_latitude),
-                    Building.longitude.between(min_longitude, max_longitude),
-                )
-            )
+            .order_by(Organization.name, Organization.id)
+            .execution_options(yield_per=chunk_size)
+        )
+
+    async def stream_all(self, chunk_size: int) -> AsyncIterator[list[Organization]]:
+        """Все организации порциями по `chunk_size` через серверный курсор."""
+        result = await self._session.stream(self._stream_stmt(chunk_size))
+        async for partition in result.scalars().partitions():
+            yield list(partition)
+
+    def _window_stmt(
+        self,
+        latitude: float,
+        longitude: float,
+        lat_delta: float,
+        lon_delta: float,
+    ) -> Select[tuple[UUID, float, float]]:
+        return (
+            select(Organization.id, Building.latitude, Building.longitude)
+            .join(Building, Building.id == Organization.building_id)
+            .where(_in_window(latitude, longitude, lat_delta, lon_delta))
         )
-        result = await self._session.execute(stmt)
-        return list(result.scalars().all())
 
     async def list_in_lat_lon_window(
         self,
@@ -88,16 +332,39 @@ class OrganizationRepository:
         longitude: float,
         lat_delta: float,
         lon_delta: float,
-    ) -> list[Organization]:
-        stmt = (
-            self._base_stmt()
-            .join(Organization.building)
-            .where(
-                and_(
-                    Building.latitude.between(latitude - lat_delta, latitude + lat_delta),
-                    Building.longitude.between(longitude - lon_delta, longitude + lon_delta),
-                )
-            )
+    ) -> list[OrganizationPoint]:
+        """Кандидаты для фильтра по радиусу: id и координаты организаций в окне, без документов."""
+        result = await self._session.execute(self._window_stmt(latitude, longitude, lat_delta, lon_delta))
+        return list(result.all())
+
+    def _nearest_stmt(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int,
+        max_radius_km: float | None = None,
+        lat_delta: float | None = None,
+        lon_delta: float | None = None,
+    ) -> Select[tuple[Organization, float]]:
+        distance = _distance_km(latitude, longitude).label("distance_km")
+        stmt = self._base_stmt().add_columns(distance).join(Organization.building)
+        if lat_delta is not None and lon_delta is not None:
+            stmt = stmt.where(_in_window(latitude, longitude, lat_delta, lon_delta))
+        if max_radius_km is not None:
+            stmt = stmt.where(distance <= max_radius_km)
+        return stmt.order_by(distance, Organization.id).limit(limit)
+
+    async def list_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int,
+        max_radius_km: float | None = None,
+        lat_delta: float | None = None,
+        lon_delta: float | None = None,
+    ) -> list[tuple[Organization, float]]:
+        """Не более `limit` ближайших организаций с расстоянием в км; сортировка и отсечение — в БД."""
+        result = await self._session.execute(
+            self._nearest_stmt(latitude, longitude, limit, max_radius_km, lat_delta, lon_delta)
         )
-        result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        return [(organization, distance) for organization, distance in result.tuples().all()]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, Select, tuple_
+
+T = TypeVar("T")
+S = TypeVar("S", bound=Select[Any])
+
+
+@dataclass(frozen=True, slots=True)
+class Page(Generic[T]):
+    """Страница keyset-выборки: элементы и ключ последнего элемента, если есть продолжение."""
+
+    items: list[T]
+    next_key: tuple[Any, ...] | None = None
+
+
+def keyset(stmt: S, columns: Sequence[ColumnElement[Any]], after: Sequence[Any] | None, limit: int | None) -> S:
+    """Сортирует по `columns` и продолжает выборку строго после ключа `after`.
+
+    Берёт на одну строку больше `limit`, чтобы `build_page` понял, есть ли следующая страница.
+    """
+    if after is not None:
+        stmt = stmt.where(tuple_(*columns) > tuple_(*after))
+    stmt = stmt.order_by(*columns)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def build_page(rows: Sequence[T], limit: int | None, key: Callable[[T], tuple[Any, ...]]) -> Page[T]:
+    if limit is None or len(rows) <= limit:
+        return Page(items=list(rows))
+    items = list(rows[:limit])
+    return Page(items=items, next_key=key(items[-1]))
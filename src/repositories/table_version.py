@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.models import TableVersion
+
+_VERSIONS = "table_versions"
+
+TableVersions = tuple[tuple[str, int], ...]
+
+
+class TableVersionRepository:
+    """Чтение счётчиков изменений таблиц."""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_version(self, table_name: str) -> int:
+        result = await self._session.execute(
+            select(TableVersion.version).where(TableVersion.table_name == table_name)
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def get_versions(self, table_names: Iterable[str]) -> dict[str, int]:
+        """Счётчики нужных таблиц из снимка всех счётчиков, который читается одним запросом на транзакцию.
+
+        ETag и ключи кэша репозиториев в одном запросе к API получают одни и те же версии.
+        Снимок забывается после записи, commit или rollback сессии.
+        """
+        versions = self._session.info.get(_VERSIONS)
+        if versions is None:
+            result = await self._session.execute(select(TableVersion.table_name, TableVersion.version))
+            versions = dict(result.tuples().all())
+            self._session.info[_VERSIONS] = versions
+        return {name: versions.get(name, 0) for name in table_names}
+
+    def known_versions(self) -> TableVersions:
+        """Снимок, уже прочитанный в транзакции (для ETag или ключа кэша), парами (таблица, версия); в БД не обращается."""
+        versions = self._session.info.get(_VERSIONS)
+        return tuple(sorted(versions.items())) if versions is not None else ()
+
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_versions(session: Session, *_: Any) -> None:
+    session.info.pop(_VERSIONS, None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _forget_versions_on_write(orm_execute_state: ORMExecuteState) -> None:
+    # Триггеры увеличивают счётчики уже внутри транзакции, поэтому снимок до записи устаревает.
+    if not orm_execute_state.is_select:
+        _forget_versions(orm_execute_state.session)
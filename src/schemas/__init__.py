@@ -1,13 +1,31 @@
 from src.schemas.activity import ActivityRead, ActivityTree
 from src.schemas.building import BuildingRead
-from src.schemas.organization import OrganizationDetail, OrganizationPhoneRead, OrganizationShort
+from src.schemas.imports import ImportReportRead
+from src.schemas.internal import PoolStatusRead
+from src.schemas.organization import (
+    OrganizationBatchRead,
+    OrganizationBatchRequest,
+    OrganizationDetail,
+    OrganizationMatch,
+    OrganizationNearby,
+    OrganizationPhoneRead,
+    OrganizationShort,
+    OrganizationSuggestion,
+)
 
 __all__ = [
     "ActivityRead",
     "ActivityTree",
     "BuildingRead",
+    "ImportReportRead",
+    "OrganizationBatchRead",
+    "OrganizationBatchRequest",
     "OrganizationDetail",
+    "OrganizationMatch",
+    "OrganizationNearby",
     "OrganizationPhoneRead",
     "OrganizationShort",
+    "OrganizationSuggestion",
+    "PoolStatusRead",
 ]
 
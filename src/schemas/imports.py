@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from src.schemas.base import ORMModel
+
+
+class ImportReportRead(ORMModel):
+    entity: str
+    rows: int
+    upserted: int
+    seconds: float
+    rows_per_second: float
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from src.schemas.base import ORMModel
+
+
+class PoolStatusRead(ORMModel):
+    pool_class: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+    max_overflow: int | None = None
+    timeout_seconds: float | None = None
+    checkouts: int | None = None
+    timeouts: int | None = None
+    wait_seconds_total: float | None = None
+    wait_seconds_max: float | None = None
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
+from src.config import settings
 from src.schemas.activity import ActivityRead
 from src.schemas.base import ORMModel
 from src.schemas.building import BuildingRead
@@ -26,3 +27,24 @@ class OrganizationDetail(OrganizationShort):
     phone_numbers: list[OrganizationPhoneRead]
     activities: list[ActivityRead]
 
+
+class OrganizationNearby(OrganizationDetail):
+    distance_km: float
+
+
+class OrganizationMatch(OrganizationDetail):
+    similarity: float
+
+
+class OrganizationSuggestion(ORMModel):
+    id: UUID
+    name: str
+
+
+class OrganizationBatchRequest(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=settings.batch_lookup_max_ids)
+
+
+class OrganizationBatchRead(ORMModel):
+    items: list[OrganizationDetail]
+    missing: list[UUID]
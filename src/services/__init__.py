@@ -1,30 +1,49 @@
-from src.services.activity import ActivityService, collect_descendant_ids, fetch_activity_tree, get_activity
+from src.services.activity import (
+    ActivityService,
+    collect_descendant_ids,
+    fetch_activity_tree,
+    get_activity,
+    get_tree_snapshot,
+)
 from src.services.building import BuildingService, get_building, list_buildings
 from src.services.organization import (
     OrganizationService,
-    get_by_id,
+    get_detail,
     list_all,
     list_by_activity_ids,
     list_by_building,
-    list_in_bbox,
+    list_nearest,
     list_within_radius,
+    search,
     search_by_name,
+    search_fuzzy,
+    search_text,
+    stream_all,
 )
+from src.services.single_flight import SingleFlight
+from src.services.suggest import SuggestService
 
 __all__ = [
     "ActivityService",
     "BuildingService",
     "OrganizationService",
+    "SingleFlight",
+    "SuggestService",
     "collect_descendant_ids",
     "fetch_activity_tree",
     "get_activity",
+    "get_tree_snapshot",
     "get_building",
     "list_buildings",
-    "get_by_id",
+    "get_detail",
     "list_all",
     "list_by_activity_ids",
     "list_by_building",
-    "list_in_bbox",
+    "list_nearest",
     "list_within_radius",
+    "search",
     "search_by_name",
+    "search_fuzzy",
+    "search_text",
+    "stream_all",
 ]
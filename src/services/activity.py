@@ -1,45 +1,84 @@
 from __future__ import annotations
 
-from collections import deque
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
 from src.models import Activity
 from src.repositories.activity import ActivityRepository
+from src.repositories.table_version import TableVersionRepository
+from src.services.activity_tree import ActivityTreeCache, ActivityTreeSnapshot, build_activity_snapshot
+from src.services.single_flight import SingleFlight, coalesce, read_flights
+
+tree_cache = ActivityTreeCache(refresh_interval=settings.activity_tree_refresh_seconds)
 
 
 class ActivityService:
     """Бизнес-операции над иерархией видов деятельности."""
 
-    def __init__(self, repository: ActivityRepository):
+    def __init__(
+        self,
+        repository: ActivityRepository,
+        versions: TableVersionRepository | None = None,
+        tree_cache: ActivityTreeCache | None = None,
+        flights: SingleFlight | None = None,
+    ):
         self._repository = repository
+        self._versions = versions
+        self._tree_cache = tree_cache
+        self._flights = flights
 
     async def get_activity(self, activity_id: UUID) -> Activity | None:
+        """ORM-объекты привязаны к сессии запроса, поэтому это чтение, как и `fetch_activity_tree`, не склеивается."""
         return await self._repository.get_with_children(activity_id)
 
+    async def get_tree_snapshot(self) -> ActivityTreeSnapshot:
+        """Снимок всего дерева; без кэша строится заново. Версия снимка — счётчик `activities`, из неё строится ETag."""
+        if self._versions is None:
+            return build_activity_snapshot(await self._repository.list_all(), version=0)
+        if self._tree_cache is None:
+            # Версия читается до данных: тело ответа не старше версии, и следующее изменение сменит ETag.
+            version = await self._load_version()
+            return await coalesce(
+                self._flights,
+                ("activities.tree_snapshot", version),
+                self._repository,
+                lambda repository: _load_snapshot(repository, version),
+            )
+        return await self._tree_cache.get(self._load_version, self._repository.list_all)
+
     async def collect_descendant_ids(self, activity_id: UUID) -> list[UUID]:
-        """Возвращает ID активности и всех её потомков."""
-        root = await self.get_activity(activity_id)
-        if root is None:
-            return []
+        """Возвращает ID активности и всех её потомков (пустой список, если активности нет)."""
+        if self._tree_cache is None:
+            return await coalesce(
+                self._flights,
+                ("activities.list_descendant_ids", activity_id),
+                self._repository,
+                lambda repository: repository.list_descendant_ids(activity_id),
+            )
+        snapshot = await self.get_tree_snapshot()
+        return snapshot.descendant_ids(activity_id)
 
-        ids: list[UUID] = []
-        queue: deque[Activity] = deque([root])
+    async def fetch_activity_tree(self) -> list[Activity]:
+        return await self._repository.list_roots()
 
-        while queue:
-            item = queue.popleft()
-            ids.append(item.id)
-            queue.extend(item.children)
+    async def _load_version(self) -> int:
+        assert self._versions is not None
+        return await self._versions.get_version("activities")
 
-        return ids
 
-    async def fetch_activity_tree(self) -> list[Activity]:
-        return await self._repository.list_roots()
+async def _load_snapshot(repository: ActivityRepository, version: int) -> ActivityTreeSnapshot:
+    return build_activity_snapshot(await repository.list_all(), version=version)
 
 
 def _service(session: AsyncSession) -> ActivityService:
-    return ActivityService(ActivityRepository(session))
+    return ActivityService(
+        ActivityRepository(session),
+        TableVersionRepository(session),
+        tree_cache if settings.activity_tree_cache else None,
+        read_flights if settings.coalesce_reads else None,
+    )
 
 
 async def get_activity(session: AsyncSession, activity_id: UUID) -> Activity | None:
@@ -47,6 +86,11 @@ async def get_activity(session: AsyncSession, activity_id: UUID) -> Activity | N
     return await service.get_activity(activity_id)
 
 
+async def get_tree_snapshot(session: AsyncSession) -> ActivityTreeSnapshot:
+    service = _service(session)
+    return await service.get_tree_snapshot()
+
+
 async def collect_descendant_ids(session: AsyncSession, activity_id: UUID) -> list[UUID]:
     service = _service(session)
     return await service.collect_descendant_ids(activity_id)
@@ -55,4 +99,3 @@ async def collect_descendant_ids(session: AsyncSession, activity_id: UUID) -> li
 async def fetch_activity_tree(session: AsyncSession) -> list[Activity]:
     service = _service(session)
     return await service.fetch_activity_tree()
-
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Awaitable, Callable, Iterable, Mapping
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+from src.mappers import map_activity_branches
+from src.models import Activity
+from src.schemas import ActivityTree
+
+_tree_adapter = TypeAdapter(list[ActivityTree])
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityTreeSnapshot:
+    """Неизменяемый снимок иерархии видов деятельности с готовыми JSON-ответами."""
+
+    version: int
+    roots: tuple[UUID, ...]
+    parents: Mapping[UUID, UUID | None]
+    children: Mapping[UUID, tuple[UUID, ...]]
+    descendants: Mapping[UUID, frozenset[UUID]]
+    tree_json: bytes
+    branch_json: Mapping[UUID, bytes]
+
+    def descendant_ids(self, activity_id: UUID) -> list[UUID]:
+        """ID активности и всех её потомков; пустой список, если активности нет."""
+        return list(self.descendants.get(activity_id, ()))
+
+
+def build_activity_snapshot(activities: Iterable[Activity], version: int) -> ActivityTreeSnapshot:
+    branches = map_activity_branches(activities)
+    roots = sorted((branch for branch in branches.values() if branch.parent_id is None), key=lambda item: item.name)
+
+    descendants: dict[UUID, frozenset[UUID]] = {}
+    # Поддеревья добавляются в branches после своих детей, поэтому хватает одного прохода.
+    for branch in branches.values():
+        descendants[branch.id] = frozenset({branch.id}).union(*(descendants[child.id] for child in branch.children))
+
+    return ActivityTreeSnapshot(
+        version=version,
+        roots=tuple(root.id for root in roots),
+        parents=MappingProxyType({branch.id: branch.parent_id for branch in branches.values()}),
+        children=MappingProxyType(
+            {branch.id: tuple(child.id for child in branch.children) for branch in branches.values()}
+        ),
+        descendants=MappingProxyType(descendants),
+        tree_json=_tree_adapter.dump_json(roots),
+        branch_json=MappingProxyType(
+            {branch.id: branch.model_dump_json().encode() for branch in branches.values()}
+        ),
+    )
+
+
+class ActivityTreeCache:
+    """Хранит снимок дерева в памяти процесса и сверяет версию с БД не чаще раза в `refresh_interval` секунд."""
+
+    def __init__(self, refresh_interval: float):
+        self._refresh_interval = refresh_interval
+        self._snapshot: ActivityTreeSnapshot | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return time.monotonic() - self._checked_at < self._refresh_interval
+
+    async def get(
+        self,
+        load_version: Callable[[], Awaitable[int]],
+        load_activities: Callable[[], Awaitable[list[Activity]]],
+    ) -> ActivityTreeSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh():
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and self._is_fresh():
+                return snapshot
+
+            version = await load_version()
+            if snapshot is None or snapshot.version != version:
+                snapshot = build_activity_snapshot(await load_activities(), version)
+                self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Заставляет следующий запрос сверить версию с БД."""
+        self._checked_at = float("-inf")
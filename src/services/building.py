@@ -4,33 +4,57 @@ from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Building
-from src.repositories.building import BuildingRepository
+from src.config import settings
+from src.repositories.building import BuildingRepository, BuildingRow
+from src.repositories.cache import repository_cache
+from src.repositories.pagination import Page
+from src.services.single_flight import SingleFlight, coalesce, read_flights
 
 
 class BuildingService:
     """Логика выборки зданий и их организаций."""
 
-    def __init__(self, repository: BuildingRepository):
+    def __init__(self, repository: BuildingRepository, flights: SingleFlight | None = None):
         self._repository = repository
-
-    async def list_buildings(self) -> list[Building]:
-        return await self._repository.list_all()
-
-    async def get_building(self, building_id: UUID) -> Building | None:
-        return await self._repository.get(building_id)
+        self._flights = flights
+
+    async def list_buildings(
+        self,
+        after: tuple[str, UUID] | None = None,
+        limit: int | None = None,
+    ) -> Page[BuildingRow]:
+        return await coalesce(
+            self._flights,
+            ("buildings.list_all", after, limit),
+            self._repository,
+            lambda repository: repository.list_all(after=after, limit=limit),
+        )
+
+    async def get_building(self, building_id: UUID) -> BuildingRow | None:
+        return await coalesce(
+            self._flights,
+            ("buildings.get", building_id),
+            self._repository,
+            lambda repository: repository.get(building_id),
+        )
 
 
 def _service(session: AsyncSession) -> BuildingService:
-    return BuildingService(BuildingRepository(session))
+    cache = repository_cache if settings.repository_cache else None
+    flights = read_flights if settings.coalesce_reads else None
+    return BuildingService(BuildingRepository(session, cache), flights)
 
 
-async def list_buildings(session: AsyncSession) -> list[Building]:
+async def list_buildings(
+    session: AsyncSession,
+    after: tuple[str, UUID] | None = None,
+    limit: int | None = None,
+) -> Page[BuildingRow]:
     service = _service(session)
-    return await service.list_buildings()
+    return await service.list_buildings(after=after, limit=limit)
 
 
-async def get_building(session: AsyncSession, building_id: UUID) -> Building | None:
+async def get_building(session: AsyncSession, building_id: UUID) -> BuildingRow | None:
     service = _service(session)
     return await service.get_building(building_id)
 
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Mapping
+from uuid import UUID
+
+from sqlalchemy.exc import DataError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.repositories.bulk import BULK_TABLES, BulkRepository, BulkTable
+
+
+class ImportEntity(str, Enum):
+    BUILDINGS = "buildings"
+    ORGANIZATIONS = "organizations"
+    ORGANIZATION_PHONES = "organization_phones"
+    ORGANIZATION_ACTIVITIES = "organization_activities"
+
+
+class ImportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class BulkImportError(ValueError):
+    """Некорректная запись во входных данных."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Строка {line}: {message}")
+        self.line = line
+
+
+@dataclass(frozen=True, slots=True)
+class ImportReport:
+    entity: str
+    rows: int
+    upserted: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _uuid(value: Any) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _text(value: Any) -> str:
+    return str(value)
+
+
+def _optional_text(value: Any) -> str | None:
+    return None if value in (None, "") else str(value)
+
+
+_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "id": _uuid,
+    "building_id": _uuid,
+    "organization_id": _uuid,
+    "activity_id": _uuid,
+    "latitude": float,
+    "longitude": float,
+    "address": _text,
+    "name": _text,
+    "phone_number": _text,
+    "description": _optional_text,
+}
+_OPTIONAL_COLUMNS = frozenset({"description"})
+
+
+class BulkImportService:
+    """Разбор NDJSON/CSV и пакетная загрузка через COPY с итоговым upsert."""
+
+    def __init__(self, repository: BulkRepository, batch_size: int):
+        self._repository = repository
+        self._batch_size = batch_size
+
+    async def import_lines(
+        self,
+        entity: ImportEntity,
+        lines: AsyncIterable[str],
+        fmt: ImportFormat,
+    ) -> ImportReport:
+        table = BULK_TABLES[entity.value]
+        started = time.perf_counter()
+
+        await self._repository.create_staging(table)
+        rows = 0
+        batch: list[tuple[Any, ...]] = []
+        first_line = 0
+        async for line, record in _records(lines, fmt, table):
+            if not batch:
+                first_line = line
+            batch.append(_convert(table, record, line))
+            if len(batch) >= self._batch_size:
+                await self._copy(table, batch, first_line)
+                rows += len(batch)
+                batch = []
+        if batch:
+            await self._copy(table, batch, first_line)
+            rows += len(batch)
+
+        upserted = await self._repository.merge(table)
+        return ImportReport(
+            entity=entity.value,
+            rows=rows,
+            upserted=upserted,
+            seconds=time.perf_counter() - started,
+        )
+
+    async def _copy(self, table: BulkTable, batch: list[tuple[Any, ...]], first_line: int) -> None:
+        try:
+            await self._repository.copy_rows(table, batch)
+        except DataError as exc:
+            # COPY не сообщает, какая запись пакета не подошла, поэтому указываем начало пакета.
+            raise BulkImportError(first_line, f"значение не подходит для колонки: {exc.orig}.") from exc
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Режет поток байтов на строки UTF-8 (BOM в начале допускается)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _records(
+    lines: AsyncIterable[str],
+    fmt: ImportFormat,
+    table: BulkTable,
+) -> AsyncIterator[tuple[int, Mapping[str, Any]]]:
+    if fmt is ImportFormat.NDJSON:
+        number = 0
+        async for line in lines:
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise BulkImportError(number, "некорректный JSON.") from exc
+            if not isinstance(record, dict):
+                raise BulkImportError(number, "ожидался JSON-объект.")
+            yield number, record
+        return
+
+    header: list[str] | None = None
+    async for number, row in _csv_rows(lines):
+        if header is None:
+            header = [column.strip() for column in row]
+            missing = set(table.columns) - set(header) - _OPTIONAL_COLUMNS
+            if missing:
+                raise BulkImportError(number, f"в заголовке нет колонок: {', '.join(sorted(missing))}.")
+            continue
+        if len(row) != len(header):
+            raise BulkImportError(number, f"ожидалось {len(header)} полей, получено {len(row)}.")
+        yield number, dict(zip(header, row))
+
+
+async def _csv_rows(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, list[str]]]:
+    # Поле в кавычках может содержать перевод строки: копим физические строки,
+    # пока число кавычек нечётно (экранированные кавычки удвоены и чётность не меняют).
+    buffer: list[str] = []
+    quotes = 0
+    start = number = 0
+    async for line in lines:
+        number += 1
+        if not buffer:
+            if not line.strip():
+                continue
+            start = number
+        buffer.append(line + "\n")
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        try:
+            row = next(csv.reader(buffer))
+        except csv.Error as exc:
+            raise BulkImportError(start, str(exc)) from exc
+        yield start, row
+        buffer = []
+        quotes = 0
+    if buffer:
+        raise BulkImportError(start, "незакрытая кавычка.")
+
+
+def _convert(table: BulkTable, record: Mapping[str, Any], line: int) -> tuple[Any, ...]:
+    values = []
+    for column in table.columns:
+        value = record.get(column)
+        if value in (None, "") and column not in _OPTIONAL_COLUMNS:
+            raise BulkImportError(line, f"не заполнено поле {column}.")
+        try:
+            values.append(_CONVERTERS[column](value))
+        except (TypeError, ValueError) as exc:
+            raise BulkImportError(line, f"некорректное значение поля {column}.") from exc
+    return tuple(values)
+
+
+def _service(session: AsyncSession) -> BulkImportService:
+    return BulkImportService(BulkRepository(session), batch_size=settings.bulk_import_batch_size)
+
+
+async def import_lines(
+    session: AsyncSession,
+    entity: ImportEntity,
+    lines: AsyncIterable[str],
+    fmt: ImportFormat,
+) -> ImportReport:
+    service = _service(session)
+    return await service.import_lines(entity, lines, fmt)
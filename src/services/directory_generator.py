@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Iterator, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.repositories.bulk import BULK_TABLES, BulkRepository
+
+KM_PER_DEGREE = 111.32
+MAX_ACTIVITY_DEPTH = 3
+
+# Порядок загрузки: сначала таблицы, на которые ссылаются остальные.
+LOAD_ORDER = ("activities", "buildings", "organizations", "organization_phones", "organization_activities")
+
+Row = tuple[Any, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class City:
+    name: str
+    latitude: float
+    longitude: float
+    # Относительная доля организаций (примерно население в миллионах).
+    weight: float
+
+    @property
+    def spread_km(self) -> float:
+        """Стандартное отклонение расстояния от центра: крупные города «шире»."""
+        return 4.0 * math.sqrt(self.weight)
+
+
+CITIES: tuple[City, ...] = (
+    City("Москва", 55.7558, 37.6173, 12.6),
+    City("Санкт-Петербург", 59.9343, 30.3351, 5.4),
+    City("Новосибирск", 55.0084, 82.9357, 1.6),
+    City("Екатеринбург", 56.8389, 60.6057, 1.5),
+    City("Казань", 55.7963, 49.1088, 1.3),
+    City("Нижний Новгород", 56.2965, 43.9361, 1.2),
+    City("Челябинск", 55.1644, 61.4368, 1.2),
+    City("Красноярск", 56.0153, 92.8932, 1.2),
+    City("Самара", 53.1959, 50.1002, 1.1),
+    City("Уфа", 54.7388, 55.9721, 1.1),
+    City("Ростов-на-Дону", 47.2357, 39.7015, 1.1),
+    City("Омск", 54.9885, 73.3242, 1.1),
+    City("Воронеж", 51.6608, 39.2003, 1.0),
+    City("Пермь", 58.0105, 56.2502, 1.0),
+    City("Волгоград", 48.7080, 44.5133, 1.0),
+)
+
+STREETS = (
+    "Ленина", "Советская", "Мира", "Садовая", "Центральная", "Школьная", "Лесная", "Новая",
+    "Молодёжная", "Заречная", "Пушкина", "Гагарина", "Кирова", "Строителей", "Набережная",
+)
+ORGANIZATION_KINDS = ("ООО", "ИП", "АО", "Кафе", "Магазин", "Студия", "Сервис", "Аптека", "Салон", "Клиника")
+NAME_WORDS = (
+    "Ромашка", "Север", "Восход", "Гранит", "Лотос", "Орбита", "Рассвет", "Сфера", "Техно", "Уют",
+    "Фортуна", "Меридиан", "Янтарь", "Ладога", "Вектор", "Кедр", "Мозаика", "Парус", "Радуга", "Эталон",
+)
+ACTIVITY_WORDS = (
+    "Еда", "Автомобили", "Услуги", "Строительство", "Медицина", "Образование", "Одежда", "Спорт",
+    "Туризм", "Электроника", "Мебель", "Красота", "Финансы", "Логистика", "Развлечения", "Недвижимость",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DirectoryShape:
+    """Параметры синтетического справочника; одинаковые параметры дают одинаковые данные."""
+
+    organizations: int
+    organizations_per_building: float = 8.0
+    activity_width: int = 8
+    activity_depth: int = MAX_ACTIVITY_DEPTH
+    phones: tuple[int, int] = (1, 3)
+    activities: tuple[int, int] = (1, 3)
+    seed: int = 42
+    cities: Sequence[City] = field(default=CITIES)
+
+    def __post_init__(self) -> None:
+        if self.organizations < 0:
+            raise ValueError("Число организаций не может быть отрицательным.")
+        if not 1 <= self.activity_depth <= MAX_ACTIVITY_DEPTH:
+            raise ValueError(f"Глубина дерева видов деятельности — от 1 до {MAX_ACTIVITY_DEPTH} (ck_activities_level).")
+        if self.activity_width < 1 or self.organizations_per_building <= 0:
+            raise ValueError("Ширина дерева и число организаций на здание должны быть положительными.")
+        for low, high in (self.phones, self.activities):
+            if not 0 <= low <= high:
+                raise ValueError("Диапазон разветвления задаётся как 0 <= min <= max.")
+
+    @property
+    def buildings(self) -> int:
+        return max(math.ceil(self.organizations / self.organizations_per_building), 1)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_directory(shape: DirectoryShape, batch_size: int) -> Iterator[tuple[str, list[Row]]]:
+    """Пачки строк `(таблица, строки)` в порядке загрузки; колонки — как в BULK_TABLES.
+
+    Организации, телефоны и связи генерируются пачками, поэтому память не растёт с их числом.
+    """
+    rng = random.Random(shape.seed)
+
+    activities, leaf_ids = _activity_tree(rng, shape)
+    yield "activities", activities
+
+    building_ids: list[uuid.UUID] = []
+    cum_weights = list(accumulate(city.weight for city in shape.cities))
+    batch: list[Row] = []
+    for index in range(shape.buildings):
+        city = rng.choices(shape.cities, cum_weights=cum_weights)[0]
+        building_id = _uuid(rng)
+        building_ids.append(building_id)
+        latitude, longitude = _scatter(rng, city)
+        address = f"г. {city.name}, ул. {rng.choice(STREETS)}, д. {index + 1}"
+        batch.append((building_id, address, latitude, longitude))
+        if len(batch) >= batch_size:
+            yield "buildings", batch
+            batch = []
+    if batch:
+        yield "buildings", batch
+
+    for start in range(0, shape.organizations, batch_size):
+        organizations: list[Row] = []
+        phones: list[Row] = []
+        links: list[Row] = []
+        for index in range(start, min(start + batch_size, shape.organizations)):
+            organization_id = _uuid(rng)
+            # Номер в конце делает название уникальным (uq на organizations.name).
+            name = f"{rng.choice(ORGANIZATION_KINDS)} «{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)}» {index + 1}"
+            description = f"{rng.choice(NAME_WORDS)} и {rng.choice(NAME_WORDS).lower()}: товары и услуги"
+            organizations.append((organization_id, name, description, rng.choice(building_ids)))
+            for _ in range(rng.randint(*shape.phones)):
+                phones.append((_uuid(rng), f"+7 ({rng.randint(300, 999)}) {rng.randrange(10**7):07d}", organization_id))
+            count = min(rng.randint(*shape.activities), len(leaf_ids))
+            links.extend((organization_id, activity_id) for activity_id in rng.sample(leaf_ids, count))
+        yield "organizations", organizations
+        yield "organization_phones", phones
+        yield "organization_activities", links
+
+
+def _activity_tree(rng: random.Random, shape: DirectoryShape) -> tuple[list[Row], list[uuid.UUID]]:
+    # Имена уникальны в пределах родителя (uq_activities_parent_name): слово плюс путь в дереве.
+    rows: list[Row] = []
+    level: list[tuple[uuid.UUID | None, str]] = [(None, "")]
+    for depth in range(1, shape.activity_depth + 1):
+        next_level: list[tuple[uuid.UUID | None, str]] = []
+        for parent_id, path in level:
+            for position in range(1, shape.activity_width + 1):
+                activity_id = _uuid(rng)
+                child_path = f"{path}.{position}" if path else str(position)
+                word = ACTIVITY_WORDS[(position - 1) % len(ACTIVITY_WORDS)]
+                rows.append((activity_id, f"{word} {child_path}", depth, parent_id))
+                next_level.append((activity_id, child_path))
+        level = next_level
+    return rows, [activity_id for activity_id, _ in level if activity_id is not None]
+
+
+def _scatter(rng: random.Random, city: City) -> tuple[float, float]:
+    north_km = rng.gauss(0.0, city.spread_km)
+    east_km = rng.gauss(0.0, city.spread_km)
+    latitude = city.latitude + north_km / KM_PER_DEGREE
+    longitude = city.longitude + east_km / (KM_PER_DEGREE * math.cos(math.radians(city.latitude)))
+    return round(latitude, 6), round(longitude, 6)
+
+
+@dataclass(frozen=True, slots=True)
+class GenerationReport:
+    rows: dict[str, int]
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        total = sum(self.rows.values())
+        return total / self.seconds if self.seconds > 0 else 0.0
+
+
+class DirectoryGeneratorService:
+    """Загрузка синтетического справочника: COPY всех пачек в staging и upsert в порядке зависимостей."""
+
+    def __init__(self, repository: BulkRepository, batch_size: int):
+        self._repository = repository
+        self._batch_size = batch_size
+
+    async def load(self, shape: DirectoryShape, truncate: bool = False) -> GenerationReport:
+        started = time.perf_counter()
+        tables = [BULK_TABLES[name] for name in LOAD_ORDER]
+        if truncate:
+            await self._repository.truncate(tables)
+
+        for table in tables:
+            await self._repository.create_staging(table)
+
+        rows = dict.fromkeys(LOAD_ORDER, 0)
+        for name, batch in generate_directory(shape, self._batch_size):
+            await self._repository.copy_rows(BULK_TABLES[name], batch)
+            rows[name] += len(batch)
+
+        for table in tables:
+            await self._repository.merge(table)
+        return GenerationReport(rows=rows, seconds=time.perf_counter() - started)
+
+    async def analyze(self) -> None:
+        """Обновляет статистику планировщика: после массовой загрузки старые оценки неверны."""
+        await self._repository.analyze([BULK_TABLES[name] for name in LOAD_ORDER])
+
+
+def _service(session: AsyncSession, batch_size: int = settings.bulk_import_batch_size) -> DirectoryGeneratorService:
+    return DirectoryGeneratorService(BulkRepository(session), batch_size)
+
+
+async def load_directory(
+    session: AsyncSession,
+    shape: DirectoryShape,
+    batch_size: int,
+    truncate: bool = False,
+) -> GenerationReport:
+    service = _service(session, batch_size)
+    return await service.load(shape, truncate=truncate)
+
+
+async def analyze_directory(session: AsyncSession) -> None:
+    service = _service(session)
+    await service.analyze()
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import re
+import time
+from bisect import bisect_left
+from typing import Awaitable, Callable, Collection, Iterable, Mapping
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+_SPACES = re.compile(r"\s+")
+
+# Если изменилась большая доля названий, дешевле пересобрать индекс целиком, чем сливать изменения.
+REBUILD_RATIO = 0.1
+# list.sort не отпускает GIL: сортировка одним куском в потоке остановила бы и event loop.
+SORT_CHUNK = 20_000
+
+
+def normalize_name(value: str) -> str:
+    """Ключ сравнения: регистр и «ё» не различаются, пробелы схлопываются."""
+    return _SPACES.sub(" ", value.casefold().replace("ё", "е")).strip()
+
+
+# Ключ — (хвост названия, UUID.int). Кортежи из строк и чисел сборщик мусора перестаёт отслеживать,
+# а с UUID внутри каждая полная сборка обходила бы миллионы ключей, останавливая event loop.
+Key = tuple[str, int]
+
+
+def _keys(organization_id: int, name: str) -> set[Key]:
+    # Название целиком и каждый его хвост с начала слова: «кафе» находит и «Кафе Ромашка», и «ООО "Кафе"».
+    normalized = normalize_name(name)
+    starts = {0, *(match.start() for match in _WORD.finditer(normalized))}
+    return {(normalized[start:], organization_id) for start in starts}
+
+
+def _sorted_keys(keys: list[Key]) -> list[Key]:
+    # Короткие сортировки кусками и слияние на Python: между шагами поток отдаёт GIL.
+    runs = [sorted(keys[start : start + SORT_CHUNK]) for start in range(0, len(keys), SORT_CHUNK)]
+    if len(runs) <= 1:
+        return runs[0] if runs else []
+    return list(heapq.merge(*runs))
+
+
+def _merge_keys(keys: list[Key], fresh: list[Key]) -> list[Key]:
+    """Вставляет отсортированные `fresh` в отсортированный `keys` за один проход копированием срезов."""
+    merged: list[Key] = []
+    position = 0
+    for key in fresh:
+        insert_at = bisect_left(keys, key, position)
+        merged += keys[position:insert_at]
+        merged.append(key)
+        position = insert_at
+    merged += keys[position:]
+    return merged
+
+
+class NamePrefixIndex:
+    """Отсортированный список ключей названий; поиск по префиксу — bisect и короткий проход вперёд.
+
+    Индекс не меняется после построения: изменения собираются в новый объект (`updated`),
+    который кэш подменяет целиком, — читатели всегда видят согласованный снимок.
+    """
+
+    __slots__ = ("_names", "_keys", "version")
+
+    def __init__(self, entries: Iterable[tuple[UUID, str]] = (), version: int = 0):
+        self._names: dict[int, str] = {organization_id.int: name for organization_id, name in entries}
+        self._keys: list[Key] = _sorted_keys(
+            [key for organization_id, name in self._names.items() for key in _keys(organization_id, name)]
+        )
+        self.version = version
+
+    @classmethod
+    def _from_parts(cls, names: dict[int, str], keys: list[Key], version: int) -> NamePrefixIndex:
+        index = cls.__new__(cls)
+        index._names = names
+        index._keys = keys
+        index.version = version
+        return index
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def names(self) -> Mapping[int, str]:
+        """Названия по `UUID.int` организации."""
+        return self._names
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[UUID, str]]:
+        """До `limit` организаций, у которых название или слово в нём начинается с `prefix`."""
+        prefix = normalize_name(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        found: dict[int, str] = {}
+        keys = self._keys
+        position = bisect_left(keys, (prefix,))
+        while position < len(keys) and len(found) < limit:
+            key, organization_id = keys[position]
+            if not key.startswith(prefix):
+                break
+            found.setdefault(organization_id, self._names[organization_id])
+            position += 1
+        return [(UUID(int=organization_id), name) for organization_id, name in found.items()]
+
+    def updated(self, changed: Mapping[int, str], removed: Collection[int], version: int) -> NamePrefixIndex:
+        """Новый индекс с переименованиями, вставками и удалениями; этот остаётся прежним.
+
+        Работает за O(n) без полной сортировки — рассчитан на вызов в потоке.
+        """
+        stale = changed.keys() | set(removed)
+        names = {organization_id: name for organization_id, name in self._names.items() if organization_id not in stale}
+        names.update(changed)
+        kept = [key for key in self._keys if key[1] not in stale]
+        fresh = _sorted_keys([key for organization_id, name in changed.items() for key in _keys(organization_id, name)])
+        return self._from_parts(names, _merge_keys(kept, fresh), version)
+
+
+def diff_names(
+    current: Mapping[int, str],
+    entries: Iterable[tuple[UUID, str]],
+) -> tuple[dict[int, str], set[int]]:
+    """Что нужно вставить или переименовать и что удалить, чтобы `current` совпал с `entries`; ключи — `UUID.int`."""
+    fresh = {organization_id.int: name for organization_id, name in entries}
+    changed = {organization_id: name for organization_id, name in fresh.items() if current.get(organization_id) != name}
+    removed = current.keys() - fresh.keys()
+    return changed, removed
+
+
+def _release(index: NamePrefixIndex) -> None:
+    # Освобождение списка ключей одним вызовом держит GIL всё время; кусками поток отдаёт его между шагами.
+    # Индекс к этому моменту подменён, и новые запросы его не получат.
+    keys = index._keys
+    while keys:
+        del keys[-SORT_CHUNK:]
+
+
+class NameIndexCache:
+    """Индекс названий в памяти процесса.
+
+    Первый запрос ждёт построения; дальше ответы идут из текущего индекса, а сверка версии
+    и догрузка изменений выполняются в фоне не чаще раза в `refresh_interval` секунд.
+    """
+
+    def __init__(self, refresh_interval: float):
+        self._refresh_interval = refresh_interval
+        self._index: NamePrefixIndex | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    def _is_fresh(self) -> bool:
+        return time.monotonic() - self._checked_at < self._refresh_interval
+
+    async def get(
+        self,
+        load_version: Callable[[], Awaitable[int]],
+        load_entries: Callable[[], Awaitable[list[tuple[UUID, str]]]],
+    ) -> NamePrefixIndex:
+        index = self._index
+        if index is None:
+            return await self.refresh(load_version, load_entries)
+        if not self._is_fresh() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_in_background(load_version, load_entries))
+        return index
+
+    async def refresh(
+        self,
+        load_version: Callable[[], Awaitable[int]],
+        load_entries: Callable[[], Awaitable[list[tuple[UUID, str]]]],
+    ) -> NamePrefixIndex:
+        """Сверяет версию с БД и применяет изменения; при совпадении версии данные не читаются."""
+        async with self._lock:
+            version = await load_version()
+            previous = self._index
+            if previous is None or previous.version != version:
+                entries = await load_entries()
+                self._index = await self._apply(previous, entries, version)
+                if previous is not None:
+                    await asyncio.to_thread(_release, previous)
+            self._checked_at = time.monotonic()
+            return self._index
+
+    async def _apply(
+        self,
+        index: NamePrefixIndex | None,
+        entries: list[tuple[UUID, str]],
+        version: int,
+    ) -> NamePrefixIndex:
+        # Новый индекс собирается в потоке, пока запросы обслуживает прежний; подмена — одним присваиванием.
+        if index is None:
+            return await asyncio.to_thread(NamePrefixIndex, entries, version)
+
+        changed, removed = await asyncio.to_thread(diff_names, index.names, entries)
+        if len(changed) + len(removed) > REBUILD_RATIO * max(len(index), 1):
+            return await asyncio.to_thread(NamePrefixIndex, entries, version)
+        return await asyncio.to_thread(index.updated, changed, removed, version)
+
+    async def _refresh_in_background(
+        self,
+        load_version: Callable[[], Awaitable[int]],
+        load_entries: Callable[[], Awaitable[list[tuple[UUID, str]]]],
+    ) -> None:
+        try:
+            await self.refresh(load_version, load_entries)
+        except Exception:
+            # Остаёмся на прежнем индексе; следующая попытка — после очередного интервала.
+            self._checked_at = time.monotonic()
+            logger.exception("Не удалось обновить индекс названий организаций")
+
+    def invalidate(self) -> None:
+        """Заставляет следующий запрос сверить версию с БД."""
+        self._checked_at = float("-inf")
@@ -1,105 +1,294 @@
 from __future__ import annotations
 
-import math
-from typing import Iterable
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.core.geo import window_deltas, within_radius_mask
 from src.models import Organization
-from src.repositories.organization import OrganizationRepository
+from src.repositories.cache import repository_cache
+from src.repositories.filters import OrganizationFilter
+from src.repositories.organization import OrganizationDocument, OrganizationPoint, OrganizationRepository
+from src.repositories.pagination import Page
+from src.services.single_flight import SingleFlight, coalesce, read_flights
 
-EARTH_RADIUS_KM = 6371.0
+PageKey = tuple[str, UUID]
+RankedPageKey = tuple[float, UUID]
+
+
+@dataclass(frozen=True, slots=True)
+class OrganizationBatch:
+    items: list[OrganizationDocument]
+    missing: list[UUID]
 
 
 class OrganizationService:
     """Бизнес-операции над организациями."""
 
-    def __init__(self, repository: OrganizationRepository):
+    def __init__(self, repository: OrganizationRepository, flights: SingleFlight | None = None):
         self._repository = repository
+        self._flights = flights
+
+    async def get_detail(self, organization_id: UUID) -> OrganizationDocument | None:
+        return await coalesce(
+            self._flights,
+            ("organizations.get_detail", organization_id),
+            self._repository,
+            lambda repository: repository.get_detail(organization_id),
+        )
 
-    async def get_by_id(self, organization_id: UUID) -> Organization | None:
-        return await self._repository.get_by_id(organization_id)
+    async def get_details(self, organization_ids: Sequence[UUID]) -> OrganizationBatch:
+        """Документы в порядке запроса (повторы id схлопываются) и список ненайденных id."""
+        unique_ids = tuple(dict.fromkeys(organization_ids))
+        documents: dict[UUID, OrganizationDocument] = {}
+        if unique_ids:
+            documents = await coalesce(
+                self._flights,
+                ("organizations.get_details", unique_ids),
+                self._repository,
+                lambda repository: repository.get_details(unique_ids),
+            )
+        return OrganizationBatch(
+            items=[documents[organization_id] for organization_id in unique_ids if organization_id in documents],
+            missing=[organization_id for organization_id in unique_ids if organization_id not in documents],
+        )
+
+    async def search(
+        self,
+        criteria: OrganizationFilter,
+        after: PageKey | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        """Организации, удовлетворяющие всем условиям фильтра, одним запросом.
+
+        Небольшой радиус сначала сводится к списку id (`list_within_radius`), остальные условия и
+        страница — тем же запросом.
+        """
+        circle = criteria.radius
+        if circle is not None and 0 < circle.radius_km <= settings.geo_post_filter_max_radius_km:
+            inside = await self.list_within_radius(circle.latitude, circle.longitude, circle.radius_km)
+            criteria = criteria.narrow(radius=None).with_organizations(inside)
+        return await coalesce(
+            self._flights,
+            ("organizations.search", criteria, after, limit),
+            self._repository,
+            lambda repository: repository.search(criteria, after=after, limit=limit),
+        )
+
+    async def search_by_name(
+        self,
+        name: str,
+        after: PageKey | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        return await self.search(OrganizationFilter(name=name), after=after, limit=limit)
+
+    async def search_fuzzy(
+        self,
+        query: str,
+        limit: int,
+        threshold: float | None = None,
+    ) -> list[tuple[OrganizationDocument, float]]:
+        """Ранжированный поиск по названию с допуском опечаток."""
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        if threshold is None:
+            threshold = settings.fuzzy_search_threshold
+        return await coalesce(
+            self._flights,
+            ("organizations.search_fuzzy", query, threshold, limit),
+            self._repository,
+            lambda repository: repository.search_fuzzy(query, threshold=threshold, limit=limit),
+        )
 
-    async def search_by_name(self, name: str) -> list[Organization]:
-        pattern = f"%{name.strip()}%"
-        return await self._repository.search_by_name_pattern(pattern)
+    async def search_text(
+        self,
+        query: str,
+        after: RankedPageKey | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        """Полнотекстовый поиск по названию и описанию с ранжированием."""
+        query = query.strip()
+        if not query:
+            return Page(items=[])
+        return await coalesce(
+            self._flights,
+            ("organizations.search_text", query, after, limit),
+            self._repository,
+            lambda repository: repository.search_text(query, after=after, limit=limit),
+        )
 
-    async def list_by_building(self, building_id: UUID) -> list[Organization]:
-        return await self._repository.list_by_building(building_id)
+    async def list_by_building(
+        self,
+        building_id: UUID,
+        after: PageKey | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        return await coalesce(
+            self._flights,
+            ("organizations.list_by_building", building_id, after, limit),
+            self._repository,
+            lambda repository: repository.list_by_building(building_id, after=after, limit=limit),
+        )
 
-    async def list_by_activity_ids(self, activity_ids: Iterable[UUID]) -> list[Organization]:
-        return await self._repository.list_by_activity_ids(activity_ids)
+    async def list_by_activity_ids(
+        self,
+        activity_ids: Iterable[UUID],
+        name: str | None = None,
+        after: PageKey | None = None,
+        limit: int | None = None,
+    ) -> Page[OrganizationDocument]:
+        """Организации с любой из активностей; `name` дополнительно сужает выборку по части названия."""
+        criteria = OrganizationFilter(name=name or None).with_activities(activity_ids)
+        return await self.search(criteria, after=after, limit=limit)
 
     async def list_within_radius(
         self,
         latitude: float,
         longitude: float,
         radius_km: float,
-    ) -> list[Organization]:
+    ) -> list[UUID]:
+        """Id организаций не дальше `radius_km` от точки: кандидаты — окном по индексу, расстояние — одним векторным проходом."""
         if radius_km <= 0:
             return []
 
-        lat_delta = radius_km / 111.0
-        lon_delta = radius_km / (111.0 * max(math.cos(math.radians(latitude)), 0.00001))
+        lat_delta, lon_delta = window_deltas(latitude, radius_km)
+        candidates: list[OrganizationPoint] = await coalesce(
+            self._flights,
+            ("organizations.list_in_lat_lon_window", latitude, longitude, lat_delta, lon_delta),
+            self._repository,
+            lambda repository: repository.list_in_lat_lon_window(
+                latitude=latitude,
+                longitude=longitude,
+                lat_delta=lat_delta,
+                lon_delta=lon_delta,
+            ),
+        )
+        mask = within_radius_mask(
+            latitude,
+            longitude,
+            [candidate.latitude for candidate in candidates],
+            [candidate.longitude for candidate in candidates],
+            radius_km,
+        )
+        return [candidate.id for candidate, inside in zip(candidates, mask) if inside]
+
+    async def list_nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int,
+        max_radius_km: float | None = None,
+    ) -> list[tuple[Organization, float]]:
+        """Ближайшие организации по возрастанию расстояния вместе с расстоянием в км."""
+        if limit <= 0 or (max_radius_km is not None and max_radius_km <= 0):
+            return []
+
+        lat_delta = lon_delta = None
+        if max_radius_km is not None:
+            lat_delta, lon_delta = window_deltas(latitude, max_radius_km)
 
-        candidates = await self._repository.list_in_lat_lon_window(
+        # ORM-объекты привязаны к сессии запроса, поэтому это чтение не склеивается с чужими.
+        return await self._repository.list_nearest(
             latitude=latitude,
             longitude=longitude,
+            limit=limit,
+            max_radius_km=max_radius_km,
             lat_delta=lat_delta,
             lon_delta=lon_delta,
         )
-        return [
-            organization
-            for organization in candidates
-            if _haversine(latitude, longitude, organization.building.latitude, organization.building.longitude)
-            <= radius_km
-        ]
-
-    async def list_in_bbox(
-        self,
-        min_latitude: float,
-        max_latitude: float,
-        min_longitude: float,
-        max_longitude: float,
-    ) -> list[Organization]:
-        return await self._repository.list_in_bbox(min_latitude, max_latitude, min_longitude, max_longitude)
-
-    async def list_all(self) -> list[Organization]:
-        return await self._repository.list_all()
 
+    async def list_all(self, after: PageKey | None = None, limit: int | None = None) -> Page[OrganizationDocument]:
+        return await coalesce(
+            self._flights,
+            ("organizations.list_all", after, limit),
+            self._repository,
+            lambda repository: repository.list_all(after=after, limit=limit),
+        )
 
-def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    lat1_rad, lon1_rad, lat2_rad, lon2_rad = map(math.radians, (lat1, lon1, lat2, lon2))
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
-    c = 2 * math.asin(math.sqrt(a))
-    return EARTH_RADIUS_KM * c
+    def stream_all(self, chunk_size: int) -> AsyncIterator[list[Organization]]:
+        return self._repository.stream_all(chunk_size)
 
 
 def _service(session: AsyncSession) -> OrganizationService:
-    return OrganizationService(OrganizationRepository(session))
+    cache = repository_cache if settings.repository_cache else None
+    flights = read_flights if settings.coalesce_reads else None
+    return OrganizationService(OrganizationRepository(session, cache), flights)
+
+
+async def get_detail(session: AsyncSession, organization_id: UUID) -> OrganizationDocument | None:
+    service = _service(session)
+    return await service.get_detail(organization_id)
+
+
+async def get_details(session: AsyncSession, organization_ids: Sequence[UUID]) -> OrganizationBatch:
+    service = _service(session)
+    return await service.get_details(organization_ids)
+
+
+async def search(
+    session: AsyncSession,
+    criteria: OrganizationFilter,
+    after: PageKey | None = None,
+    limit: int | None = None,
+) -> Page[OrganizationDocument]:
+    service = _service(session)
+    return await service.search(criteria, after=after, limit=limit)
 
 
-async def get_by_id(session: AsyncSession, organization_id: UUID) -> Organization | None:
+async def search_by_name(
+    session: AsyncSession,
+    name: str,
+    after: PageKey | None = None,
+    limit: int | None = None,
+) -> Page[OrganizationDocument]:
     service = _service(session)
-    return await service.get_by_id(organization_id)
+    return await service.search_by_name(name, after=after, limit=limit)
 
 
-async def search_by_name(session: AsyncSession, name: str) -> list[Organization]:
+async def search_fuzzy(
+    session: AsyncSession,
+    query: str,
+    limit: int,
+    threshold: float | None = None,
+) -> list[tuple[OrganizationDocument, float]]:
     service = _service(session)
-    return await service.search_by_name(name)
+    return await service.search_fuzzy(query, limit=limit, threshold=threshold)
 
 
-async def list_by_building(session: AsyncSession, building_id: UUID) -> list[Organization]:
+async def search_text(
+    session: AsyncSession,
+    query: str,
+    after: RankedPageKey | None = None,
+    limit: int | None = None,
+) -> Page[OrganizationDocument]:
     service = _service(session)
-    return await service.list_by_building(building_id)
+    return await service.search_text(query, after=after, limit=limit)
 
 
-async def list_by_activity_ids(session: AsyncSession, activity_ids: Iterable[UUID]) -> list[Organization]:
+async def list_by_building(
+    session: AsyncSession,
+    building_id: UUID,
+    after: PageKey | None = None,
+    limit: int | None = None,
+) -> Page[OrganizationDocument]:
     service = _service(session)
-    return await service.list_by_activity_ids(activity_ids)
+    return await service.list_by_building(building_id, after=after, limit=limit)
+
+
+async def list_by_activity_ids(
+    session: AsyncSession,
+    activity_ids: Iterable[UUID],
+    name: str | None = None,
+    after: PageKey | None = None,
+    limit: int | None = None,
+) -> Page[OrganizationDocument]:
+    service = _service(session)
+    return await service.list_by_activity_ids(activity_ids, name=name, after=after, limit=limit)
 
 
 async def list_within_radius(
@@ -107,28 +296,36 @@ async def list_within_radius(
     latitude: float,
     longitude: float,
     radius_km: float,
-) -> list[Organization]:
+) -> list[UUID]:
     service = _service(session)
     return await service.list_within_radius(latitude=latitude, longitude=longitude, radius_km=radius_km)
 
 
-async def list_in_bbox(
+async def list_nearest(
     session: AsyncSession,
-    min_latitude: float,
-    max_latitude: float,
-    min_longitude: float,
-    max_longitude: float,
-) -> list[Organization]:
+    latitude: float,
+    longitude: float,
+    limit: int,
+    max_radius_km: float | None = None,
+) -> list[tuple[Organization, float]]:
     service = _service(session)
-    return await service.list_in_bbox(
-        min_latitude=min_latitude,
-        max_latitude=max_latitude,
-        min_longitude=min_longitude,
-        max_longitude=max_longitude,
+    return await service.list_nearest(
+        latitude=latitude,
+        longitude=longitude,
+        limit=limit,
+        max_radius_km=max_radius_km,
     )
 
 
-async def list_all(session: AsyncSession) -> list[Organization]:
+async def list_all(
+    session: AsyncSession,
+    after: PageKey | None = None,
+    limit: int | None = None,
+) -> Page[OrganizationDocument]:
     service = _service(session)
-    return await service.list_all()
+    return await service.list_all(after=after, limit=limit)
+
 
+def stream_all(session: AsyncSession, chunk_size: int) -> AsyncIterator[list[Organization]]:
+    service = _service(session)
+    return service.stream_all(chunk_size)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Protocol, TypeVar
+
+from src.core.metrics import Counter, registry
+from src.repositories.table_version import TableVersions
+
+T = TypeVar("T")
+R = TypeVar("R", bound="Versioned")
+
+single_flight_requests_total = registry.register(
+    Counter(
+        "single_flight_requests_total",
+        "Чтения сервисов: leader выполнил запрос, waiter дождался чужого.",
+        ("operation", "role"),
+    )
+)
+
+
+class Versioned(Protocol):
+    """Репозиторий, который знает снимок счётчиков таблиц своей транзакции."""
+
+    def versions(self) -> TableVersions: ...
+
+
+class SingleFlight:
+    """Склеивает одинаковые одновременные чтения внутри воркера: запрос в БД выполняет первый, остальные ждут.
+
+    Запрос идёт в сессии первого вызывающего (leader), но в отдельной задаче: отмена ожидающего
+    его не прерывает. Отменённый leader не отпускает свою сессию, пока запрос не завершится,
+    иначе остальные получили бы ошибку закрытой сессии. Второе соединение из пула не берётся.
+    Ошибку запроса получают все, кто его ждал. Результат общий — вызывающие не должны его изменять.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: tuple[Hashable, ...], load: Callable[[], Awaitable[T]]) -> T:
+        """`key` — имя операции и её аргументы; имя попадает в метрики."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            single_flight_requests_total.inc((str(key[0]), "waiter"))
+            return await asyncio.shield(flight)
+
+        flight = asyncio.ensure_future(load())
+        self._flights[key] = flight
+        flight.add_done_callback(lambda done: self._finish(key, done))
+        single_flight_requests_total.inc((str(key[0]), "leader"))
+        try:
+            return await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            # Сессию leader закроет сразу после отмены, а запрос в ней ещё ждут другие.
+            if not flight.done():
+                await asyncio.wait((flight,))
+            raise
+
+    def _finish(self, key: Hashable, flight: asyncio.Future[Any]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Если все ожидающие отменены, ошибку никто не заберёт — отмечаем её прочитанной.
+        if not flight.cancelled():
+            flight.exception()
+
+
+async def coalesce(
+    flights: SingleFlight | None,
+    key: tuple[Hashable, ...],
+    repository: R,
+    load: Callable[[R], Awaitable[T]],
+) -> T:
+    """Чтение через SingleFlight, если он подключён к сервису; иначе — напрямую.
+
+    Результат достаётся нескольким запросам, поэтому `load` должен возвращать значения без
+    привязки к сессии: документы, строки, кортежи, но не ORM-объекты. Снимок счётчиков таблиц,
+    уже прочитанный запросом для ETag или кэша, входит в ключ: запросы с разными версиями общий
+    результат не делят. Снимок читается один раз на транзакцию; `load` идёт в сессии leader и
+    берёт тот же снимок, не запрашивая его повторно.
+    """
+    if flights is None:
+        return await load(repository)
+    versions = repository.versions()
+    return await flights.do((*key, versions), lambda: load(repository))
+
+
+read_flights = SingleFlight()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import AsyncContextManager, Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.db.session import read_session
+from src.repositories.organization import OrganizationRepository
+from src.repositories.table_version import TableVersionRepository
+from src.services.name_index import NameIndexCache, NamePrefixIndex
+
+name_index = NameIndexCache(refresh_interval=settings.suggest_refresh_seconds)
+
+
+class SuggestService:
+    """Подсказки названий организаций из индекса в памяти.
+
+    Индекс обновляется в фоне, поэтому читает данные в собственных сессиях, а не в сессии запроса.
+    """
+
+    def __init__(self, cache: NameIndexCache, session_factory: Callable[[], AsyncContextManager[AsyncSession]]):
+        self._cache = cache
+        self._session_factory = session_factory
+
+    async def suggest(self, prefix: str, limit: int) -> list[tuple[UUID, str]]:
+        index = await self._index()
+        return index.suggest(prefix, limit)
+
+    async def warm_up(self) -> NamePrefixIndex:
+        """Строит индекс заранее, чтобы первый запрос не ждал загрузки."""
+        return await self._cache.refresh(self._load_version, self._load_entries)
+
+    async def _index(self) -> NamePrefixIndex:
+        return await self._cache.get(self._load_version, self._load_entries)
+
+    async def _load_version(self) -> int:
+        async with self._session_factory() as session:
+            return await TableVersionRepository(session).get_version("organizations")
+
+    async def _load_entries(self) -> list[tuple[UUID, str]]:
+        async with self._session_factory() as session:
+            return await OrganizationRepository(session).list_names()
+
+
+def _service() -> SuggestService:
+    return SuggestService(name_index, read_session)
+
+
+async def suggest(prefix: str, limit: int) -> list[tuple[UUID, str]]:
+    service = _service()
+    return await service.suggest(prefix, limit)
+
+
+async def warm_up() -> NamePrefixIndex:
+    service = _service()
+    return await service.warm_up()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.table_version import TableVersionRepository
+
+
+class TableVersionService:
+    """Версии содержимого таблиц для кэшей и условных запросов."""
+
+    def __init__(self, repository: TableVersionRepository):
+        self._repository = repository
+
+    async def get_versions(self, table_names: Iterable[str]) -> dict[str, int]:
+        return await self._repository.get_versions(table_names)
+
+
+def _service(session: AsyncSession) -> TableVersionService:
+    return TableVersionService(TableVersionRepository(session))
+
+
+async def get_versions(session: AsyncSession, table_names: Iterable[str]) -> dict[str, int]:
+    service = _service(session)
+    return await service.get_versions(table_names)
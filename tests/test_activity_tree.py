@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+import pytest
+
+from src.models import Activity
+from src.services.activity_tree import ActivityTreeCache, build_activity_snapshot
+
+
+def _activity(name: str, parent: Activity | None = None) -> Activity:
+    return Activity(
+        id=uuid.uuid4(),
+        name=name,
+        level=parent.level + 1 if parent else 1,
+        parent_id=parent.id if parent else None,
+    )
+
+
+def _tree() -> list[Activity]:
+    food = _activity("Food")
+    meat = _activity("Meat", food)
+    dairy = _activity("Dairy", food)
+    cheese = _activity("Cheese", dairy)
+    cars = _activity("Cars")
+    return [meat, cars, cheese, food, dairy]
+
+
+def test_snapshot_serializes_sorted_tree_and_branches():
+    activities = _tree()
+    meat, cars, cheese, food, dairy = activities
+
+    snapshot = build_activity_snapshot(activities, version=7)
+
+    tree = json.loads(snapshot.tree_json)
+    assert [node["name"] for node in tree] == ["Cars", "Food"]
+    assert [node["name"] for node in tree[1]["children"]] == ["Dairy", "Meat"]
+    assert json.loads(snapshot.branch_json[dairy.id])["children"][0]["id"] == str(cheese.id)
+    assert snapshot.roots == (cars.id, food.id)
+    assert snapshot.parents[cheese.id] == dairy.id
+    assert snapshot.children[food.id] == (dairy.id, meat.id)
+    assert snapshot.version == 7
+
+
+def test_snapshot_descendants_cover_every_depth():
+    activities = _tree()
+    meat, cars, cheese, food, dairy = activities
+
+    snapshot = build_activity_snapshot(activities, version=1)
+
+    assert snapshot.descendants[food.id] == {food.id, meat.id, dairy.id, cheese.id}
+    assert snapshot.descendants[cheese.id] == {cheese.id}
+    assert snapshot.descendant_ids(uuid.uuid4()) == []
+
+
+class Loader:
+    def __init__(self, activities: list[Activity]):
+        self.activities = activities
+        self.version = 1
+        self.version_calls = 0
+        self.load_calls = 0
+
+    async def load_version(self) -> int:
+        self.version_calls += 1
+        return self.version
+
+    async def load_activities(self) -> list[Activity]:
+        self.load_calls += 1
+        return self.activities
+
+
+@pytest.mark.asyncio
+async def test_cache_skips_queries_until_refresh_interval():
+    loader = Loader(_tree())
+    cache = ActivityTreeCache(refresh_interval=3600)
+
+    first = await cache.get(loader.load_version, loader.load_activities)
+    second = await cache.get(loader.load_version, loader.load_activities)
+
+    assert first is second
+    assert (loader.version_calls, loader.load_calls) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_reloads_only_when_version_changes():
+    loader = Loader(_tree())
+    cache = ActivityTreeCache(refresh_interval=0)
+
+    first = await cache.get(loader.load_version, loader.load_activities)
+    assert await cache.get(loader.load_version, loader.load_activities) is first
+    assert loader.load_calls == 1
+
+    loader.version = 2
+    refreshed = await cache.get(loader.load_version, loader.load_activities)
+
+    assert refreshed is not first
+    assert refreshed.version == 2
+    assert loader.load_calls == 2
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import uuid
+from typing import AsyncIterator
+
+import pytest
+from asyncpg.exceptions import StringDataRightTruncationError
+from sqlalchemy.exc import DataError
+
+from src.repositories.bulk import BULK_TABLES, BulkRepository, BulkTable
+from src.services.bulk_import import BulkImportError, BulkImportService, ImportEntity, ImportFormat, iter_lines
+
+TOO_LONG = StringDataRightTruncationError("value too long for type character varying(255)")
+
+
+class StubBulkRepository:
+    def __init__(self):
+        self.staged: list[str] = []
+        self.batches: list[list[tuple]] = []
+        self.merged: list[str] = []
+
+    async def create_staging(self, table: BulkTable) -> None:
+        self.staged.append(table.staging)
+
+    async def copy_rows(self, table: BulkTable, rows) -> None:
+        self.batches.append(list(rows))
+
+    async def merge(self, table: BulkTable) -> int:
+        self.merged.append(table.name)
+        return sum(len(batch) for batch in self.batches)
+
+
+async def _chunks(*parts: bytes) -> AsyncIterator[bytes]:
+    for part in parts:
+        yield part
+
+
+async def _import(entity: ImportEntity, fmt: ImportFormat, *parts: bytes, batch_size: int = 100):
+    repo = StubBulkRepository()
+    service = BulkImportService(repo, batch_size=batch_size)  # type: ignore[arg-type]
+    report = await service.import_lines(entity, iter_lines(_chunks(*parts)), fmt)
+    return repo, report
+
+
+@pytest.mark.asyncio
+async def test_ndjson_rows_are_copied_in_batches_and_merged_once():
+    ids = [uuid.uuid4() for _ in range(5)]
+    payload = b"".join(
+        f'{{"id": "{item}", "address": "Addr {n}", "latitude": 55.7, "longitude": 37.6}}\n'.encode()
+        for n, item in enumerate(ids)
+    )
+
+    # Разрезаем поток посреди строки, как это бывает с телом HTTP-запроса.
+    repo, report = await _import(ImportEntity.BUILDINGS, ImportFormat.NDJSON, payload[:37], payload[37:], batch_size=2)
+
+    assert [len(batch) for batch in repo.batches] == [2, 2, 1]
+    assert repo.batches[0][0] == (ids[0], "Addr 0", 55.7, 37.6)
+    assert repo.staged == ["staging_buildings"]
+    assert repo.merged == ["buildings"]
+    assert (report.rows, report.upserted) == (5, 5)
+
+
+@pytest.mark.asyncio
+async def test_csv_handles_bom_quoted_newlines_and_optional_columns():
+    org_id, building_id = uuid.uuid4(), uuid.uuid4()
+    payload = (
+        "﻿id,name,building_id\r\n"
+        f'{org_id},"ООО ""Кавычки""\nвторая строка",{building_id}\r\n'
+    ).encode()
+
+    repo, report = await _import(ImportEntity.ORGANIZATIONS, ImportFormat.CSV, payload)
+
+    assert repo.batches == [[(org_id, 'ООО "Кавычки"\nвторая строка', None, building_id)]]
+    assert report.rows == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_rows_report_line_number():
+    payload = f'{{"organization_id": "{uuid.uuid4()}", "activity_id": "nope"}}\n'.encode()
+
+    with pytest.raises(BulkImportError) as exc_info:
+        await _import(ImportEntity.ORGANIZATION_ACTIVITIES, ImportFormat.NDJSON, b"\n" + payload)
+
+    assert exc_info.value.line == 2
+
+
+@pytest.mark.asyncio
+async def test_csv_header_must_cover_required_columns():
+    with pytest.raises(BulkImportError, match="phone_number"):
+        await _import(ImportEntity.ORGANIZATION_PHONES, ImportFormat.CSV, b"id,organization_id\n")
+
+
+class TruncatingDriver:
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        raise TOO_LONG
+
+
+class DriverSession:
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+    @property
+    def driver_connection(self):
+        return TruncatingDriver()
+
+
+@pytest.mark.asyncio
+async def test_copy_driver_errors_become_sqlalchemy_errors():
+    repo = BulkRepository(DriverSession())  # type: ignore[arg-type]
+
+    with pytest.raises(DataError) as exc_info:
+        await repo.copy_rows(BULK_TABLES["buildings"], [(uuid.uuid4(), "x" * 300, 55.7, 37.6)])
+
+    assert exc_info.value.orig is TOO_LONG
+
+
+class TruncatingBulkRepository(StubBulkRepository):
+    async def copy_rows(self, table: BulkTable, rows) -> None:
+        if len(self.batches) == 1:
+            raise DataError(f"COPY {table.staging}", None, TOO_LONG)
+        await super().copy_rows(table, rows)
+
+
+@pytest.mark.asyncio
+async def test_oversized_field_in_copy_is_reported_as_import_error():
+    payload = b"".join(
+        f'{{"id": "{uuid.uuid4()}", "address": "{"x" * (300 if n == 3 else 5)}", "latitude": 1, "longitude": 2}}\n'.encode()
+        for n in range(4)
+    )
+    service = BulkImportService(TruncatingBulkRepository(), batch_size=2)  # type: ignore[arg-type]
+
+    with pytest.raises(BulkImportError, match="value too long") as exc_info:
+        await service.import_lines(ImportEntity.BUILDINGS, iter_lines(_chunks(payload)), ImportFormat.NDJSON)
+
+    # Второй пакет начинается с третьей строки.
+    assert exc_info.value.line == 3
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import conditional
+from src.api.conditional import etag_matches, make_etag, table_etag
+from src.db.session import get_read_session
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"zzz", "abc"', True),
+        ("*", True),
+        ('"zzz"', False),
+    ],
+)
+def test_etag_matches_uses_weak_comparison(header: str | None, expected: bool):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_make_etag_depends_on_every_part():
+    assert make_etag("/a", "t:1") == make_etag("/a", "t:1")
+    assert make_etag("/a", "t:1") != make_etag("/a", "t:2")
+    assert make_etag("/a", "t:1").startswith('"')
+
+
+def test_table_etag_answers_304_without_running_endpoint(monkeypatch: pytest.MonkeyPatch):
+    versions = {"buildings": 1}
+    calls: list[str] = []
+
+    async def get_versions(session, tables):
+        return {table: versions[table] for table in tables}
+
+    monkeypatch.setattr(conditional.table_version_service, "get_versions", get_versions)
+
+    app = FastAPI()
+    app.dependency_overrides[get_read_session] = lambda: None
+
+    @app.get("/buildings", dependencies=[Depends(table_etag("buildings"))])
+    async def buildings() -> list[str]:
+        calls.append("called")
+        return ["building"]
+
+    client = TestClient(app)
+    first = client.get("/buildings")
+    etag = first.headers["etag"]
+
+    cached = client.get("/buildings", headers={"If-None-Match": etag})
+    versions["buildings"] = 2
+    changed = client.get("/buildings", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert calls == ["called", "called"]
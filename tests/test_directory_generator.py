@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from src.core.geo import haversine_km
+from src.services.directory_generator import CITIES, DirectoryShape, generate_directory
+
+
+def _tables(shape: DirectoryShape, batch_size: int = 100) -> dict[str, list[tuple]]:
+    tables: dict[str, list[tuple]] = {}
+    for name, rows in generate_directory(shape, batch_size):
+        tables.setdefault(name, []).extend(rows)
+    return tables
+
+
+def test_same_seed_produces_same_directory():
+    shape = DirectoryShape(organizations=300, seed=7)
+
+    assert _tables(shape) == _tables(shape, batch_size=1000)
+    assert _tables(shape) != _tables(DirectoryShape(organizations=300, seed=8))
+
+
+def test_shape_controls_tree_and_fan_out():
+    shape = DirectoryShape(organizations=200, activity_width=3, activity_depth=2, phones=(1, 2), activities=(2, 2))
+    tables = _tables(shape)
+
+    levels = Counter(level for _, _, level, _ in tables["activities"])
+    assert levels == {1: 3, 2: 9}
+    leaves = {activity_id for activity_id, _, level, _ in tables["activities"] if level == 2}
+
+    phones = Counter(organization_id for _, _, organization_id in tables["organization_phones"])
+    links = Counter(organization_id for organization_id, _ in tables["organization_activities"])
+    assert len(tables["organizations"]) == 200
+    assert set(phones.values()) <= {1, 2} and len(phones) == 200
+    assert set(links.values()) == {2}
+    assert {activity_id for _, activity_id in tables["organization_activities"]} <= leaves
+    assert len({name for _, name, _, _ in tables["organizations"]}) == 200
+
+
+def test_buildings_cluster_around_cities():
+    tables = _tables(DirectoryShape(organizations=800))
+
+    for _, address, latitude, longitude in tables["buildings"]:
+        city = next(city for city in CITIES if f"г. {city.name}," in address)
+        assert haversine_km(city.latitude, city.longitude, latitude, longitude) < 6 * city.spread_km
+
+
+def test_shape_rejects_depth_beyond_activity_levels():
+    with pytest.raises(ValueError):
+        DirectoryShape(organizations=10, activity_depth=4)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from src.core import geo
+from src.core.geo import haversine_km, within_radius_mask
+
+
+def _points(count: int, seed: int = 1) -> tuple[list[float], list[float]]:
+    rng = random.Random(seed)
+    return (
+        [55.75 + rng.uniform(-0.5, 0.5) for _ in range(count)],
+        [37.62 + rng.uniform(-0.9, 0.9) for _ in range(count)],
+    )
+
+
+def test_vectorized_mask_matches_scalar_haversine():
+    latitudes, longitudes = _points(5000)
+
+    mask = within_radius_mask(55.75, 37.62, latitudes, longitudes, 25.0)
+
+    expected = [haversine_km(55.75, 37.62, lat, lon) <= 25.0 for lat, lon in zip(latitudes, longitudes)]
+    assert mask == expected
+    assert any(mask) and not all(mask)
+
+
+def test_mask_falls_back_to_scalar_without_numpy(monkeypatch: pytest.MonkeyPatch):
+    latitudes, longitudes = _points(500)
+    vectorized = within_radius_mask(55.75, 37.62, latitudes, longitudes, 10.0)
+
+    monkeypatch.setattr(geo, "np", None)
+
+    assert within_radius_mask(55.75, 37.62, latitudes, longitudes, 10.0) == vectorized
+
+
+def test_mask_accepts_radius_beyond_half_circumference():
+    latitudes, longitudes = _points(100)
+
+    assert all(within_radius_mask(-55.75, -142.38, latitudes, longitudes, 30000.0))
@@ -4,7 +4,12 @@ import uuid
 
 import pytest
 
-from src.mappers import map_activity_tree_list, map_organization_detail
+from src.mappers import (
+    map_activity_tree_list,
+    map_organization_detail,
+    map_organization_document,
+    map_organization_nearby,
+)
 from src.models import Activity, Building, Organization, OrganizationPhone
 
 
@@ -75,3 +80,37 @@ def test_map_organization_detail_requires_loaded_building():
 
     with pytest.raises(ValueError):
         map_organization_detail(org)
+
+
+def test_map_organization_nearby_adds_distance():
+    building = Building(id=uuid.uuid4(), address="Main st. 1", latitude=10.0, longitude=20.0)
+    org = Organization(id=uuid.uuid4(), name="Org", description=None, building_id=building.id)
+    org.building = building
+    org.phone_numbers = []
+    org.activities = []
+
+    dto = map_organization_nearby(org, 1.5)
+
+    assert dto.distance_km == 1.5
+    assert dto.building.id == building.id
+
+
+def test_map_organization_document_matches_orm_mapping():
+    building = Building(id=uuid.uuid4(), address="Main st. 1", latitude=10.0, longitude=20.0)
+    org = Organization(id=uuid.uuid4(), name="Org", description=None, building_id=building.id)
+    org.building = building
+    org.phone_numbers = [OrganizationPhone(id=uuid.uuid4(), phone_number="+1")]
+    org.activities = [Activity(id=uuid.uuid4(), name="Alpha", level=1, parent_id=None)]
+
+    # json_build_object отдаёт UUID строками.
+    document = {
+        "id": str(org.id),
+        "name": "Org",
+        "description": None,
+        "building_id": str(building.id),
+        "building": {"id": str(building.id), "address": "Main st. 1", "latitude": 10.0, "longitude": 20.0},
+        "phone_numbers": [{"id": str(org.phone_numbers[0].id), "phone_number": "+1"}],
+        "activities": [{"id": str(org.activities[0].id), "name": "Alpha", "level": 1, "parent_id": None}],
+    }
+
+    assert map_organization_document(document) == map_organization_detail(org)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from src.services.name_index import NameIndexCache, NamePrefixIndex
+
+
+def test_suggest_matches_name_and_word_prefixes_case_insensitively():
+    romashka, bakery, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index = NamePrefixIndex(
+        [(romashka, "Кафе «Ромашка»"), (bakery, 'ООО "Пекарня Ёлка"'), (other, "Автосервис")]
+    )
+
+    assert index.suggest("каф", 10) == [(romashka, "Кафе «Ромашка»")]
+    assert index.suggest("РОМ", 10) == [(romashka, "Кафе «Ромашка»")]
+    assert index.suggest("елк", 10) == [(bakery, 'ООО "Пекарня Ёлка"')]
+    assert index.suggest('ооо "пек', 10) == [(bakery, 'ООО "Пекарня Ёлка"')]
+    assert index.suggest("  ", 10) == []
+
+
+def test_suggest_returns_each_organization_once_up_to_limit():
+    ids = [uuid.uuid4() for _ in range(3)]
+    index = NamePrefixIndex([(ids[0], "Мир мира"), (ids[1], "Мирный"), (ids[2], "Мираж")])
+
+    assert len(index.suggest("мир", 10)) == 3
+    assert len(index.suggest("мир", 2)) == 2
+
+
+def test_updated_builds_new_index_and_keeps_previous_intact():
+    renamed, removed, added = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index = NamePrefixIndex([(renamed, "Старое имя"), (removed, "Склад")], version=1)
+
+    fresh = index.updated({renamed.int: "Новое имя", added.int: "Новинка"}, {removed.int}, version=2)
+
+    assert fresh.suggest("стар", 10) == [] and fresh.suggest("склад", 10) == []
+    assert {name for _, name in fresh.suggest("нов", 10)} == {"Новое имя", "Новинка"}
+    assert fresh.version == 2 and len(fresh) == 2
+    assert index.suggest("стар", 10) == [(renamed, "Старое имя")] and index.version == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_current_index_while_refreshing_in_background():
+    kept, renamed = uuid.uuid4(), uuid.uuid4()
+    state = {"version": 1, "entries": [(kept, "Аптека"), (renamed, "Булочная")]}
+    loads: list[int] = []
+
+    async def load_version() -> int:
+        return state["version"]
+
+    async def load_entries() -> list[tuple[uuid.UUID, str]]:
+        loads.append(state["version"])
+        return list(state["entries"])
+
+    cache = NameIndexCache(refresh_interval=60.0)
+    index = await cache.get(load_version, load_entries)
+    assert index.suggest("бул", 10) == [(renamed, "Булочная")]
+
+    state["version"] = 2
+    state["entries"] = [(kept, "Аптека"), (renamed, "Бакалея")]
+    cache.invalidate()
+    stale = await cache.get(load_version, load_entries)
+    assert stale.suggest("бул", 10) == [(renamed, "Булочная")]
+
+    await asyncio.wait_for(cache._refresh_task, timeout=1)  # type: ignore[arg-type]
+    fresh = await cache.get(load_version, load_entries)
+    assert fresh.suggest("бак", 10) == [(renamed, "Бакалея")]
+    assert fresh.version == 2
+    assert loads == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_refresh_of_large_index_does_not_block_event_loop():
+    # 100 тыс. организаций (~500 тыс. ключей) и 2 000 переименований: прежняя вставка по одному
+    # блокировала loop на секунды, теперь индекс собирается в потоке и подменяется целиком.
+    ids = [uuid.UUID(int=number) for number in range(1, 100_001)]
+    state: dict = {"version": 1, "suffix": {}}
+
+    async def load_version() -> int:
+        return state["version"]
+
+    async def load_entries() -> list[tuple[uuid.UUID, str]]:
+        suffix = state["suffix"]
+        return [
+            (organization_id, f"Кафе «Ромашка {number}»{suffix.get(number, '')}")
+            for number, organization_id in enumerate(ids)
+        ]
+
+    cache = NameIndexCache(refresh_interval=60.0)
+    await cache.refresh(load_version, load_entries)
+
+    state["version"] = 2
+    state["suffix"] = {number: " и партнёры" for number in range(0, 100_000, 50)}
+    stalls: list[float] = []
+    refreshing = asyncio.create_task(cache.refresh(load_version, load_entries))
+    while not refreshing.done():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append(time.perf_counter() - started)
+    index = await refreshing
+
+    assert index.version == 2
+    assert index.suggest("партн", 3) != []
+    assert max(stalls) < 0.5
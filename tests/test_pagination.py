@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.api.pagination import PageParams, decode_cursor, encode_cursor
+from src.models import Organization
+from src.repositories.pagination import build_page, keyset
+
+
+def test_cursor_round_trips_typed_key():
+    key = ("ООО «Рога и Копыта»", uuid.uuid4())
+
+    cursor = encode_cursor(key)
+
+    assert "=" not in cursor
+    assert PageParams(cursor=cursor, limit=10).after(str, uuid.UUID) == key
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(["only-name"]), encode_cursor(["a", "not-a-uuid"])])
+def test_invalid_cursor_is_bad_request(cursor: str):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, (str, uuid.UUID))
+
+    assert exc_info.value.status_code == 400
+
+
+def test_build_page_returns_next_key_only_when_more_rows_exist():
+    rows = [("a", 1), ("b", 2), ("c", 3)]
+
+    full = build_page(rows, limit=2, key=lambda row: row)
+    last = build_page(rows[2:], limit=2, key=lambda row: row)
+
+    assert full.items == [("a", 1), ("b", 2)]
+    assert full.next_key == ("b", 2)
+    assert last.next_key is None
+
+
+def test_keyset_continues_after_key_and_fetches_one_extra_row():
+    stmt = keyset(select(Organization.id), (Organization.name, Organization.id), ("m", uuid.uuid4()), limit=20)
+
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "(organizations.name, organizations.id) >" in sql
+    assert "ORDER BY organizations.name, organizations.id" in sql
+    assert 21 in compiled.params.values()
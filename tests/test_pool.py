@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from src.config.settings import DatabaseSettings
+from src.db.pool import InstrumentedQueuePool, pool_status
+from src.db.session import engine_options
+
+
+class FakeConnection:
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def test_engine_options_pass_pool_and_driver_settings():
+    options = engine_options(DatabaseSettings(pool_size=20, max_overflow=0, statement_timeout_ms=1500))
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 20 and options["max_overflow"] == 0
+    assert options["connect_args"]["server_settings"] == {"statement_timeout": "1500"}
+
+
+def test_engine_options_disable_prepared_statement_caches_for_pgbouncer():
+    connect_args = engine_options(DatabaseSettings(pgbouncer=True, statement_timeout_ms=1500))["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+    assert "server_settings" not in connect_args
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_counts_checkouts_and_timeouts():
+    pool = InstrumentedQueuePool(FakeConnection, pool_size=1, max_overflow=0, timeout=0.01)
+
+    held = []
+
+    def exhaust() -> None:
+        held.append(pool.connect())
+        with pytest.raises(exc.TimeoutError):
+            pool.connect()
+
+    await greenlet_spawn(exhaust)
+    status = pool_status(pool)
+
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0
+    await greenlet_spawn(held[0].close)
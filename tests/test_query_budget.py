@@ -0,0 +1,127 @@
+"""Бюджеты SQL-запросов эндпоинтов.
+
+Проверки на реальных эндпоинтах требуют мигрированной БД с данными:
+`TEST_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_query_budget.py`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.api.query_budget import QueryBudgetMiddleware, capture_query_reports, query_budget
+from src.config import settings
+from src.core.metrics import current_request_stats
+from src.core.startup import create_app
+from src.db.instrumentation import instrument_engine
+from src.db.session import get_read_session
+from src.models import Activity, Building, Organization
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def _app_with_statements(statements: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/items/{item_id}")
+    @query_budget(2)
+    async def item(item_id: int) -> dict[str, int]:
+        stats = current_request_stats.get()
+        assert stats is not None
+        stats.statements += statements
+        return {"id": item_id}
+
+    return app
+
+
+def test_requests_within_budget_are_reported_without_warning(caplog: pytest.LogCaptureFixture):
+    client = TestClient(_app_with_statements(2))
+
+    with caplog.at_level(logging.WARNING), capture_query_reports() as reports:
+        client.get("/items/1")
+
+    assert [(report.route, report.statements, report.budget) for report in reports] == [("/items/{item_id}", 2, 2)]
+    assert not reports[0].exceeded
+    assert caplog.records == []
+
+
+def test_requests_over_budget_are_logged(caplog: pytest.LogCaptureFixture):
+    client = TestClient(_app_with_statements(5))
+
+    with caplog.at_level(logging.WARNING), capture_query_reports() as reports:
+        client.get("/items/1")
+
+    assert reports[0].over_budget
+    assert "/items/{item_id}" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(DATABASE_URL is None, reason="TEST_DATABASE_URL не задан")
+async def test_endpoints_stay_within_query_budget(monkeypatch: pytest.MonkeyPatch):
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)  # type: ignore[arg-type]
+    instrument_engine(engine, "budget_test")
+    sessions = async_sessionmaker(engine.execution_options(postgresql_readonly=True), expire_on_commit=False)
+
+    async def read_session() -> AsyncGenerator[AsyncSession, None]:
+        async with sessions() as session:
+            yield session
+
+    monkeypatch.setattr(settings, "query_budget_warnings", True)
+    app = create_app()
+    app.dependency_overrides[get_read_session] = read_session
+
+    try:
+        async with sessions() as session:
+            row = (
+                await session.execute(
+                    select(
+                        Organization.id.label("organization_id"),
+                        Organization.name,
+                        Building.id.label("building_id"),
+                        Building.latitude,
+                        Building.longitude,
+                        select(Activity.id).limit(1).scalar_subquery().label("activity_id"),
+                    )
+                    .join(Building, Building.id == Organization.building_id)
+                    .limit(1)
+                )
+            ).one_or_none()
+        if row is None or row.activity_id is None:
+            pytest.skip("В тестовой БД нет данных")
+
+        prefix = settings.api_prefix + settings.api_v1_prefix
+        paths = [
+            "/organizations/",
+            f"/organizations/?activity_id={row.activity_id}",
+            f"/organizations/{row.organization_id}",
+            f"/organizations/search?q={row.name}",
+            f"/organizations/search/fuzzy?q={row.name}",
+            f"/organizations/geo/search?latitude={row.latitude}&longitude={row.longitude}&radius_km=1",
+            f"/organizations/geo/nearest?latitude={row.latitude}&longitude={row.longitude}",
+            "/activities/",
+            f"/activities/{row.activity_id}/organizations",
+            "/buildings/",
+            f"/buildings/{row.building_id}/organizations",
+        ]
+        transport = httpx.ASGITransport(app=app)
+        headers = {settings.api_key_header: settings.api_key}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+            with capture_query_reports() as reports:
+                for path in paths:
+                    response = await client.get(prefix + path)
+                    assert response.status_code == 200, path
+    finally:
+        await engine.dispose()
+
+    assert len(reports) == len(paths)
+    assert [report for report in reports if report.budget is None or report.exceeded] == []
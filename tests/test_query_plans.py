@@ -0,0 +1,137 @@
+"""Проверка, что горячие запросы репозиториев идут по индексам.
+
+Нужна мигрированная и заполненная БД: `TEST_DATABASE_URL=postgresql+asyncpg://... pytest tests/test_query_plans.py`.
+С `enable_seqscan = off` планировщик выбирает seq scan только когда подходящего индекса нет,
+поэтому проверка работает и на маленьком демо-наборе данных.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Iterator
+
+import pytest
+from sqlalchemy import ClauseElement, Executable, select, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.models import Activity, Building, Organization
+from src.repositories.activity import ActivityRepository
+from src.repositories.filters import BoundingBox, GeoRadius, OrganizationFilter
+from src.repositories.organization import OrganizationRepository
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Таблицы, которые в горячих запросах нельзя читать целиком.
+HOT_TABLES = frozenset({"organizations", "organization_phones", "organization_activities", "buildings", "activities"})
+
+
+def seq_scans(plan: dict[str, Any]) -> Iterator[str]:
+    """Имена горячих таблиц, которые план читает последовательным сканированием."""
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` над произвольным запросом с обычными bind-параметрами."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def explain(connection: AsyncConnection, stmt: ClauseElement) -> dict[str, Any]:
+    result = await connection.execute(Explain(stmt))
+    payload = result.scalar_one()
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    return payload[0]["Plan"]
+
+
+def _hot_statements(sample: dict[str, Any]) -> dict[str, Callable[[], ClauseElement]]:
+    organizations = OrganizationRepository(None)  # type: ignore[arg-type]
+    activities = ActivityRepository(None)  # type: ignore[arg-type]
+    latitude, longitude = sample["latitude"], sample["longitude"]
+    return {
+        "organization_detail": lambda: organizations._detail_stmt().where(Organization.id == sample["organization_id"]),
+        "organizations_by_building": lambda: organizations._search_stmt(
+            OrganizationFilter(building_id=sample["building_id"])
+        ),
+        "organizations_by_activity": lambda: organizations._search_stmt(
+            OrganizationFilter(activity_ids=frozenset({sample["activity_id"]}))
+        ),
+        "organizations_in_bbox": lambda: organizations._search_stmt(
+            OrganizationFilter(bbox=BoundingBox(latitude - 0.01, latitude + 0.01, longitude - 0.01, longitude + 0.01))
+        ),
+        "organizations_in_radius": lambda: organizations._search_stmt(
+            OrganizationFilter(radius=GeoRadius(latitude, longitude, 1.0))
+        ),
+        "organizations_in_window": lambda: organizations._window_stmt(latitude, longitude, 0.01, 0.02),
+        "organizations_by_ids": lambda: organizations._search_stmt(
+            OrganizationFilter().with_organizations([sample["organization_id"]])
+        ),
+        "fuzzy_name_search": lambda: organizations._fuzzy_stmt(sample["name"], limit=10),
+        "text_search": lambda: organizations._text_search_stmt(sample["name"])[0],
+        "nearest_organizations": lambda: organizations._nearest_stmt(
+            latitude, longitude, limit=10, max_radius_km=1.0, lat_delta=0.01, lon_delta=0.02
+        ),
+        "activity_descendants": lambda: activities._descendants_stmt(sample["activity_id"]),
+    }
+
+
+HOT_STATEMENT_NAMES = sorted(_hot_statements({"latitude": 0.0, "longitude": 0.0}))
+
+
+def test_seq_scans_walks_nested_plans():
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "organizations"},
+            {"Node Type": "Seq Scan", "Relation Name": "organization_phones"},
+            {"Node Type": "Seq Scan", "Relation Name": "table_versions"},
+        ],
+    }
+
+    assert list(seq_scans(plan)) == ["organization_phones"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(DATABASE_URL is None, reason="TEST_DATABASE_URL не задан")
+@pytest.mark.parametrize("name", HOT_STATEMENT_NAMES)
+async def test_hot_query_uses_indexes(name: str):
+    engine = create_async_engine(DATABASE_URL, poolclass=NullPool)  # type: ignore[arg-type]
+    try:
+        async with engine.connect() as connection:
+            row = (
+                await connection.execute(
+                    select(
+                        Organization.id.label("organization_id"),
+                        Organization.name,
+                        Building.id.label("building_id"),
+                        Building.latitude,
+                        Building.longitude,
+                        select(Activity.id).limit(1).scalar_subquery().label("activity_id"),
+                    )
+                    .join(Building, Building.id == Organization.building_id)
+                    .limit(1)
+                )
+            ).one_or_none()
+            if row is None or row.activity_id is None:
+                pytest.skip("В тестовой БД нет данных")
+
+            await connection.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = await explain(connection, _hot_statements(row._asdict())[name]())
+    finally:
+        await engine.dispose()
+
+    assert list(seq_scans(plan)) == [], json.dumps(plan, indent=2, ensure_ascii=False)
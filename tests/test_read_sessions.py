@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pytest
+
+from src.db.replica import ReadSessionRouter
+
+
+class FakeSession:
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.fail = fail
+        self.closed = False
+
+    async def connection(self) -> None:
+        if self.fail:
+            raise ConnectionRefusedError("replica is down")
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class Factory:
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.fail = fail
+        self.opened: list[FakeSession] = []
+
+    def __call__(self) -> FakeSession:
+        session = FakeSession(self.name, self.fail)
+        self.opened.append(session)
+        return session
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_when_it_answers():
+    router = ReadSessionRouter(Factory("primary"), Factory("replica"))  # type: ignore[arg-type]
+
+    session = await router.open()
+
+    assert session.name == "replica"
+
+
+@pytest.mark.asyncio
+async def test_failed_replica_falls_back_and_is_skipped_until_retry():
+    replica = Factory("replica", fail=True)
+    router = ReadSessionRouter(Factory("primary"), replica, retry_after=60.0)  # type: ignore[arg-type]
+
+    first = await router.open()
+    second = await router.open()
+
+    assert (first.name, second.name) == ("primary", "primary")
+    assert len(replica.opened) == 1 and replica.opened[0].closed
+    assert router.replica_available is False
+
+
+@pytest.mark.asyncio
+async def test_without_replica_reads_use_primary():
+    router = ReadSessionRouter(Factory("primary"))  # type: ignore[arg-type]
+
+    assert (await router.open()).name == "primary"
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.activity import ActivityRepository
+from src.repositories.filters import BoundingBox, GeoRadius, OrganizationFilter
+from src.models import Organization
+from src.repositories.organization import OrganizationRepository
+from src.repositories.pagination import keyset
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_descendants_stmt_is_single_recursive_query():
+    sql = _sql(ActivityRepository(None)._descendants_stmt(uuid.uuid4()))  # type: ignore[arg-type]
+
+    assert sql.startswith("WITH RECURSIVE activity_subtree")
+    assert "child.parent_id = activity_subtree.id" in sql
+
+
+def test_nearest_stmt_orders_and_limits_in_database():
+    stmt = OrganizationRepository(None)._nearest_stmt(  # type: ignore[arg-type]
+        55.75, 37.61, limit=5, max_radius_km=10.0, lat_delta=0.1, lon_delta=0.2
+    )
+    sql = _sql(stmt)
+
+    assert "AS distance_km" in sql
+    assert "ORDER BY distance_km, organizations.id" in sql
+    assert "LIMIT" in sql
+    assert "buildings.latitude BETWEEN" in sql
+
+
+def test_stream_stmt_fetches_in_server_side_batches():
+    stmt = OrganizationRepository(None)._stream_stmt(chunk_size=500)  # type: ignore[arg-type]
+
+    assert stmt.get_execution_options()["yield_per"] == 500
+    assert "ORDER BY organizations.name, organizations.id" in _sql(stmt)
+
+
+def test_detail_stmt_aggregates_relations_in_one_query():
+    stmt = OrganizationRepository(None)._detail_stmt()  # type: ignore[arg-type]
+    sql = _sql(stmt)
+
+    assert sql.count("json_agg(") == 2
+    assert 'ORDER BY organization_phones.phone_number COLLATE "C"' in sql
+    assert 'ORDER BY activities.name COLLATE "C"' in sql
+    assert "JOIN buildings ON buildings.id = organizations.building_id" in sql
+    assert isinstance(stmt.selected_columns.document.type, postgresql.JSON)
+
+
+def test_search_stmt_pushes_combined_filters_into_one_query():
+    criteria = OrganizationFilter(
+        name="молоко",
+        activity_ids=frozenset({uuid.uuid4()}),
+        bbox=BoundingBox(55.0, 56.0, 37.0, 38.0),
+        radius=GeoRadius(55.75, 37.61, 5.0),
+    )
+    sql = _sql(OrganizationRepository(None)._search_stmt(criteria))  # type: ignore[arg-type]
+
+    assert sql.count("SELECT organizations.name") == 1
+    assert "organizations.name ILIKE" in sql
+    assert "organizations.id IN (SELECT organization_activities.organization_id" in sql
+    assert sql.count("buildings.latitude BETWEEN") == 2
+    assert "asin(least(" in sql
+
+
+def test_search_stmt_filters_selected_ids_with_one_array_parameter():
+    ids = frozenset(uuid.uuid4() for _ in range(3))
+    stmt = OrganizationRepository(None)._search_stmt(OrganizationFilter().with_organizations(ids))  # type: ignore[arg-type]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+
+    assert "organizations.id = ANY (%(organization_ids)s::UUID[])" in str(compiled)
+    assert set(compiled.params["organization_ids"]) == ids
+
+
+def test_window_stmt_selects_coordinates_without_documents():
+    sql = _sql(OrganizationRepository(None)._window_stmt(55.75, 37.61, 0.01, 0.02))  # type: ignore[arg-type]
+
+    assert sql.startswith("SELECT organizations.id, buildings.latitude, buildings.longitude")
+    assert "json_build_object" not in sql
+    assert sql.count("BETWEEN") == 2
+
+
+@pytest.mark.asyncio
+async def test_search_skips_database_when_filter_matches_nothing():
+    repository = OrganizationRepository(None)  # type: ignore[arg-type]
+
+    page = await repository.search(OrganizationFilter().with_activities([]))
+
+    assert page.items == [] and page.next_key is None
+
+
+def test_fuzzy_stmt_filters_by_trigram_operator_and_ranks():
+    sql = _sql(OrganizationRepository(None)._fuzzy_stmt("молоко", limit=10))  # type: ignore[arg-type]
+
+    assert "organizations.name %%> " in sql
+    assert "word_similarity(" in sql
+    assert "ORDER BY similarity DESC, organizations.name, organizations.id" in sql
+    assert "LIMIT" in sql
+
+
+def test_text_search_stmt_matches_vector_and_ranks_for_keyset():
+    stmt, sort_rank = OrganizationRepository(None)._text_search_stmt("свежий хлеб")  # type: ignore[arg-type]
+    sql = _sql(keyset(stmt, (sort_rank, Organization.id), (-0.5, uuid.uuid4()), 20))
+
+    assert "organizations.search_vector @@ websearch_to_tsquery(" in sql
+    assert "::REGCONFIG" in sql
+    assert "(-ts_rank_cd(organizations.search_vector" in sql
+    assert "ORDER BY sort_rank, organizations.id" in sql
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.repositories.building import BuildingRepository
+from src.repositories.cache import (
+    MemoryCacheBackend,
+    RepositoryCache,
+    cache_requests_total,
+    cached,
+    mark_stale,
+    repository_cache,
+    table_tag,
+)
+from src.repositories.organization import OrganizationRepository
+from src.services.building import BuildingService
+from src.services.organization import OrganizationService
+from src.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_and_expired(monkeypatch: pytest.MonkeyPatch):
+    backend = MemoryCacheBackend(max_entries=2)
+    await backend.set("a", 1, ttl=10, tags=())
+    await backend.set("b", 2, ttl=10, tags=())
+    await backend.get("a")
+    await backend.set("c", 3, ttl=10, tags=())
+
+    assert await backend.get("b") == (False, None)
+    assert await backend.get("a") == (True, 1)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert await backend.get("a") == (False, None)
+    assert len(backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_loads_once_and_invalidates_by_tag():
+    cache = RepositoryCache(MemoryCacheBackend(max_entries=10), ttl=60)
+    loads: list[int] = []
+
+    async def load() -> list[int]:
+        loads.append(1)
+        return [len(loads)]
+
+    hits = cache_requests_total.value(("test.list", "hit"))
+    first = await cache.get_or_load("test.list", (1,), [table_tag("organizations")], load)
+    second = await cache.get_or_load("test.list", (1,), [table_tag("organizations")], load)
+    other = await cache.get_or_load("test.list", (2,), [table_tag("buildings")], load)
+
+    assert first == second == [1] and other == [2]
+    assert cache_requests_total.value(("test.list", "hit")) == hits + 1
+
+    assert await cache.invalidate(table_tag("organizations")) == 1
+    assert await cache.get_or_load("test.list", (1,), [table_tag("organizations")], load) == [3]
+    assert await cache.get_or_load("test.list", (2,), [table_tag("buildings")], load) == [2]
+
+
+@pytest.mark.asyncio
+async def test_commit_invalidates_tags_marked_in_session():
+    async def load() -> str:
+        return "cached"
+
+    await repository_cache.get_or_load("test.commit", (), [table_tag("test_table")], load)
+
+    session = Session()
+    mark_stale(session, table_tag("test_table"))
+    session.rollback()
+    await repository_cache.drain()
+    assert await repository_cache.backend.get("test.commit:()") == (True, "cached")
+
+    mark_stale(session, table_tag("test_table"))
+    session.commit()
+    await repository_cache.drain()
+    assert await repository_cache.backend.get("test.commit:()") == (False, None)
+
+
+class _Rows:
+    def __init__(self, rows: list[tuple[str, int]]):
+        self._rows = rows
+
+    def tuples(self) -> _Rows:
+        return self
+
+    def all(self) -> list[tuple[str, int]]:
+        return self._rows
+
+    def one_or_none(self) -> None:
+        return None
+
+
+class VersionSession:
+    """Сессия, которая отвечает на чтение table_versions, а на любой другой запрос — пустым результатом."""
+
+    def __init__(self, versions: dict[str, int]):
+        self.info: dict = {}
+        self.executed = 0
+        self._versions = versions
+
+    async def execute(self, statement) -> _Rows:
+        self.executed += 1
+        if "table_versions" in str(statement):
+            return _Rows(list(self._versions.items()))
+        return _Rows([])
+
+
+@pytest.mark.asyncio
+async def test_change_outside_worker_changes_cache_key_through_table_versions():
+    cache = RepositoryCache(MemoryCacheBackend(max_entries=10), ttl=60)
+    versions = {"organizations": 1, "buildings": 1}
+    stored = {"name": "Старое"}
+
+    async def load() -> str:
+        return stored["name"]
+
+    async def read(session: VersionSession) -> str:
+        return await cached(cache, session, "test.versioned", (1,), ("organizations",), load)  # type: ignore[arg-type]
+
+    session = VersionSession(versions)
+    assert await read(session) == "Старое"
+    assert await read(session) == "Старое"
+    assert session.executed == 1
+
+    # Другой воркер или CLI-загрузка: commit не в этом процессе, теги никто не сбрасывал.
+    stored["name"] = "Новое"
+    assert await read(VersionSession(versions)) == "Старое"
+
+    versions["organizations"] = 2
+    assert await read(VersionSession(versions)) == "Новое"
+
+
+@pytest.mark.asyncio
+async def test_cached_building_page_reads_table_versions_once_per_request():
+    cache = RepositoryCache(MemoryCacheBackend(max_entries=10), ttl=60)
+    flights = SingleFlight()
+    versions = {"buildings": 1, "organizations": 1}
+    building_id = uuid.uuid4()
+
+    async def request() -> int:
+        # Как /buildings/{id}/organizations: здание и его организации в одной сессии запроса.
+        session = VersionSession(versions)
+        await BuildingService(BuildingRepository(session, cache), flights).get_building(building_id)  # type: ignore[arg-type]
+        await OrganizationService(OrganizationRepository(session, cache), flights).list_by_building(building_id)  # type: ignore[arg-type]
+        return session.executed
+
+    assert await request() == 3
+    assert await request() == 1
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src.api.responses import json_response
+from src.schemas import BuildingRead
+
+
+def _buildings(count: int) -> list[BuildingRead]:
+    return [
+        BuildingRead(id=uuid.uuid4(), address=f"Street {index}", latitude=55.75 + index, longitude=37.61)
+        for index in range(count)
+    ]
+
+
+def test_json_response_matches_response_model_serialization():
+    buildings = _buildings(3)
+    app = FastAPI()
+
+    @app.get("/validated", response_model=list[BuildingRead])
+    async def validated() -> list[BuildingRead]:
+        return buildings
+
+    @app.get("/fast", response_model=list[BuildingRead])
+    async def fast(response: Response) -> Response:
+        response.headers["X-Next-Cursor"] = "abc"
+        return json_response(buildings, headers=response.headers)
+
+    client = TestClient(app)
+    expected = client.get("/validated")
+    actual = client.get("/fast")
+
+    assert actual.content == expected.content
+    assert actual.headers["content-type"] == "application/json"
+    assert actual.headers["x-next-cursor"] == "abc"
+    schema = app.openapi()["paths"]["/fast"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["items"] == {"$ref": "#/components/schemas/BuildingRead"}
+
+
+def test_json_response_serializes_single_models_and_empty_lists():
+    building = _buildings(1)[0]
+
+    assert json_response(building).body == building.model_dump_json().encode()
+    assert json_response([]).body == b"[]"
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
+from types import SimpleNamespace
 
 import pytest
 
-from src.models import Building, Organization
+from src.models import Activity, Building, Organization
+from src.repositories.filters import GeoRadius, OrganizationFilter
+from src.repositories.pagination import Page
+from src.services.activity import ActivityService
 from src.services.organization import OrganizationService
+from src.services.single_flight import SingleFlight
 
 
 def _organization(lat: float, lon: float, name: str) -> Organization:
@@ -27,36 +33,49 @@ def _organization(lat: float, lon: float, name: str) -> Organization:
     return organization
 
 
+def _point(lat: float, lon: float) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), latitude=lat, longitude=lon)
+
+
 class StubOrgRepository:
-    def __init__(self, candidates: list[Organization]):
+    def __init__(self, candidates: list[SimpleNamespace]):
         self._candidates = candidates
         self.window_calls = 0
+        self.searched: list[OrganizationFilter] = []
 
-    async def list_in_lat_lon_window(self, **_: float) -> list[Organization]:
+    async def list_in_lat_lon_window(self, **_: float) -> list[SimpleNamespace]:
         self.window_calls += 1
         return self._candidates
 
+    async def search(self, criteria: OrganizationFilter, after=None, limit=None) -> Page[dict]:
+        self.searched.append(criteria)
+        return Page(items=[])
+
 
 class RejectingRepository:
     def __init__(self):
         self.called = False
 
-    async def list_in_lat_lon_window(self, **_: float) -> list[Organization]:
+    async def list_in_lat_lon_window(self, **_: float) -> list[SimpleNamespace]:
+        self.called = True
+        raise AssertionError("Should not be called")
+
+    async def search_fuzzy(self, *_: object, **__: object) -> list[tuple[dict, float]]:
         self.called = True
         raise AssertionError("Should not be called")
 
 
 @pytest.mark.asyncio
 async def test_list_within_radius_filters_with_haversine():
-    inside = _organization(55.751, 37.618, "Inside")
-    outside = _organization(55.80, 37.80, "Outside")
+    inside = _point(55.751, 37.618)
+    outside = _point(55.80, 37.80)
     repo = StubOrgRepository([inside, outside])
 
-    service = OrganizationService(repo)
+    service = OrganizationService(repo)  # type: ignore[arg-type]
 
     results = await service.list_within_radius(latitude=55.751, longitude=37.618, radius_km=1.0)
 
-    assert [org.name for org in results] == ["Inside"]
+    assert results == [inside.id]
     assert repo.window_calls == 1
 
 
@@ -70,3 +89,158 @@ async def test_list_within_radius_skips_query_for_non_positive_radius():
     assert results == []
     assert repo.called is False
 
+
+@pytest.mark.asyncio
+async def test_search_narrows_small_radius_to_ids_from_window():
+    inside = _point(55.751, 37.618)
+    repo = StubOrgRepository([inside, _point(55.80, 37.80)])
+    service = OrganizationService(repo)  # type: ignore[arg-type]
+
+    await service.search(OrganizationFilter(name="Молоко", radius=GeoRadius(55.751, 37.618, 1.0)), limit=10)
+    await service.search(OrganizationFilter(radius=GeoRadius(55.751, 37.618, 500.0)), limit=10)
+
+    small, large = repo.searched
+    assert small == OrganizationFilter(name="Молоко", organization_ids=frozenset({inside.id}))
+    # Большой радиус целиком проверяется в SQL: окно на полгорода в Python не тянем.
+    assert large.radius == GeoRadius(55.751, 37.618, 500.0) and large.organization_ids is None
+    assert repo.window_calls == 1
+
+
+class StubActivityRepository:
+    def __init__(self, descendants: list[uuid.UUID]):
+        self._descendants = descendants
+        self.calls: list[uuid.UUID] = []
+
+    async def list_descendant_ids(self, activity_id: uuid.UUID) -> list[uuid.UUID]:
+        self.calls.append(activity_id)
+        return self._descendants
+
+    async def get_with_children(self, activity_id: uuid.UUID):
+        raise AssertionError("Tree walk should not be used")
+
+
+@pytest.mark.asyncio
+async def test_collect_descendant_ids_uses_single_repository_call():
+    root_id = uuid.uuid4()
+    descendants = [root_id, uuid.uuid4(), uuid.uuid4()]
+    repo = StubActivityRepository(descendants)
+    service = ActivityService(repo)  # type: ignore[arg-type]
+
+    assert await service.collect_descendant_ids(root_id) == descendants
+    assert repo.calls == [root_id]
+
+
+class StubVersionRepository:
+    def __init__(self, version: int):
+        self.version = version
+
+    async def get_version(self, table_name: str) -> int:
+        assert table_name == "activities"
+        return self.version
+
+
+class StubTreeRepository:
+    async def list_all(self) -> list[Activity]:
+        return [Activity(id=uuid.uuid4(), name="Еда", level=1, parent_id=None)]
+
+
+@pytest.mark.asyncio
+async def test_tree_snapshot_without_cache_carries_real_table_version():
+    versions = StubVersionRepository(version=3)
+    service = ActivityService(StubTreeRepository(), versions, tree_cache=None)  # type: ignore[arg-type]
+
+    assert (await service.get_tree_snapshot()).version == 3
+    versions.version = 4
+    assert (await service.get_tree_snapshot()).version == 4
+
+
+class CountingTreeRepository(StubTreeRepository):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def versions(self) -> tuple[tuple[str, int], ...]:
+        return (("activities", 3),)
+
+    async def list_all(self) -> list[Activity]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return await super().list_all()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tree_snapshots_without_cache_share_one_build():
+    repo = CountingTreeRepository()
+    service = ActivityService(repo, StubVersionRepository(version=3), flights=SingleFlight())  # type: ignore[arg-type]
+
+    first, second = await asyncio.gather(service.get_tree_snapshot(), service.get_tree_snapshot())
+
+    assert first is second and first.version == 3
+    assert repo.calls == 1
+
+
+class NearestRepository:
+    def __init__(self, rows: list[tuple[Organization, float]]):
+        self._rows = rows
+        self.calls: list[dict] = []
+
+    async def list_nearest(self, **kwargs) -> list[tuple[Organization, float]]:
+        self.calls.append(kwargs)
+        return self._rows
+
+
+@pytest.mark.asyncio
+async def test_list_nearest_bounds_window_only_with_max_radius():
+    rows = [(_organization(55.751, 37.618, "Near"), 0.1)]
+    repo = NearestRepository(rows)
+    service = OrganizationService(repo)  # type: ignore[arg-type]
+
+    assert await service.list_nearest(latitude=55.751, longitude=37.618, limit=5) == rows
+    assert await service.list_nearest(latitude=55.751, longitude=37.618, limit=5, max_radius_km=11.1) == rows
+
+    unbounded, bounded = repo.calls
+    assert unbounded["lat_delta"] is None and unbounded["lon_delta"] is None
+    assert bounded["lat_delta"] == pytest.approx(0.1)
+    assert bounded["lon_delta"] > bounded["lat_delta"]
+    assert bounded["max_radius_km"] == 11.1
+
+
+@pytest.mark.asyncio
+async def test_list_nearest_skips_query_for_empty_request():
+    repo = NearestRepository([])
+    service = OrganizationService(repo)  # type: ignore[arg-type]
+
+    assert await service.list_nearest(latitude=0.0, longitude=0.0, limit=0) == []
+    assert await service.list_nearest(latitude=0.0, longitude=0.0, limit=5, max_radius_km=0.0) == []
+    assert repo.calls == []
+
+
+@pytest.mark.asyncio
+async def test_search_fuzzy_skips_query_for_blank_input():
+    repo = RejectingRepository()
+    service = OrganizationService(repo)  # type: ignore[arg-type]
+
+    assert await service.search_fuzzy("   ", limit=10) == []
+    assert repo.called is False
+
+
+class BatchRepository:
+    def __init__(self, documents: dict[uuid.UUID, dict]):
+        self._documents = documents
+        self.calls: list[tuple[uuid.UUID, ...]] = []
+
+    async def get_details(self, organization_ids: tuple[uuid.UUID, ...]) -> dict[uuid.UUID, dict]:
+        self.calls.append(organization_ids)
+        return {key: value for key, value in self._documents.items() if key in organization_ids}
+
+
+@pytest.mark.asyncio
+async def test_get_details_preserves_order_and_reports_missing_in_one_call():
+    first, second, missing = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    repo = BatchRepository({first: {"id": first}, second: {"id": second}})
+    service = OrganizationService(repo)  # type: ignore[arg-type]
+
+    batch = await service.get_details([second, missing, first, second])
+
+    assert batch.items == [{"id": second}, {"id": first}]
+    assert batch.missing == [missing]
+    assert repo.calls == [(second, missing, first)]
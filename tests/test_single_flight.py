@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.services.building import BuildingService
+from src.services.single_flight import SingleFlight
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.closed = False
+
+
+class SlowBuildingRepository:
+    def __init__(self, release: asyncio.Event, sessions: list[FakeSession], version: int = 1):
+        self.session = FakeSession()
+        self.release = release
+        self.sessions = sessions
+        self.version = version
+
+    def versions(self) -> tuple[tuple[str, int], ...]:
+        return (("buildings", self.version),)
+
+    async def list_all(self, after=None, limit=None) -> list[str]:
+        self.sessions.append(self.session)
+        await self.release.wait()
+        if self.session.closed:
+            raise RuntimeError("session is closed")
+        return ["building"]
+
+
+def _service(
+    flights: SingleFlight,
+    release: asyncio.Event,
+    sessions: list[FakeSession],
+    version: int = 1,
+) -> BuildingService:
+    return BuildingService(SlowBuildingRepository(release, sessions, version), flights)  # type: ignore[arg-type]
+
+
+async def _request(service: BuildingService, limit: int) -> list[str]:
+    # Как зависимость FastAPI: сессия закрывается, когда обработчик завершился или отменён.
+    try:
+        return await service.list_buildings(limit=limit)  # type: ignore[return-value]
+    finally:
+        service._repository.session.closed = True  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_reads_share_one_query_in_leader_session():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    sessions: list[FakeSession] = []
+    services = [_service(flights, release, sessions) for _ in range(5)]
+
+    pending = [asyncio.create_task(_request(service, 10)) for service in services]
+    other = asyncio.create_task(_request(_service(flights, release, sessions), 20))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*pending) == [["building"]] * 5
+    assert await other == ["building"]
+    # Ни одной дополнительной сессии: запрос идёт в сессии первого из пришедших.
+    assert len(sessions) == 2
+    assert sessions[0] is services[0]._repository.session  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_reads_with_different_table_versions_are_not_shared():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    sessions: list[FakeSession] = []
+
+    # Второй запрос уже видит новую версию `buildings` (и отдал клиенту её ETag): старый результат ему не подходит.
+    old = asyncio.create_task(_request(_service(flights, release, sessions, version=1), 10))
+    new = asyncio.create_task(_request(_service(flights, release, sessions, version=2), 10))
+    await asyncio.sleep(0)
+    release.set()
+
+    await asyncio.gather(old, new)
+    assert len(sessions) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_keeps_its_session_until_waiters_are_served():
+    flights = SingleFlight()
+    release = asyncio.Event()
+    sessions: list[FakeSession] = []
+
+    leader = asyncio.create_task(_request(_service(flights, release, sessions), 10))
+    waiter = asyncio.create_task(_request(_service(flights, release, sessions), 10))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    assert not sessions[0].closed
+    release.set()
+
+    assert await waiter == ["building"]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert sessions[0].closed
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    flights = SingleFlight()
+    attempts = 0
+
+    async def load() -> int:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(*(flights.do(("broken",), load) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        await flights.do(("broken",), load)
+    assert attempts == 2